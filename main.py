@@ -12,6 +12,7 @@ import pandas as pd
 from pathlib import Path
 from collections import Counter
 from datetime import datetime
+from typing import Optional
 
 # Ensure src is in python path
 sys.path.append(str(Path(__file__).parent / "src"))
@@ -21,6 +22,11 @@ from src.collectors.pydriller_collector import PyDrillerCollector
 from src.analyzers.stats import CodeStats
 from src.analyzers.complexity_analyzer import ComplexityAnalyzer
 from src.visualizers import charts, style
+from src.visualizers.render import render_charts
+from src.utils.persistence import save_json
+from src.utils.repo_index import RepoIndex
+from src.utils.commit_data import build_commit_df, save_commit_df, commit_aggregates, top_k_with_other
+from src.data_service import get_commits_df, clear_commits_cache
 
 # Configure logging
 logging.basicConfig(
@@ -33,40 +39,33 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 提交数据缓存文件
+COMMITS_JSON = DATA_DIR / "commits.json"
+COMMITS_PARQUET = DATA_DIR / "commits.parquet"
+
+
 def ensure_directories():
     """确保数据和输出目录存在"""
     DATA_DIR.mkdir(parents=True, exist_ok=True)
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
 
-def load_cached_commits():
-    """尝试从缓存加载提交数据"""
-    cache_file = DATA_DIR / "commits.json"
-    if cache_file.exists():
-        logger.info(f"发现缓存文件: {cache_file}")
-        try:
-            with open(cache_file, "r", encoding="utf-8") as f:
-                commits = json.load(f)
-            logger.info(f"从缓存加载了 {len(commits)} 条提交记录")
-            return commits
-        except Exception as e:
-            logger.warning(f"缓存加载失败: {e}")
-    return None
-
-
-def collect_data(use_cache: bool = True):
+def collect_data(use_cache: bool = True) -> Optional[pd.DataFrame]:
     """
     Step 1: 从仓库采集数据
     
     Args:
         use_cache: 是否使用缓存，默认True
+
+    Returns:
+        提交 DataFrame（已包含 date/year/month/hour/weekday 列）
     """
     logger.info("Step 1: 采集数据...")
     
-    # 尝试使用缓存
+    # 尝试使用缓存（优先 Parquet，其次 JSON）
     if use_cache:
-        cached = load_cached_commits()
-        if cached:
+        cached = get_commits_df(COMMITS_JSON, COMMITS_PARQUET)
+        if cached is not None and not cached.empty:
             return cached
 
     if not FLASK_REPO_PATH.exists():
@@ -74,20 +73,24 @@ def collect_data(use_cache: bool = True):
         return None
 
     collector = PyDrillerCollector(str(FLASK_REPO_PATH))
-    commits = list(collector.collect_commits())
+    columns = collector.collect_commit_columns()
+    df = build_commit_df(columns)
 
-    logger.info(f"采集到 {len(commits)} 条提交记录")
+    logger.info(f"采集到 {len(df)} 条提交记录")
 
-    # 保存到缓存
-    raw_data_path = DATA_DIR / "commits.json"
-    with open(raw_data_path, "w", encoding="utf-8") as f:
-        json.dump(commits, f, default=str, indent=2, ensure_ascii=False)
-    logger.info(f"数据已保存到: {raw_data_path}")
+    # 保存到缓存（commits.json 保持逐行记录格式）
+    commits = [dict(zip(columns, row)) for row in zip(*columns.values())]
+    if save_json(commits, str(COMMITS_JSON)):
+        logger.info(f"数据已保存到: {COMMITS_JSON}")
 
-    return commits
+    if not df.empty:
+        save_commit_df(df, COMMITS_PARQUET)
+    clear_commits_cache()
+
+    return df
 
 
-def analyze_stats(commits):
+def analyze_stats(df: pd.DataFrame):
     """Step 2: Analyze statistics."""
     logger.info("Step 2: Analyzing statistics...")
 
@@ -95,20 +98,11 @@ def analyze_stats(commits):
     stats_analyzer = CodeStats()
     repo_stats = stats_analyzer.analyze_directory(str(FLASK_REPO_PATH))
 
-    # Complexity analysis
-    complexity_analyzer = ComplexityAnalyzer(str(FLASK_REPO_PATH))
+    # Complexity analysis（共享文件索引，目录只遍历一次、文件只读取一次）
+    repo_index = RepoIndex(FLASK_REPO_PATH)
+    complexity_analyzer = ComplexityAnalyzer(str(FLASK_REPO_PATH), index=repo_index)
     complexity_stats = complexity_analyzer.analyze_repository()
 
-    # Process commit data for visualization
-    df = pd.DataFrame(commits)
-    if not df.empty:
-        # 修复时区感知日期转换问题
-        df["date"] = pd.to_datetime(df["committer_date"], utc=True)
-        df["year"] = df["date"].dt.year
-        df["month"] = df["date"].dt.to_period("M").astype(str)
-        df["hour"] = df["date"].dt.hour
-        df["weekday"] = df["date"].dt.day_name()
-
     return {
         "repo_stats": repo_stats,
         "complexity_stats": complexity_stats,
@@ -128,111 +122,105 @@ def generate_visualizations(data):
         logger.warning("没有提交数据可供可视化")
         return
 
+    # 一次性计算各图表共用的聚合结果
+    aggregates = commit_aggregates(df)
+    author_counts = aggregates["authors"]
+
+    # 各图表相互独立，先收集绘图任务再统一（并行）渲染
+    tasks = []
+
     # 1. 年度提交统计
-    yearly_counts = df["year"].value_counts().sort_index()
-    charts.plot_bar(
-        yearly_counts,
+    tasks.append((charts.plot_bar, (
+        aggregates["yearly"],
         "年度提交统计",
         "年份",
         "提交数量",
         str(OUTPUT_DIR / "annual_commits.png"),
-    )
+    )))
 
     # 2. 月度提交趋势（只显示最近36个月，避免拥挤）
-    monthly_counts = df["month"].value_counts().sort_index()
-    recent_months = monthly_counts.tail(36)  # 最近3年
+    recent_months = aggregates["monthly"].tail(36)  # 最近3年
     # 简化标签，只显示年份
     recent_months.index = [m[-5:] if len(m) > 5 else m for m in recent_months.index]
-    charts.plot_line(
+    tasks.append((charts.plot_line, (
         recent_months,
         "月度提交趋势（近3年）",
         "月份",
         "提交数量",
         str(OUTPUT_DIR / "monthly_commits.png"),
-    )
+    )))
 
     # 3. Top 15贡献者
-    author_counts = df["author_name"].value_counts().head(15)
-    charts.plot_horizontal_bar(
-        author_counts,
+    tasks.append((charts.plot_horizontal_bar, (
+        author_counts.head(15),
         "Top 15 贡献者",
         "提交数量",
         "作者",
         str(OUTPUT_DIR / "top_authors.png"),
-    )
+    )))
 
     # 4. 文件类型分布
     languages = repo_stats.get("languages", {})
     if languages:
         lang_series = pd.Series(languages).sort_values(ascending=False).head(10)
-        charts.plot_pie(
-            lang_series, "文件类型分布", str(OUTPUT_DIR / "file_types.png")
-        )
+        tasks.append((charts.plot_pie, (
+            lang_series, "文件类型分布", str(OUTPUT_DIR / "file_types.png"),
+        )))
 
     # 5. 高复杂度函数排行
     high_complexity = complexity_stats.get("high_complexity_functions", [])
     if high_complexity:
-        comp_data = {}
-        for func in high_complexity[:20]:
-            name = func['name'][:25]  # 截断长名称
-            comp_data[name] = func["complexity"]
-        comp_series = pd.Series(comp_data).sort_values(ascending=False)
-        charts.plot_horizontal_bar(
+        top_funcs = pd.DataFrame.from_records(
+            high_complexity[:20], columns=["name", "complexity"]
+        )
+        top_funcs["name"] = top_funcs["name"].str[:25]  # 截断长名称
+        comp_series = (
+            top_funcs.drop_duplicates("name")
+            .set_index("name")["complexity"]
+            .sort_values(ascending=False)
+        )
+        tasks.append((charts.plot_horizontal_bar, (
             comp_series,
             "高复杂度函数排行 (Top 20)",
             "圈复杂度",
             "函数名",
             str(OUTPUT_DIR / "complexity_ranking.png"),
-        )
+        )))
 
     # 6. 提交时间分布（按小时）
-    hourly_counts = df["hour"].value_counts().sort_index()
-    charts.plot_bar(
-        hourly_counts,
+    tasks.append((charts.plot_bar, (
+        aggregates["hourly"],
         "提交时间分布（按小时）",
         "小时",
         "提交数量",
         str(OUTPUT_DIR / "commits_by_hour.png"),
-    )
+    )))
 
     # 7. 提交星期分布
-    weekday_order = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-    weekday_labels = ["周一", "周二", "周三", "周四", "周五", "周六", "周日"]
-    weekday_counts = df["weekday"].value_counts().reindex(weekday_order)
-    weekday_counts.index = weekday_labels
-    charts.plot_bar(
-        weekday_counts,
+    tasks.append((charts.plot_bar, (
+        aggregates["weekday"],
         "提交星期分布",
         "星期",
         "提交数量",
         str(OUTPUT_DIR / "commits_by_weekday.png"),
-    )
+    )))
 
     # 8. 提交消息长度分布
-    df["msg_len"] = df["msg"].apply(len)
-    msg_len_bins = (
-        pd.cut(df["msg_len"], bins=[0, 20, 50, 100, 200, 500, 1000])
-        .value_counts()
-        .sort_index()
-    )
-    charts.plot_bar(
-        msg_len_bins,
+    tasks.append((charts.plot_bar, (
+        aggregates["msg_len_bins"],
         "提交消息长度分布",
         "长度区间",
         "提交数量",
         str(OUTPUT_DIR / "message_length_dist.png"),
-    )
+    )))
 
     # 9. 作者贡献饼图（Top 10占比）
-    top_authors = df["author_name"].value_counts().head(10)
-    other_count = len(df) - top_authors.sum()
-    if other_count > 0:
-        top_authors["其他"] = other_count
-    charts.plot_pie(
+    top_authors = top_k_with_other(author_counts, 10)
+    tasks.append((charts.plot_pie, (
         top_authors,
         "贡献者占比分布",
         str(OUTPUT_DIR / "author_pie.png"),
-    )
+    )))
 
     # 10. 年度代码变更量
     if "insertions" in df.columns and "deletions" in df.columns:
@@ -241,23 +229,23 @@ def generate_visualizations(data):
             "deletions": "sum"
         })
         yearly_changes["net"] = yearly_changes["insertions"] - yearly_changes["deletions"]
-        charts.plot_bar(
+        tasks.append((charts.plot_bar, (
             yearly_changes["insertions"],
             "年度代码新增行数",
             "年份",
             "新增行数",
             str(OUTPUT_DIR / "yearly_insertions.png"),
-        )
+        )))
 
     # 11. 每年活跃贡献者数
     yearly_authors = df.groupby("year")["author_name"].nunique()
-    charts.plot_line(
+    tasks.append((charts.plot_line, (
         yearly_authors,
         "每年活跃贡献者数量",
         "年份",
         "贡献者数",
         str(OUTPUT_DIR / "yearly_authors.png"),
-    )
+    )))
 
     # 12. 提交消息类型分析（简单）
     from src.analyzers.message_analyzer import analyze_messages
@@ -270,23 +258,24 @@ def generate_visualizations(data):
             "style": "样式", "perf": "性能", "other": "其他"
         }
         type_counts.index = [type_labels.get(t, t) for t in type_counts.index]
-        charts.plot_pie(
+        tasks.append((charts.plot_pie, (
             type_counts,
             "提交类型分布",
             str(OUTPUT_DIR / "commit_types.png"),
-        )
+        )))
 
     # 13. 修改文件数分布
     if "files" in df.columns:
         file_counts = df["files"].value_counts().sort_index().head(20)
-        charts.plot_bar(
+        tasks.append((charts.plot_bar, (
             file_counts,
             "每次提交修改文件数分布",
             "文件数",
             "提交次数",
             str(OUTPUT_DIR / "files_per_commit.png"),
-        )
+        )))
 
+    render_charts(tasks)
     logger.info(f"可视化图表已保存到: {OUTPUT_DIR}")
 
 
@@ -327,12 +316,12 @@ def main():
     logger.info("启动Flask仓库分析器...")
     ensure_directories()
 
-    commits = collect_data()
-    if not commits:
+    commit_df = collect_data()
+    if commit_df is None or commit_df.empty:
         logger.error("数据采集失败，退出")
         return
 
-    analysis_results = analyze_stats(commits)
+    analysis_results = analyze_stats(commit_df)
 
     summary = {
         "repo_stats": analysis_results["repo_stats"],
@@ -341,7 +330,7 @@ def main():
             for k, v in analysis_results["complexity_stats"].items()
             if k != "high_complexity_functions"
         },
-        "total_commits": len(commits),
+        "total_commits": len(commit_df),
     }
     with open(DATA_DIR / "analysis_summary.json", "w", encoding="utf-8") as f:
         json.dump(summary, f, indent=2, ensure_ascii=False)
@@ -380,9 +369,9 @@ if __name__ == "__main__":
         elif arg == "--no-cache":
             logger.info("强制重新采集...")
             ensure_directories()
-            cache_file = DATA_DIR / "commits.json"
-            if cache_file.exists():
-                cache_file.unlink()
+            for cache_file in (COMMITS_JSON, COMMITS_PARQUET):
+                if cache_file.exists():
+                    cache_file.unlink()
             main()
         else:
             print(f"未知参数: {arg}")
@@ -2,16 +2,25 @@
 Flask Repository Analyzer - Analyzers Module
 
 该模块包含了用于分析 Flask 仓库的各种分析器
+
+各分析器按需导入（PEP 562），避免只使用其中一个子模块时
+连带加载 libcst、z3、radon 等较重的依赖。
 """
 
-from .ast_analyzer import ASTAnalyzer
-from .libcst_analyzer import LibCSTAnalyzer
-from .z3_analyzer import Z3Analyzer
-from .dynamic_tracer import DynamicTracer
-from .stats import CodeStats
-from .message_analyzer import analyze_messages, classify_commit
-from .complexity_analyzer import ComplexityAnalyzer
-from .dependency_analyzer import DependencyAnalyzer
+import importlib
+
+# 导出名称 -> 所在子模块
+_LAZY_IMPORTS = {
+    "ASTAnalyzer": ".ast_analyzer",
+    "LibCSTAnalyzer": ".libcst_analyzer",
+    "Z3Analyzer": ".z3_analyzer",
+    "DynamicTracer": ".dynamic_tracer",
+    "CodeStats": ".stats",
+    "analyze_messages": ".message_analyzer",
+    "classify_commit": ".message_analyzer",
+    "ComplexityAnalyzer": ".complexity_analyzer",
+    "DependencyAnalyzer": ".dependency_analyzer",
+}
 
 __all__ = [
     "ASTAnalyzer",
@@ -25,3 +34,16 @@ __all__ = [
     "DependencyAnalyzer",
 ]
 
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,18 +1,75 @@
 import ast
 import logging
-from typing import Dict, List, Any, Optional
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Tuple
 
 try:
-    from radon.complexity import cc_visit, cc_rank
+    from radon.complexity import cc_visit_ast, cc_rank
     RADON_AVAILABLE = True
 except ImportError:
-    cc_visit = None
+    cc_visit_ast = None
     cc_rank = None
     RADON_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
 
+class _DefVisitor(ast.NodeVisitor):
+    """
+    单次遍历收集类定义、函数定义和导入模块的 AST 访问器。
+    """
+
+    def __init__(self):
+        self.classes: List[str] = []
+        self.functions: List[str] = []
+        self.imports: List[str] = []
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        self.classes.append(node.name)
+        self.generic_visit(node)
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        self.functions.append(node.name)
+        self.generic_visit(node)
+
+    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> None:
+        self.functions.append(node.name)
+        self.generic_visit(node)
+
+    def visit_Import(self, node: ast.Import) -> None:
+        for alias in node.names:
+            self.imports.append(alias.name)
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        if node.module:
+            self.imports.append(node.module)
+
+
+# AST 对象占用内存较大，只需覆盖同一文件的连续调用
+@lru_cache(maxsize=128)
+def _parse_cached(source_code: str) -> Optional[ast.AST]:
+    """解析源代码为 AST，按源代码字符串缓存（解析失败时缓存 None）"""
+    try:
+        return ast.parse(source_code)
+    except SyntaxError as e:
+        logger.error(f"AST解析错误: {e}")
+        return None
+
+
+@lru_cache(maxsize=256)
+def _analyze_source_cached(
+    source_code: str,
+) -> Optional[Tuple[Tuple[str, ...], Tuple[str, ...], Tuple[str, ...]]]:
+    """对缓存的 AST 单次遍历，按源代码字符串缓存结果（不可变元组）"""
+    tree = _parse_cached(source_code)
+    if tree is None:
+        return None
+
+    visitor = _DefVisitor()
+    visitor.visit(tree)
+    return tuple(visitor.classes), tuple(visitor.functions), tuple(visitor.imports)
+
+
 class ASTAnalyzer:
     """
     基于 AST (Abstract Syntax Tree) 的代码分析器。
@@ -26,6 +83,7 @@ class ASTAnalyzer:
     def parse_code(self, source_code: str) -> Optional[ast.AST]:
         """
         解析源代码为 AST 对象。
+        相同源代码只解析一次，返回的 AST 在各方法间共享，调用方不应修改。
 
         Args:
             source_code: 源代码字符串
@@ -33,11 +91,7 @@ class ASTAnalyzer:
         Returns:
             ast.AST: 解析后的 AST 对象，如果解析失败返回 None
         """
-        try:
-            return ast.parse(source_code)
-        except SyntaxError as e:
-            logger.error(f"AST解析错误: {e}")
-            return None
+        return _parse_cached(source_code)
 
     def calculate_complexity(self, source_code: str) -> List[Dict[str, Any]]:
         """
@@ -49,10 +103,13 @@ class ASTAnalyzer:
         Returns:
             List[Dict]: 包含每个函数/方法的复杂度信息的列表
         """
-        if not RADON_AVAILABLE or cc_visit is None:
+        if not RADON_AVAILABLE or cc_visit_ast is None:
+            return []
+        tree = self.parse_code(source_code)
+        if tree is None:
             return []
         try:
-            blocks = cc_visit(source_code)
+            blocks = cc_visit_ast(tree)
             results = []
             for block in blocks:
                 results.append(
@@ -70,32 +127,54 @@ class ASTAnalyzer:
             logger.error(f"圈复杂度计算失败: {e}")
             return []
 
-    def extract_definitions(self, source_code: str) -> Dict[str, List[str]]:
+    def analyze_source(self, source_code: str) -> Dict[str, List[str]]:
         """
-        从源代码中提取类和函数的名称。
+        解析一次源代码并在单次遍历中提取类、函数定义和导入模块。
+        相同源代码的结果会被缓存。
 
         Args:
             source_code: 源代码字符串
 
         Returns:
-            Dict: 包含 'classes' 和 'functions' 列表的字典
+            Dict: 包含 'classes'、'functions' 和 'imports' 列表的字典
         """
-        tree = self.parse_code(source_code)
-        if not tree:
-            return {"classes": [], "functions": []}
+        result = _analyze_source_cached(source_code)
+        if result is None:
+            return {"classes": [], "functions": [], "imports": []}
+
+        classes, functions, imports = result
+        return {
+            "classes": list(classes),
+            "functions": list(functions),
+            "imports": list(imports),
+        }
+
+    def analyze(self, source_code: str) -> Dict[str, Any]:
+        """
+        基于一次解析同时计算圈复杂度并提取定义和导入。
 
-        definitions = {"classes": [], "functions": []}
+        Args:
+            source_code: 源代码字符串
 
-        # 遍历 AST 节点
-        for node in ast.walk(tree):
-            if isinstance(node, ast.ClassDef):
-                definitions["classes"].append(node.name)
-            elif isinstance(node, ast.FunctionDef):
-                definitions["functions"].append(node.name)
-            elif isinstance(node, ast.AsyncFunctionDef):
-                definitions["functions"].append(node.name)
+        Returns:
+            Dict: 包含 'complexity'、'classes'、'functions' 和 'imports' 的字典
+        """
+        result = self.analyze_source(source_code)
+        result["complexity"] = self.calculate_complexity(source_code)
+        return result
 
-        return definitions
+    def extract_definitions(self, source_code: str) -> Dict[str, List[str]]:
+        """
+        从源代码中提取类和函数的名称。
+
+        Args:
+            source_code: 源代码字符串
+
+        Returns:
+            Dict: 包含 'classes' 和 'functions' 列表的字典
+        """
+        result = self.analyze_source(source_code)
+        return {"classes": result["classes"], "functions": result["functions"]}
 
     def analyze_imports(self, source_code: str) -> List[str]:
         """
@@ -107,17 +186,4 @@ class ASTAnalyzer:
         Returns:
             List[str]: 导入的模块名称列表
         """
-        tree = self.parse_code(source_code)
-        if not tree:
-            return []
-
-        imports = []
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Import):
-                for alias in node.names:
-                    imports.append(alias.name)
-            elif isinstance(node, ast.ImportFrom):
-                if node.module:
-                    imports.append(node.module)
-
-        return list(set(imports))
+        return list(set(self.analyze_source(source_code)["imports"]))
@@ -3,17 +3,48 @@
 复杂度分析器模块
 使用Radon库计算Python代码的圈复杂度(Cyclomatic Complexity)
 """
-from typing import Dict, List, Any, Optional
+import os
+import ast
+import logging
+from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
 
+import numpy as np
+
 try:
-    from radon.complexity import cc_visit, cc_rank
+    from radon.complexity import cc_visit, cc_visit_ast, cc_rank
     RADON_AVAILABLE = True
 except ImportError:
     RADON_AVAILABLE = False
     cc_visit = None
+    cc_visit_ast = None
     cc_rank = None
 
+from src.utils.ast_cache import AstCache
+from src.utils.file_scanner import iter_py_files, relative_path
+from src.utils.parallel import parallel_map
+from src.utils.repo_index import RepoIndex, read_text_file
+
+logger = logging.getLogger(__name__)
+
+# 文件数少于该值时串行分析，避免进程池启动开销
+PARALLEL_MIN_FILES = 32
+
+# 遍历仓库时跳过的目录
+IGNORE_DIRS = frozenset({"__pycache__", ".git"})
+
+# 圈复杂度超过该值的函数视为高复杂度
+HIGH_COMPLEXITY_THRESHOLD = 10
+
+# analyze_repository 默认保留的高复杂度函数数量
+HIGH_COMPLEXITY_TOP_K = 100
+
+
+def _analyze_file(task: Tuple[str, Optional[str]]) -> Dict[str, Any]:
+    """进程池工作函数：分析单个文件（模块级函数以便 pickle），task 为 (路径, 源码或 None)"""
+    file_path, source = task
+    return ComplexityAnalyzer(os.path.dirname(file_path)).analyze_file(file_path, source)
+
 
 class ComplexityAnalyzer:
     """
@@ -21,21 +52,32 @@ class ComplexityAnalyzer:
     使用Radon计算圈复杂度(Cyclomatic Complexity)
     """
 
-    def __init__(self, repo_path: str):
+    def __init__(
+        self,
+        repo_path: str,
+        index: Optional[RepoIndex] = None,
+        ast_cache: Optional[AstCache] = None,
+    ):
         """
         初始化复杂度分析器
 
         Args:
             repo_path: 仓库根目录路径
+            index: 共享的仓库文件索引（可选），提供时复用其文件列表和文件内容
+            ast_cache: 共享的语法树缓存（可选），提供时在当前进程内基于缓存的语法树分析，
+                与其他分析器共用同一次解析
         """
         self.repo_path = Path(repo_path)
+        self.index = index
+        self.ast_cache = ast_cache
 
-    def analyze_file(self, file_path: str) -> Dict[str, Any]:
+    def analyze_file(self, file_path: str, source: Optional[str] = None) -> Dict[str, Any]:
         """
         分析单个文件的复杂度
 
         Args:
             file_path: 文件绝对路径
+            source: 已读取的源码（可选），为 None 时从文件读取
 
         Returns:
             包含平均复杂度、最大复杂度和函数级详细信息的字典
@@ -44,51 +86,140 @@ class ComplexityAnalyzer:
             return {"error": "radon not installed", "functions": []}
             
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                code = f.read()
+            if source is None:
+                # 空文件（如空的 __init__.py）没有任何代码块，无需打开和解析
+                if os.path.getsize(file_path) == 0:
+                    return self._summarize([])
+                source = read_text_file(file_path)
 
-            blocks = cc_visit(code)
+            if not source:
+                return self._summarize([])
+            return self._summarize(cc_visit(source))
+        except Exception as e:
+            return {"error": str(e), "functions": []}
 
-            if not blocks:
-                return {"average_complexity": 0, "max_complexity": 0, "functions": []}
+    def analyze_ast(self, tree: ast.AST) -> Dict[str, Any]:
+        """
+        基于已解析的语法树分析复杂度，结果格式同 analyze_file
 
-            total_cc = sum(block.complexity for block in blocks)
-            max_cc = max(block.complexity for block in blocks)
+        Args:
+            tree: 模块语法树（不会被修改）
 
-            functions = []
-            for block in blocks:
-                functions.append({
-                    "name": block.name,
-                    "complexity": block.complexity,
-                    "lineno": block.lineno,
-                    "endline": getattr(block, 'endline', block.lineno),
-                    "is_method": block.is_method if hasattr(block, 'is_method') else False,
-                    "class_name": getattr(block, 'classname', None),
-                    "rank": cc_rank(block.complexity) if cc_rank else 'N/A',
-                })
+        Returns:
+            包含平均复杂度、最大复杂度和函数级详细信息的字典
+        """
+        if not RADON_AVAILABLE:
+            return {"error": "radon not installed", "functions": []}
+
+        try:
+            return self._summarize(cc_visit_ast(tree))
+        except Exception as e:
+            return {"error": str(e), "functions": []}
 
+    def _summarize(self, blocks: List[Any]) -> Dict[str, Any]:
+        """
+        将 radon 的代码块列表整理为分析结果
+
+        除函数级详细信息外，还附带与 functions 顺序一致的 int32 复杂度数组
+        complexities，供仓库级汇总做向量化计算。
+        """
+        if not blocks:
             return {
-                "average_complexity": total_cc / len(blocks),
-                "max_complexity": max_cc,
-                "functions": sorted(
-                    functions, key=lambda x: x["complexity"], reverse=True
-                ),
+                "average_complexity": 0,
+                "max_complexity": 0,
+                "functions": [],
+                "complexities": np.empty(0, dtype=np.int32),
             }
 
+        total_cc = sum(block.complexity for block in blocks)
+        max_cc = max(block.complexity for block in blocks)
+
+        functions = []
+        for block in blocks:
+            functions.append({
+                "name": block.name,
+                "complexity": block.complexity,
+                "lineno": block.lineno,
+                "endline": getattr(block, 'endline', block.lineno),
+                "is_method": block.is_method if hasattr(block, 'is_method') else False,
+                "class_name": getattr(block, 'classname', None),
+                "rank": cc_rank(block.complexity) if cc_rank else 'N/A',
+            })
+
+        functions.sort(key=lambda x: x["complexity"], reverse=True)
+        return {
+            "average_complexity": total_cc / len(blocks),
+            "max_complexity": max_cc,
+            "functions": functions,
+            "complexities": np.fromiter(
+                (f["complexity"] for f in functions), dtype=np.int32, count=len(functions)
+            ),
+        }
+
+    def _analyze_files(
+        self, file_paths: List[str], max_workers: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        分析多个文件，文件较多时使用进程池并行
+
+        提供 ast_cache 时改为在当前进程内基于缓存的语法树分析（语法树无法
+        低成本地跨进程传递）。
+
+        Args:
+            file_paths: 文件路径列表
+            max_workers: 最大进程数，None 使用 CPU 核数
+
+        Returns:
+            与 file_paths 顺序一致的分析结果列表
+        """
+        if self.ast_cache is not None:
+            return [self._analyze_cached(p) for p in file_paths]
+
+        tasks = [(p, self._read_source(p)) for p in file_paths]
+        # 已知为空的文件（索引读到空串）直接得到空结果，不分发给工作进程
+        pending = [task for task in tasks if task[1] != ""]
+        if len(pending) == len(tasks):
+            return parallel_map(_analyze_file, tasks, max_workers, PARALLEL_MIN_FILES)
+
+        done = iter(parallel_map(_analyze_file, pending, max_workers, PARALLEL_MIN_FILES))
+        return [self._summarize([]) if task[1] == "" else next(done) for task in tasks]
+
+    def _analyze_cached(self, file_path: str) -> Dict[str, Any]:
+        """从共享语法树缓存取得语法树并分析，解析失败时返回错误信息"""
+        try:
+            tree = self.ast_cache.tree(file_path)
         except Exception as e:
             return {"error": str(e), "functions": []}
+        return self.analyze_ast(tree)
 
-    def analyze_repository(self) -> Dict[str, Any]:
+    def _read_source(self, file_path: str) -> Optional[str]:
+        """从共享索引读取源码，没有索引或读取失败时返回 None（由 analyze_file 自行读取并报告错误）"""
+        if self.index is None:
+            return None
+        try:
+            return self.index.read_text(file_path)
+        except (OSError, UnicodeDecodeError):
+            return None
+
+    def analyze_repository(
+        self, max_workers: Optional[int] = None, top_k: int = HIGH_COMPLEXITY_TOP_K
+    ) -> Dict[str, Any]:
         """
         分析整个仓库的复杂度
 
+        Args:
+            max_workers: 并行分析的最大进程数，None 使用 CPU 核数
+            top_k: 保留复杂度最高的前 top_k 个高复杂度函数
+
         Returns:
-            仓库级的复杂度统计信息
+            仓库级的复杂度统计信息；high_complexity_count 为高复杂度函数总数，
+            high_complexity_functions 只包含其中复杂度最高的 top_k 个（降序）
         """
         stats = {
             "total_complexity": 0,
             "total_functions": 0,
             "high_complexity_functions": [],
+            "high_complexity_count": 0,
             "files_analyzed": 0,
             "average_complexity": 0,
         }
@@ -97,32 +228,53 @@ class ComplexityAnalyzer:
             stats["error"] = "radon not installed"
             return stats
 
-        for file_path in self.repo_path.rglob("*.py"):
-            if '__pycache__' in str(file_path) or '.git' in str(file_path):
-                continue
-                
-            file_result = self.analyze_file(str(file_path))
+        # 遍历时剪枝忽略目录；子串过滤保留原有语义（如 .github 下的文件同样排除）
+        file_paths = [
+            file_path
+            for file_path in (
+                self.index.files(".py", IGNORE_DIRS)
+                if self.index
+                else iter_py_files(str(self.repo_path), IGNORE_DIRS)
+            )
+            if '__pycache__' not in file_path and '.git' not in file_path
+        ]
+        results = self._analyze_files(file_paths, max_workers)
 
+        # 各文件的复杂度数组拼接成一个数组，求和/筛选/排序都在 NumPy 中完成
+        analyzed = []
+        chunks = []
+        for file_path, file_result in zip(file_paths, results):
             if "error" in file_result:
                 continue
-
-            stats["files_analyzed"] += 1
-            if file_result.get("functions"):
-                stats["total_complexity"] += sum(
-                    f["complexity"] for f in file_result["functions"]
+            functions = file_result.get("functions") or []
+            complexities = file_result.get("complexities")
+            if complexities is None:
+                complexities = np.fromiter(
+                    (f["complexity"] for f in functions), dtype=np.int32, count=len(functions)
                 )
-                stats["total_functions"] += len(file_result["functions"])
+            analyzed.append((file_path, functions))
+            chunks.append(complexities)
 
-                for func in file_result["functions"]:
-                    if func["complexity"] > 10:
-                        func["file"] = str(file_path.relative_to(self.repo_path))
-                        stats["high_complexity_functions"].append(func)
+        stats["files_analyzed"] = len(analyzed)
+        all_cc = np.concatenate(chunks) if chunks else np.empty(0, dtype=np.int32)
+        stats["total_functions"] = int(all_cc.size)
+        stats["total_complexity"] = int(all_cc.sum(dtype=np.int64))
+
+        high_idx = np.flatnonzero(all_cc > HIGH_COMPLEXITY_THRESHOLD)
+        stats["high_complexity_count"] = int(high_idx.size)
+
+        # 稳定降序排序后取前 top_k：相同复杂度保持出现顺序，只为选中的函数查找详细信息
+        top_idx = high_idx[np.argsort(-all_cc[high_idx], kind="stable")[:top_k]]
+        offsets = np.cumsum([0] + [len(functions) for _, functions in analyzed])
+        file_idx = np.searchsorted(offsets, top_idx, side="right") - 1
+        root = os.fspath(self.repo_path)
+        for i, k in zip(top_idx.tolist(), file_idx.tolist()):
+            file_path, functions = analyzed[k]
+            func = functions[i - offsets[k]]
+            func["file"] = relative_path(file_path, root)
+            stats["high_complexity_functions"].append(func)
 
         if stats["total_functions"] > 0:
             stats["average_complexity"] = stats["total_complexity"] / stats["total_functions"]
 
-        stats["high_complexity_functions"].sort(
-            key=lambda x: x["complexity"], reverse=True
-        )
-
         return stats
@@ -5,120 +5,298 @@
 """
 import ast
 import os
+import sys
 import logging
 from pathlib import Path
-from typing import Dict, List, Set, Tuple
-from collections import defaultdict
+from typing import Any, Collection, Dict, Iterator, List, Optional, Set, Tuple
+from collections import Counter, defaultdict, deque
+from functools import lru_cache
+
+import numpy as np
+
+from src.utils.ast_cache import AstCache
+from src.utils.file_scanner import iter_py_files, relative_path
+from src.utils.parallel import parallel_map
+from src.utils.repo_index import RepoIndex
 
 logger = logging.getLogger(__name__)
 
 
+# 标准库模块名（Python 3.10+ 由解释器提供完整列表）
+_STDLIB = frozenset(getattr(sys, "stdlib_module_names", {
+    "os", "sys", "json", "re", "time", "datetime", "pathlib",
+    "logging", "collections", "typing", "functools", "itertools",
+    "ast", "abc", "copy", "io", "math", "random", "hashlib"
+}))
+
+# 视为项目内部依赖的顶层包
+_INTERNAL_ROOTS = frozenset({"src", "tests", "flask", "werkzeug", "jinja2"})
+
+# 可能包含语句的节点类型；导入只会出现在语句层级，表达式子树无需遍历
+_STATEMENT_NODES = (ast.stmt, ast.excepthandler, ast.match_case)
+
+
+def _iter_import_nodes(tree: ast.Module) -> Iterator[ast.stmt]:
+    """
+    按 ast.walk 的广度优先顺序产出 Import/ImportFrom 节点，但只遍历语句层级
+
+    Args:
+        tree: 模块语法树
+
+    Yields:
+        导入语句节点
+    """
+    todo = deque([tree])
+    while todo:
+        node = todo.popleft()
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            yield node
+            continue
+        todo.extend(
+            child for child in ast.iter_child_nodes(node)
+            if isinstance(child, _STATEMENT_NODES)
+        )
+
+
+@lru_cache(maxsize=8192)
+def _classify(module: str) -> str:
+    """
+    将导入的模块分类为内部或外部依赖
+
+    Args:
+        module: 模块名
+
+    Returns:
+        "internal" 或 "external"
+    """
+    root_module = module.split(".")[0]
+
+    # 标准库和第三方库视为外部
+    if root_module in _STDLIB:
+        return "external"
+    if root_module in _INTERNAL_ROOTS:
+        return "internal"
+    return "external"
+
+
+def graph_to_csr(graph: Dict[str, List[str]]) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """
+    将邻接表形式的依赖图转换为 CSR（压缩稀疏行）数组
+
+    与 networkx.DiGraph 的语义一致：节点按首次出现的顺序编号，重复边只保留一条。
+
+    Args:
+        graph: 邻接表 {节点: [依赖节点, ...]}
+
+    Returns:
+        (节点名列表, indptr, indices)：节点 i 的出边终点为 indices[indptr[i]:indptr[i+1]]
+    """
+    node_index: Dict[str, int] = {}
+    src: List[int] = []
+    dst: List[int] = []
+    for source, targets in graph.items():
+        i = node_index.setdefault(source, len(node_index))
+        for target in targets:
+            src.append(i)
+            dst.append(node_index.setdefault(target, len(node_index)))
+
+    n = len(node_index)
+    # 以 src * n + dst 编码边，np.unique 同时完成去重和按 (src, dst) 排序
+    edges = np.unique(np.asarray(src, dtype=np.int64) * n + np.asarray(dst, dtype=np.int64))
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(edges // n, minlength=n), out=indptr[1:])
+    return list(node_index), indptr, (edges % n).astype(np.int32)
+
+
+def _empty_result() -> Dict[str, List[str]]:
+    """单个文件的空导入结果"""
+    return {"imports": [], "from_imports": [], "external": [], "internal": []}
+
+
+def _analyze_file(task: Tuple[str, Optional[str]]) -> Dict[str, List[str]]:
+    """进程池工作函数：分析单个文件的导入（模块级函数以便 pickle），task 为 (路径, 源码或 None)"""
+    file_path, source = task
+    return DependencyAnalyzer(os.path.dirname(file_path)).analyze_file(file_path, source)
+
+
 class DependencyAnalyzer:
     """
     项目依赖关系分析器
     分析import语句构建依赖图
     """
     
-    def __init__(self, project_path: str):
+    def __init__(
+        self,
+        project_path: str,
+        index: Optional[RepoIndex] = None,
+        ast_cache: Optional[AstCache] = None,
+        store_file_details: bool = False,
+    ):
         """
         初始化分析器
         
         Args:
             project_path: 项目根目录路径
+            index: 共享的仓库文件索引（可选），提供时复用其文件列表和文件内容
+            ast_cache: 共享的语法树缓存（可选），提供时在当前进程内基于缓存的语法树分析，
+                与其他分析器共用同一次解析
+            store_file_details: analyze_project 是否在结果中返回逐文件的导入详情
         """
         self.project_path = Path(project_path)
+        self.index = index
+        self.ast_cache = ast_cache
+        self.store_file_details = store_file_details
         self.dependencies: Dict[str, Set[str]] = defaultdict(set)
         self.external_deps: Set[str] = set()
         self.internal_deps: Dict[str, Set[str]] = defaultdict(set)
+        # (文件路径, 修改时间) -> analyze_file 结果，analyze_project 与 get_dependency_graph 共用
+        self._import_cache: Dict[Tuple[str, int], Dict[str, List[str]]] = {}
     
-    def analyze_file(self, file_path: str) -> Dict[str, List[str]]:
+    def analyze_file(self, file_path: str, source: Optional[str] = None) -> Dict[str, List[str]]:
         """
         分析单个文件的导入依赖
         
         Args:
             file_path: 文件路径
+            source: 已读取的源码（可选），为 None 时从文件读取
             
         Returns:
             导入信息字典
         """
-        result = {
-            "imports": [],
-            "from_imports": [],
-            "external": [],
-            "internal": []
-        }
-        
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                code = f.read()
-            
-            tree = ast.parse(code)
+            if source is None:
+                with open(file_path, "r", encoding="utf-8") as f:
+                    source = f.read()
+            code = source
+
+            # 不含 import 关键字的文件不可能有导入语句，省去解析
+            if "import" not in code:
+                return _empty_result()
             
-            for node in ast.walk(tree):
-                if isinstance(node, ast.Import):
-                    for alias in node.names:
-                        result["imports"].append(alias.name)
-                        self._classify_import(alias.name, result)
-                        
-                elif isinstance(node, ast.ImportFrom):
-                    if node.module:
-                        result["from_imports"].append(node.module)
-                        self._classify_import(node.module, result)
+            return self.analyze_ast(ast.parse(code))
                         
         except Exception as e:
             logger.debug(f"分析文件失败 {file_path}: {e}")
         
+        return _empty_result()
+
+    def analyze_ast(self, tree: ast.AST) -> Dict[str, List[str]]:
+        """
+        从已解析的语法树提取导入依赖，结果格式同 analyze_file
+
+        Args:
+            tree: 模块语法树（不会被修改）
+
+        Returns:
+            导入信息字典
+        """
+        result = _empty_result()
+        for node in _iter_import_nodes(tree):
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    result["imports"].append(alias.name)
+                    result[_classify(alias.name)].append(alias.name)
+
+            elif isinstance(node, ast.ImportFrom):
+                if node.module:
+                    result["from_imports"].append(node.module)
+                    result[_classify(node.module)].append(node.module)
         return result
     
-    def _classify_import(self, module: str, result: Dict):
-        """分类导入为内部或外部"""
-        # 检查是否为相对导入或项目内模块
-        root_module = module.split(".")[0]
-        
-        # 简单规则：标准库和第三方库视为外部
-        stdlib_modules = {
-            "os", "sys", "json", "re", "time", "datetime", "pathlib",
-            "logging", "collections", "typing", "functools", "itertools",
-            "ast", "abc", "copy", "io", "math", "random", "hashlib"
-        }
-        
-        if root_module in stdlib_modules or module in stdlib_modules:
-            result["external"].append(module)
-        elif root_module in ["src", "tests", "flask", "werkzeug", "jinja2"]:
-            result["internal"].append(module)
-        else:
-            result["external"].append(module)
-    
-    def analyze_project(self) -> Dict[str, any]:
+    def _analyze_files(
+        self, file_paths: List[str], max_workers: Optional[int] = None
+    ) -> List[Dict[str, List[str]]]:
+        """
+        分析多个文件的导入，文件较多时使用进程池并行
+
+        结果按 (路径, 修改时间) 缓存，未修改的文件不会被重复解析。提供 ast_cache
+        时改为在当前进程内基于缓存的语法树分析。
+
+        Args:
+            file_paths: 文件路径列表
+            max_workers: 最大进程数，None 使用 CPU 核数
+
+        Returns:
+            与 file_paths 顺序一致的分析结果列表
+        """
+        keys = [(p, os.stat(p).st_mtime_ns) for p in file_paths]
+        missing = [key for key in keys if key not in self._import_cache]
+        if missing:
+            if self.ast_cache is not None:
+                results = [self._analyze_cached(p) for p, _ in missing]
+            else:
+                tasks = [(p, self._read_source(p)) for p, _ in missing]
+                results = parallel_map(_analyze_file, tasks, max_workers)
+            self._import_cache.update(zip(missing, results))
+        return [self._import_cache[key] for key in keys]
+
+    def _analyze_cached(self, file_path: str) -> Dict[str, List[str]]:
+        """从共享语法树缓存取得语法树并提取导入，解析失败时返回空结果"""
+        try:
+            tree = self.ast_cache.tree(file_path)
+        except Exception as e:
+            logger.debug(f"分析文件失败 {file_path}: {e}")
+            return _empty_result()
+        return self.analyze_ast(tree)
+
+    def _read_source(self, file_path: str) -> Optional[str]:
+        """从共享索引读取源码，没有索引或读取失败时返回 None（由 analyze_file 自行读取）"""
+        if self.index is None:
+            return None
+        try:
+            return self.index.read_text(file_path)
+        except (OSError, UnicodeDecodeError):
+            return None
+
+    def _python_files(self, ignore_dirs: Collection[str]) -> List[str]:
+        """
+        项目中的全部 .py 文件（有共享索引时复用其遍历结果）
+
+        Args:
+            ignore_dirs: 遍历时剪枝的目录名
+
+        Returns:
+            文件路径（字符串）列表
+        """
+        if self.index is not None:
+            return self.index.files(".py", ignore_dirs)
+        return list(iter_py_files(str(self.project_path), ignore_dirs))
+
+    def analyze_project(self, max_workers: Optional[int] = None) -> Dict[str, any]:
         """
         分析整个项目的依赖关系
         
+        Args:
+            max_workers: 并行分析的最大进程数，None 使用 CPU 核数
+
         Returns:
-            项目依赖分析结果
+            项目依赖分析结果；file_dependencies 仅在 store_file_details 为 True 时填充
         """
-        all_imports = defaultdict(int)
+        all_imports = Counter()
         file_deps = {}
         
-        for py_file in self.project_path.rglob("*.py"):
-            if "__pycache__" in str(py_file) or ".git" in str(py_file):
-                continue
-            
-            rel_path = str(py_file.relative_to(self.project_path))
-            file_result = self.analyze_file(str(py_file))
-            file_deps[rel_path] = file_result
+        # 遍历时剪枝忽略目录；子串过滤保留原有语义（如 .github 下的文件同样排除）
+        file_paths = [
+            py_file for py_file in self._python_files(("__pycache__", ".git"))
+            if "__pycache__" not in py_file and ".git" not in py_file
+        ]
+        results = self._analyze_files(file_paths, max_workers)
+        root = os.fspath(self.project_path)
+
+        for py_file, file_result in zip(file_paths, results):
+            if self.store_file_details:
+                file_deps[relative_path(py_file, root)] = file_result
             
             # 统计导入频率
-            for imp in file_result["imports"] + file_result["from_imports"]:
-                all_imports[imp] += 1
-        
-        # 排序导入
-        sorted_imports = sorted(all_imports.items(), key=lambda x: x[1], reverse=True)
+            all_imports.update(file_result["imports"])
+            all_imports.update(file_result["from_imports"])
         
         return {
-            "files_analyzed": len(file_deps),
+            "files_analyzed": len(file_paths),
             "total_imports": sum(all_imports.values()),
             "unique_imports": len(all_imports),
-            "top_imports": sorted_imports[:30],
+            # most_common 与按计数降序的稳定排序结果一致
+            "top_imports": all_imports.most_common(30),
             "file_dependencies": file_deps,
         }
     
@@ -131,14 +309,60 @@ class DependencyAnalyzer:
         """
         graph = {}
         
-        for py_file in self.project_path.rglob("*.py"):
-            if "__pycache__" in str(py_file):
-                continue
-            
-            rel_path = str(py_file.relative_to(self.project_path))
-            file_result = self.analyze_file(str(py_file))
+        file_paths = [
+            py_file for py_file in self._python_files(("__pycache__",))
+            if "__pycache__" not in py_file
+        ]
+        results = self._analyze_files(file_paths)
+        root = os.fspath(self.project_path)
+
+        for py_file, file_result in zip(file_paths, results):
+            rel_path = relative_path(py_file, root)
             
             # 只保留内部依赖
             graph[rel_path] = file_result.get("internal", [])
         
         return graph
+
+    def get_graph_stats(
+        self, graph: Optional[Dict[str, List[str]]] = None, top_n: int = 5
+    ) -> Dict[str, Any]:
+        """
+        计算依赖图的规模、平均度、密度和度中心性最高的节点
+
+        基于 CSR 数组计算，不构建 networkx 图；各指标的定义与 networkx 对
+        DiGraph 的计算一致（度 = 入度 + 出度，度中心性 = 度 / (n - 1)）。
+
+        Args:
+            graph: 邻接表形式的依赖图，None 时使用 get_dependency_graph() 的结果
+            top_n: 返回度中心性最高的节点数
+
+        Returns:
+            包含 nodes、edges、avg_degree、density、top_degree_centrality 的字典
+        """
+        if graph is None:
+            graph = self.get_dependency_graph()
+
+        nodes, indptr, indices = graph_to_csr(graph)
+        n = len(nodes)
+        m = int(indices.size)
+        stats = {
+            "nodes": n,
+            "edges": m,
+            "avg_degree": 2 * m / n if n else 0.0,
+            "density": m / (n * (n - 1)) if n > 1 else 0.0,
+            "top_degree_centrality": [],
+        }
+        if n <= 1:
+            # 与 networkx 一致：单节点图的度中心性为 1
+            stats["top_degree_centrality"] = [(node, 1.0) for node in nodes[:top_n]]
+            return stats
+
+        degree = np.bincount(indices, minlength=n) + np.diff(indptr)
+        scale = 1.0 / (n - 1)
+        # 稳定降序：度相同的节点保持首次出现的顺序
+        top = np.argsort(-degree, kind="stable")[:top_n]
+        stats["top_degree_centrality"] = [
+            (nodes[i], float(degree[i] * scale)) for i in top.tolist()
+        ]
+        return stats
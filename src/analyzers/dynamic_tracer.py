@@ -1,11 +1,16 @@
 import pysnooper
 import logging
-from typing import Callable, Any, Dict, List
+from typing import Callable, Any, Dict, List, TextIO, Union
+from weakref import WeakKeyDictionary
 import functools
+import types
 
 # 配置日志记录器
 logger = logging.getLogger(__name__)
 
+# 被追踪函数 __dict__ 中保存 {追踪器: 追踪包装} 的属性名
+_WRAPPERS_ATTR = "__dynamic_tracer_wrappers__"
+
 
 class DynamicTracer:
     """
@@ -13,15 +18,44 @@ class DynamicTracer:
     用于在运行时追踪函数的执行路径、变量变化等。
     """
 
-    def __init__(self, log_file: str = "trace.log"):
+    def __init__(self, log_file: Union[str, TextIO] = "trace.log"):
         """
         初始化动态追踪器。
 
         Args:
-            log_file: 追踪日志保存路径
+            log_file: 追踪日志保存路径，或已打开的可写文件对象（直接写入，不再按路径重复打开）
         """
         self.log_file = log_file
 
+    def _get_wrapper(self, func: Callable) -> Callable:
+        """
+        获取 func 的追踪包装（带缓存）
+
+        普通函数直接由 pysnooper 装饰；内置函数等没有 __code__ 的可调用对象
+        无法被直接追踪，改为追踪一层转发调用的闭包。
+
+        包装强引用着 func，因此缓存保存在 func 自身的 __dict__ 中（按追踪器
+        弱引用区分），随 func 一起被回收；绑定方法、内置函数等不缓存。
+        """
+        cache = None
+        if isinstance(func, types.FunctionType):
+            cache = func.__dict__.get(_WRAPPERS_ATTR)
+            if cache is not None and self in cache:
+                return cache[self]
+
+        if hasattr(func, "__code__"):
+            wrapper = pysnooper.snoop(self.log_file)(func)
+        else:
+            @pysnooper.snoop(self.log_file)
+            def wrapper(*w_args, **w_kwargs):
+                return func(*w_args, **w_kwargs)
+
+        if isinstance(func, types.FunctionType):
+            if cache is None:
+                cache = func.__dict__.setdefault(_WRAPPERS_ATTR, WeakKeyDictionary())
+            cache[self] = wrapper
+        return wrapper
+
     def trace_function(self, func: Callable, *args, **kwargs) -> Any:
         """
         追踪特定函数的执行。
@@ -34,12 +68,8 @@ class DynamicTracer:
         Returns:
             Any: 函数的返回值
         """
-        # 使用 pysnooper 装饰器包装函数
-        # 注意: 这里我们动态应用装饰器，而不是在定义时应用
-
-        @pysnooper.snoop(self.log_file)
-        def wrapper(*w_args, **w_kwargs):
-            return func(*w_args, **w_kwargs)
+        # 动态应用 pysnooper 装饰器，同一函数的包装只构建一次
+        wrapper = self._get_wrapper(func)
 
         try:
             return wrapper(*args, **kwargs)
@@ -14,6 +14,15 @@ class ImportVisitor(cst.CSTVisitor):
     def __init__(self):
         self.imports = []
 
+    def on_visit(self, node: cst.CSTNode) -> bool:
+        """
+        分派到 visit_* 后决定是否继续深入子节点
+
+        导入只会出现在语句层级：表达式子树以及已处理的导入语句本身无需继续遍历。
+        """
+        super().on_visit(node)
+        return not isinstance(node, (cst.BaseExpression, cst.Import, cst.ImportFrom))
+
     def visit_Import(self, node: cst.Import) -> None:
         """访问 import 语句"""
         for name in node.names:
@@ -28,6 +37,53 @@ class ImportVisitor(cst.CSTVisitor):
                 self.imports.append(module_name)
 
 
+# 节点类型 -> 统计项
+_STAT_KEYS = {
+    cst.FunctionDef: "functions",
+    cst.ClassDef: "classes",
+    cst.For: "loops",
+    cst.While: "loops",
+    cst.If: "conditionals",
+}
+
+
+class StatVisitor(cst.CSTVisitor):
+    """
+    LibCST 访问器，统计函数、类、循环和条件语句的数量。
+    """
+
+    def __init__(self):
+        self.stats = {"functions": 0, "classes": 0, "loops": 0, "conditionals": 0}
+
+    def on_visit(self, node: cst.CSTNode) -> bool:
+        """
+        按节点类型查表计数，不经过逐类型的 visit_* 分派
+
+        统计的节点都是语句：表达式子树（推导式中的 for/if 属于 CompFor/CompIf）无需继续遍历。
+        """
+        key = _STAT_KEYS.get(type(node))
+        if key is not None:
+            self.stats[key] += 1
+        return not isinstance(node, cst.BaseExpression)
+
+
+class CombinedVisitor(ImportVisitor):
+    """
+    LibCST 访问器，单次遍历同时收集导入信息和节点统计。
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.stats = {"functions": 0, "classes": 0, "loops": 0, "conditionals": 0}
+
+    def on_visit(self, node: cst.CSTNode) -> bool:
+        """先按节点类型查表计数，再交给 ImportVisitor 分派导入语句并决定是否深入"""
+        key = _STAT_KEYS.get(type(node))
+        if key is not None:
+            self.stats[key] += 1
+        return super().on_visit(node)
+
+
 class LibCSTAnalyzer:
     """
     基于 LibCST 的代码分析器。
@@ -64,6 +120,10 @@ class LibCSTAnalyzer:
         Returns:
             List[str]: 导入列表
         """
+        # 不含 import 关键字的源码不可能有导入语句，省去解析
+        if "import" not in source_code:
+            return []
+
         module = self.parse_module(source_code)
         if not module:
             return []
@@ -86,30 +146,24 @@ class LibCSTAnalyzer:
         if not module:
             return {}
 
-        stats = {"functions": 0, "classes": 0, "loops": 0, "conditionals": 0}
-
-        # 简单的节点遍历统计
-        # 注意: 这里使用简单的 isinstance 检查，实际遍历可能需要 visitor
-        # 为了演示，我们使用 visitor 模式的简化版逻辑（手动 walk 或者使用 matcher）
-        # 这里为了简单起见，我们定义一个统计 Visitor
-
-        class StatVisitor(cst.CSTVisitor):
-            def visit_FunctionDef(self, node: cst.FunctionDef):
-                stats["functions"] += 1
-
-            def visit_ClassDef(self, node: cst.ClassDef):
-                stats["classes"] += 1
-
-            def visit_For(self, node: cst.For):
-                stats["loops"] += 1
+        visitor = StatVisitor()
+        module.visit(visitor)
+        return visitor.stats
 
-            def visit_While(self, node: cst.While):
-                stats["loops"] += 1
+    def analyze_all(self, source_code: str) -> Dict[str, Any]:
+        """
+        解析一次源代码，在单次遍历中同时提取导入并统计节点数量。
 
-            def visit_If(self, node: cst.If):
-                stats["conditionals"] += 1
+        Args:
+            source_code: 源代码字符串
 
-        if module:
-            module.visit(StatVisitor())
+        Returns:
+            Dict: 包含 'imports'（同 analyze_imports）和 'node_counts'（同 count_nodes）的字典
+        """
+        module = self.parse_module(source_code)
+        if not module:
+            return {"imports": [], "node_counts": {}}
 
-        return stats
+        visitor = CombinedVisitor()
+        module.visit(visitor)
+        return {"imports": visitor.imports, "node_counts": visitor.stats}
@@ -4,13 +4,30 @@
 """
 
 import os
+from operator import methodcaller
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 from collections import defaultdict
 import logging
 
+from src.utils.file_scanner import path_suffix
+from src.utils.parallel import parallel_map
+from src.utils.repo_index import read_text_file
+
+try:
+    import numpy as np
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    np = None
+    njit = None
+
 logger = logging.getLogger(__name__)
 
+# 不小于该字符数的纯 ASCII Python 文件才交给 numba 内核，小文件上 str 方法已足够快
+NUMBA_MIN_CHARS = 16 * 1024
+
 LANGUAGE_EXTENSIONS = {
     ".py": "Python",
     ".js": "JavaScript",
@@ -32,11 +49,108 @@ LANGUAGE_EXTENSIONS = {
     ".cfg": "Config",
 }
 
-IGNORE_DIRS = {
+IGNORE_DIRS = frozenset({
     "__pycache__", ".git", ".svn", ".hg", "node_modules",
     "venv", ".venv", "env", ".env", "build", "dist",
     ".tox", ".pytest_cache", ".mypy_cache", ".eggs",
-}
+})
+
+
+# 供 map 使用的 C 层谓词（HTML 注释标记可出现在行内任意位置）
+_HAS_HTML_COMMENT = methodcaller("__contains__", "<!--")
+
+
+def split_stripped_lines(text: str) -> List[str]:
+    """
+    将文本按行切分并去除首尾空白，行的划分与逐行读取文件一致
+
+    Args:
+        text: 以文本模式读入的文件内容
+
+    Returns:
+        去除首尾空白后的各行，空行为空串
+    """
+    lines = text.split("\n")
+    if not lines[-1]:
+        # 末尾换行之后（或空文本）的空串不算一行
+        lines.pop()
+    return list(map(str.strip, lines))
+
+
+def count_prefixed_lines(stripped: List[str], prefixes: Tuple[str, ...]) -> int:
+    """
+    统计以任一前缀开头的行数
+
+    用换行把各行重新拼接后对 "\\n" + 前缀计数，整个过程在 C 层完成，
+    避免逐行调用 startswith。prefixes 之间不能互为前缀，否则会重复计数。
+
+    Args:
+        stripped: split_stripped_lines 的结果（各行不含换行符）
+        prefixes: 行首前缀，如 ("#", "//")
+
+    Returns:
+        匹配的行数
+    """
+    joined = "\n" + "\n".join(stripped)
+    return sum(joined.count("\n" + prefix) for prefix in prefixes)
+
+
+def _count_python_comments(text: str, stripped: List[str]) -> int:
+    """统计 Python 注释行：三引号行切换多行注释状态，其间的非空行和 # 开头的行计为注释"""
+    if '"""' not in text and "'''" not in text:
+        # 没有三引号时不需要状态机
+        return count_prefixed_lines(stripped, ("#",))
+
+    comment = 0
+    in_multiline_comment = False
+    for line in filter(None, stripped):
+        if line.startswith('"""') or line.startswith("'''"):
+            in_multiline_comment = not in_multiline_comment
+            comment += 1
+        elif in_multiline_comment or line.startswith("#"):
+            comment += 1
+    return comment
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, nogil=True)
+    def _count_python_lines_kernel(buf):
+        """
+        单次扫描 ASCII 字节统计 Python 文件的 (总行数, 空行数, 注释行数)，
+        判定规则与 split_stripped_lines + _count_python_comments 一致
+        """
+        total = 0
+        blank = 0
+        comment = 0
+        in_multiline_comment = False
+        n = len(buf)
+        i = 0
+        while i < n:
+            # 跳过行首空白（str.strip 在 ASCII 范围内视为空白的字符）
+            j = i
+            while j < n and buf[j] != 10 and (buf[j] == 32 or 9 <= buf[j] <= 13 or 28 <= buf[j] <= 31):
+                j += 1
+            end = j
+            while end < n and buf[end] != 10:
+                end += 1
+
+            total += 1
+            if j == end:
+                blank += 1
+            else:
+                c = buf[j]
+                if (c == 34 or c == 39) and j + 2 < end and buf[j + 1] == c and buf[j + 2] == c:
+                    in_multiline_comment = not in_multiline_comment
+                    comment += 1
+                elif in_multiline_comment or c == 35:
+                    comment += 1
+            i = end + 1
+        return total, blank, comment
+
+
+def _count_file_lines(file_path: Path) -> Tuple[int, int, int]:
+    """进程池工作函数：统计单个文件行数（模块级函数以便 pickle）"""
+    return LOCAnalyzer(file_path.parent).count_lines(file_path)
 
 
 class LOCAnalyzer:
@@ -58,6 +172,27 @@ class LOCAnalyzer:
         comment = 0
         
         try:
+            if file_path.suffix not in [".js", ".ts", ".css"]:
+                # 一次读入（大文件内存映射），切分/去空白/计数都交给 C 层的 str 方法和 map
+                text = read_text_file(file_path, errors="ignore")
+                if (
+                    NUMBA_AVAILABLE
+                    and file_path.suffix == ".py"
+                    and len(text) >= NUMBA_MIN_CHARS
+                    and text.isascii()
+                ):
+                    buf = np.frombuffer(text.encode("ascii"), dtype=np.uint8)
+                    return tuple(int(x) for x in _count_python_lines_kernel(buf))
+
+                stripped = split_stripped_lines(text)
+                total = len(stripped)
+                blank = stripped.count("")
+                if file_path.suffix == ".py":
+                    comment = _count_python_comments(text, stripped)
+                elif file_path.suffix == ".html":
+                    comment = sum(map(_HAS_HTML_COMMENT, stripped))
+                return total, blank, comment
+
             with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
                 in_multiline_comment = False
                 
@@ -100,23 +235,45 @@ class LOCAnalyzer:
         
         return total, blank, comment
     
-    def analyze(self) -> Dict[str, Dict]:
-        """分析整个目录"""
+    def analyze(self, max_workers: Optional[int] = None) -> Dict[str, Dict]:
+        """
+        分析整个目录
+
+        Args:
+            max_workers: 并行统计的最大进程数，None 使用 CPU 核数
+        """
+        # 热循环中使用局部变量，省去全局名查找；只为目标语言的文件构造 Path
+        ignore = IGNORE_DIRS
+        lang_map = LANGUAGE_EXTENSIONS
+        file_paths = []
+        langs = []
         for root, dirs, files in os.walk(self.root_path):
-            dirs[:] = [d for d in dirs if d not in IGNORE_DIRS]
+            dirs[:] = [d for d in dirs if d not in ignore]
             
             for filename in files:
-                file_path = Path(root) / filename
-                ext = file_path.suffix.lower()
-                
-                if ext in LANGUAGE_EXTENSIONS:
-                    lang = LANGUAGE_EXTENSIONS[ext]
-                    total, blank, comment = self.count_lines(file_path)
-                    
-                    self.stats[lang]["files"] += 1
-                    self.stats[lang]["lines"] += total
-                    self.stats[lang]["blank"] += blank
-                    self.stats[lang]["comment"] += comment
+                lang = lang_map.get(path_suffix(filename).lower())
+                if lang is None:
+                    continue
+                file_paths.append(Path(root, filename))
+                langs.append(lang)
+
+        results = parallel_map(_count_file_lines, file_paths, max_workers)
+
+        # 按语言累加到定长行 [files, lines, blank, comment]，最后一次性合并进 self.stats
+        lang_tbl: Dict[str, List[int]] = defaultdict(lambda: [0, 0, 0, 0])
+        for lang, (total, blank, comment) in zip(langs, results):
+            row = lang_tbl[lang]
+            row[0] += 1
+            row[1] += total
+            row[2] += blank
+            row[3] += comment
+
+        for lang, (files, lines, blank, comment) in lang_tbl.items():
+            lang_stats = self.stats[lang]
+            lang_stats["files"] += files
+            lang_stats["lines"] += lines
+            lang_stats["blank"] += blank
+            lang_stats["comment"] += comment
         
         return dict(self.stats)
     
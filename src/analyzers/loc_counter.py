@@ -1,8 +1,24 @@
 # src/analyzers/loc_counter.py
 import os
-from typing import Dict, List, Any
+from collections import defaultdict
+from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
-from src.utils.file_scanner import FileScanner
+from src.utils.file_scanner import FileScanner, path_suffix, relative_path
+from src.utils.parallel import parallel_map
+from src.utils.repo_index import RepoIndex, read_text_file
+from src.analyzers.loc_analyzer import count_prefixed_lines, split_stripped_lines
+
+# 注释行的行首前缀
+_COMMENT_PREFIXES = ("#", "//")
+
+# by_extension 各统计项，与累加行的下标一一对应
+_EXT_FIELDS = ("total", "code", "comment", "blank", "files")
+
+
+def _analyze_file(task: Tuple[str, Optional[str]]) -> Dict[str, int]:
+    """进程池工作函数：分析单个文件行数（模块级函数以便 pickle），task 为 (路径, 文本或 None)"""
+    file_path, text = task
+    return LOCCounter(os.path.dirname(file_path))._analyze_file(file_path, text)
 
 
 class LOCCounter:
@@ -11,20 +27,25 @@ class LOCCounter:
     用于统计项目中的代码行数、注释行数和空行数
     """
 
-    def __init__(self, repo_path: str):
+    def __init__(self, repo_path: str, index: Optional[RepoIndex] = None):
         """
         初始化LOC计数器
 
         Args:
             repo_path: 仓库根目录路径
+            index: 共享的仓库文件索引（可选），提供时复用其文件列表和文件内容
         """
         self.repo_path = Path(repo_path)
         self.scanner = FileScanner(repo_path)
+        self.index = index
 
-    def count_lines(self) -> Dict[str, Any]:
+    def count_lines(self, max_workers: Optional[int] = None) -> Dict[str, Any]:
         """
         统计代码行数
 
+        Args:
+            max_workers: 并行统计的最大进程数，None 使用 CPU 核数
+
         Returns:
             包含统计结果的字典，包括总行数、各语言行数等
         """
@@ -38,11 +59,20 @@ class LOCCounter:
         }
 
         # 获取所有相关文件
-        files = self.scanner.scan_files()
-
-        for file_path in files:
+        if self.index is not None:
+            files = self.index.files(ignore_dirs=self.scanner.ignore_dirs)
+            tasks = [(p, self._read_text(p)) for p in files]
+        else:
+            files = list(self.scanner.scan_files())
+            tasks = [(p, None) for p in files]
+        results = parallel_map(_analyze_file, tasks, max_workers)
+
+        # 按扩展名累加到定长行 [total, code, comment, blank, files]，最后一次性转换为字典
+        ext_tbl: Dict[str, List[int]] = defaultdict(lambda: [0, 0, 0, 0, 0])
+        root = os.fspath(self.repo_path)
+
+        for file_path, file_stats in zip(files, results):
             try:
-                file_stats = self._analyze_file(file_path)
 
                 # 累加总计
                 stats["total_lines"] += file_stats["total"]
@@ -51,37 +81,40 @@ class LOCCounter:
                 stats["blank_lines"] += file_stats["blank"]
 
                 # 按文件记录
-                rel_path = str(Path(file_path).relative_to(self.repo_path))
+                rel_path = relative_path(file_path, root)
                 stats["by_file"][rel_path] = file_stats
 
                 # 按扩展名统计
-                ext = Path(file_path).suffix or "no_extension"
-                if ext not in stats["by_extension"]:
-                    stats["by_extension"][ext] = {
-                        "total": 0,
-                        "code": 0,
-                        "comment": 0,
-                        "blank": 0,
-                        "files": 0,
-                    }
-
-                stats["by_extension"][ext]["total"] += file_stats["total"]
-                stats["by_extension"][ext]["code"] += file_stats["code"]
-                stats["by_extension"][ext]["comment"] += file_stats["comment"]
-                stats["by_extension"][ext]["blank"] += file_stats["blank"]
-                stats["by_extension"][ext]["files"] += 1
+                row = ext_tbl[path_suffix(file_path) or "no_extension"]
+                row[0] += file_stats["total"]
+                row[1] += file_stats["code"]
+                row[2] += file_stats["comment"]
+                row[3] += file_stats["blank"]
+                row[4] += 1
 
             except Exception as e:
                 print(f"Error analyzing file {file_path}: {e}")
 
+        stats["by_extension"] = {
+            ext: dict(zip(_EXT_FIELDS, row)) for ext, row in ext_tbl.items()
+        }
+
         return stats
 
-    def _analyze_file(self, file_path: str) -> Dict[str, int]:
+    def _read_text(self, file_path: str) -> Optional[str]:
+        """从共享索引读取文本，读取失败时返回 None（由 _analyze_file 自行读取）"""
+        try:
+            return self.index.read_text(file_path, errors="ignore")
+        except OSError:
+            return None
+
+    def _analyze_file(self, file_path: str, text: Optional[str] = None) -> Dict[str, int]:
         """
         分析单个文件的行数信息
 
         Args:
             file_path: 文件绝对路径
+            text: 已读取的文本（可选），为 None 时从文件读取
 
         Returns:
             包含total, code, comment, blank计数的字典
@@ -89,19 +122,15 @@ class LOCCounter:
         stats = {"total": 0, "code": 0, "comment": 0, "blank": 0}
 
         try:
-            with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-                lines = f.readlines()
-                stats["total"] = len(lines)
-
-                for line in lines:
-                    stripped = line.strip()
-                    if not stripped:
-                        stats["blank"] += 1
-                    elif stripped.startswith("#") or stripped.startswith("//"):
-                        # 简单的注释检测，对于多行注释可能不准确，但作为基础统计足够
-                        stats["comment"] += 1
-                    else:
-                        stats["code"] += 1
+            if text is None:
+                text = read_text_file(file_path, errors="ignore")
+            stripped = split_stripped_lines(text)
+
+            stats["total"] = len(stripped)
+            stats["blank"] = stripped.count("")
+            # 简单的注释检测，对于多行注释可能不准确，但作为基础统计足够
+            stats["comment"] = count_prefixed_lines(stripped, _COMMENT_PREFIXES)
+            stats["code"] = stats["total"] - stats["blank"] - stats["comment"]
         except Exception:
             pass
 
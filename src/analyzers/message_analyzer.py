@@ -5,9 +5,14 @@
 """
 import re
 from collections import Counter
+from functools import lru_cache
+from itertools import filterfalse
 from typing import List, Dict, Any
 import logging
 
+import numpy as np
+import pandas as pd
+
 logger = logging.getLogger(__name__)
 
 
@@ -23,6 +28,46 @@ COMMIT_TYPES = {
     "perf": ["perf", "performance", "optimize", "speed"],
 }
 
+# 批量分类使用的类型编码：COMMIT_TYPES 的顺序下标，末位为 "other"
+TYPE_NAMES = list(COMMIT_TYPES) + ["other"]
+OTHER_CODE = len(TYPE_NAMES) - 1
+
+# 前缀关键词 -> 类型编码（关键词出现在多个类型时取靠前的类型）
+_PREFIX_CODES: Dict[str, int] = {}
+for _code, _keywords in enumerate(COMMIT_TYPES.values()):
+    for _keyword in _keywords:
+        _PREFIX_CODES.setdefault(_keyword, _code)
+
+# 前缀关键词 -> 类型名，供 classify_commit 一次字典查找
+_PREFIX_TYPES = {keyword: TYPE_NAMES[code] for keyword, code in _PREFIX_CODES.items()}
+
+# (关键词, 类型) 按类型顺序展开为一维元组，单层循环即保持原有的类型优先级
+_KEYWORD_TYPES = tuple(
+    (keyword, commit_type)
+    for commit_type, keywords in COMMIT_TYPES.items()
+    for keyword in keywords
+)
+
+# 每个类型的关键词子串匹配模式
+_KEYWORD_PATTERNS = [
+    "|".join(re.escape(k) for k in keywords) for keywords in COMMIT_TYPES.values()
+]
+
+# 预编译的正则，热循环中直接调用编译对象的方法，不经过 re 模块的模式缓存
+_PREFIX_RE = re.compile(r'^(\w+)[:\(]')
+_WORD_RE = re.compile(r'\b[a-zA-Z]{3,}\b')
+_ISSUE_RE = re.compile(r'#(\d+)')
+_CONV_RE = re.compile(r'^(feat|fix|docs|chore|refactor|test|style)[:\(]', re.I)
+_IMP_RE = re.compile(r'^(Add|Fix|Update|Remove|Improve|Implement)\s')
+_PAST_RE = re.compile(r'^(Added|Fixed|Updated|Removed|Improved|Implemented)\s')
+_HASH_RE = re.compile(r'#\d+')
+
+# classify_commit 结果缓存的最大条目数（合并、依赖升级等模板化消息大量重复）
+CLASSIFY_CACHE_SIZE = 100_000
+
+# 词频统计时忽略的常见无意义词
+_STOPWORDS = frozenset({"the", "and", "for", "with", "from", "this", "that", "into"})
+
 
 def classify_commit(message: str) -> str:
     """
@@ -34,25 +79,78 @@ def classify_commit(message: str) -> str:
     Returns:
         提交类型
     """
-    msg_lower = message.lower()
-    
+    return _classify_lower(message.lower())
+
+
+@lru_cache(maxsize=CLASSIFY_CACHE_SIZE)
+def _classify_lower(msg_lower: str) -> str:
+    """按小写消息分类（纯函数，以小写形式作为缓存键，大小写不同的相同消息共享结果）"""
     # 检查是否有Conventional Commits前缀
-    prefix_match = re.match(r'^(\w+)[:\(]', msg_lower)
+    prefix_match = _PREFIX_RE.match(msg_lower)
     if prefix_match:
-        prefix = prefix_match.group(1)
-        for commit_type, keywords in COMMIT_TYPES.items():
-            if prefix in keywords:
-                return commit_type
+        commit_type = _PREFIX_TYPES.get(prefix_match.group(1))
+        if commit_type is not None:
+            return commit_type
     
-    # 关键词匹配
-    for commit_type, keywords in COMMIT_TYPES.items():
-        for keyword in keywords:
-            if keyword in msg_lower:
-                return commit_type
+    # 关键词匹配（子串匹配，C 层的 in 比逐类型的正则搜索更快）
+    for keyword, commit_type in _KEYWORD_TYPES:
+        if keyword in msg_lower:
+            return commit_type
     
     return "other"
 
 
+def classify_batch(messages: List[str]) -> np.ndarray:
+    """
+    批量分类提交消息，规则与 classify_commit 一致
+
+    消息以 Arrow 字符串数组（连续字节 + 偏移量）存储，前缀提取和关键词
+    匹配都由 pandas 向量化字符串运算完成，避免逐条消息的 Python 循环。
+
+    Args:
+        messages: 消息列表
+
+    Returns:
+        int8 类型编码数组，编码为 TYPE_NAMES 的下标
+    """
+    codes = np.full(len(messages), OTHER_CODE, dtype=np.int8)
+    if not len(messages):
+        return codes
+
+    try:
+        lower = pd.Series(messages, dtype="string[pyarrow]").str.lower()
+    except ImportError:
+        lower = pd.Series(messages, dtype="string").str.lower()
+
+    # Conventional Commits 前缀：先用向量化匹配筛选，再只对命中的消息提取前缀
+    resolved = np.zeros(len(messages), dtype=bool)
+    has_prefix = np.flatnonzero(
+        lower.str.match(r'\w+[:\(]').to_numpy(dtype=bool, na_value=False)
+    )
+    if len(has_prefix):
+        prefix_codes = (
+            lower.iloc[has_prefix]
+            .str.extract(r'^(\w+)[:\(]', expand=False)
+            .map(_PREFIX_CODES)
+            .to_numpy(dtype=float)
+        )
+        known = ~np.isnan(prefix_codes)
+        codes[has_prefix[known]] = prefix_codes[known]
+        resolved[has_prefix[known]] = True
+
+    # 关键词匹配，按类型顺序依次处理尚未分类的消息
+    for code, pattern in enumerate(_KEYWORD_PATTERNS):
+        pending = np.flatnonzero(~resolved)
+        if not len(pending):
+            break
+        hits = lower.iloc[pending].str.contains(pattern, regex=True)
+        matched = pending[hits.to_numpy(dtype=bool, na_value=False)]
+        codes[matched] = code
+        resolved[matched] = True
+
+    return codes
+
+
 def analyze_messages(messages: List[str]) -> Dict[str, Any]:
     """
     分析提交消息列表
@@ -63,30 +161,23 @@ def analyze_messages(messages: List[str]) -> Dict[str, Any]:
     Returns:
         分析结果
     """
-    type_counts = Counter()
-    word_counts = Counter()
-    length_sum = 0
-    
-    for msg in messages:
-        # 分类
-        commit_type = classify_commit(msg)
-        type_counts[commit_type] += 1
-        
-        # 长度统计
-        length_sum += len(msg)
-        
-        # 词频统计（简单分词）
-        words = re.findall(r'\b[a-zA-Z]{3,}\b', msg.lower())
-        word_counts.update(words)
+    # 分类
+    code_counts = np.bincount(classify_batch(messages), minlength=len(TYPE_NAMES))
+    type_counts = {
+        TYPE_NAMES[code]: int(count) for code, count in enumerate(code_counts) if count
+    }
     
-    # 移除常见无意义词
-    stopwords = {"the", "and", "for", "with", "from", "this", "that", "into"}
-    for sw in stopwords:
-        word_counts.pop(sw, None)
+    # 长度统计
+    length_sum = sum(map(len, messages))
+
+    # 词频统计（简单分词）：换行不是单词字符，拼接后一次 findall 与逐条匹配结果相同；
+    # 常见无意义词在计数前即被过滤，不进入 Counter
+    words = _WORD_RE.findall("\n".join(messages).lower())
+    word_counts = Counter(filterfalse(_STOPWORDS.__contains__, words))
     
     return {
         "total_commits": len(messages),
-        "type_distribution": dict(type_counts),
+        "type_distribution": type_counts,
         "average_length": length_sum / len(messages) if messages else 0,
         "top_words": word_counts.most_common(30),
         "type_percentages": {
@@ -116,13 +207,13 @@ def get_message_patterns(messages: List[str]) -> Dict[str, int]:
     }
     
     for msg in messages:
-        if re.match(r'^(feat|fix|docs|chore|refactor|test|style)[:\(]', msg, re.I):
+        if _CONV_RE.match(msg):
             patterns["conventional"] += 1
-        elif re.match(r'^(Add|Fix|Update|Remove|Improve|Implement)\s', msg):
+        elif _IMP_RE.match(msg):
             patterns["imperative"] += 1
-        elif re.match(r'^(Added|Fixed|Updated|Removed|Improved|Implemented)\s', msg):
+        elif _PAST_RE.match(msg):
             patterns["past_tense"] += 1
-        elif re.search(r'#\d+', msg):
+        elif _HASH_RE.search(msg):
             patterns["with_issue"] += 1
         elif msg.lower().startswith("merge"):
             patterns["merge"] += 1
@@ -132,6 +223,26 @@ def get_message_patterns(messages: List[str]) -> Dict[str, int]:
     return patterns
 
 
+def analyze_all(messages: List[str]) -> Dict[str, Any]:
+    """
+    一次调用同时得到消息分析和消息模式统计
+
+    消息只物化为列表一次，分类仍走 classify_batch 的向量化路径（逐条在
+    Python 循环里同时分类和匹配模式反而更慢），模式匹配单独一轮循环。
+
+    Args:
+        messages: 消息列表（或任意可迭代对象）
+
+    Returns:
+        {"messages": analyze_messages 的结果, "patterns": get_message_patterns 的结果}
+    """
+    messages = list(messages)
+    return {
+        "messages": analyze_messages(messages),
+        "patterns": get_message_patterns(messages),
+    }
+
+
 def extract_referenced_issues(messages: List[str]) -> List[int]:
     """
     提取消息中引用的Issue编号
@@ -142,8 +253,5 @@ def extract_referenced_issues(messages: List[str]) -> List[int]:
     Returns:
         Issue编号列表
     """
-    issues = []
-    for msg in messages:
-        matches = re.findall(r'#(\d+)', msg)
-        issues.extend([int(m) for m in matches])
-    return sorted(set(issues))
+    # 换行不会出现在 #数字 之中，拼接后一次 findall 与逐条匹配结果相同
+    return sorted({int(m) for m in _ISSUE_RE.findall("\n".join(messages))})
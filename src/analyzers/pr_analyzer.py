@@ -2,6 +2,10 @@
 from typing import List, Dict, Any
 from datetime import datetime, timedelta
 import statistics
+import sys
+
+# Python 3.11 起 fromisoformat 直接支持 GitHub 时间戳的 "Z" 后缀，无需先替换为 "+00:00"
+_FROMISOFORMAT_ACCEPTS_Z = sys.version_info >= (3, 11)
 
 
 class PRAnalyzer:
@@ -40,7 +44,7 @@ class PRAnalyzer:
             return {"average_hours": 0, "median_hours": 0}
 
         return {
-            "average_hours": statistics.mean(durations),
+            "average_hours": statistics.fmean(durations),
             "median_hours": statistics.median(durations),
             "max_hours": max(durations),
             "min_hours": min(durations),
@@ -54,19 +58,29 @@ class PRAnalyzer:
         Returns:
             关于PR大小的统计分布
         """
-        additions = [pr.get("additions", 0) for pr in self.pr_data]
-        deletions = [pr.get("deletions", 0) for pr in self.pr_data]
-        changes = [a + d for a, d in zip(additions, deletions)]
-
-        if not changes:
+        if not self.pr_data:
             return {}
 
+        # 单次遍历累加，不构建 additions/deletions/changes 中间列表
+        total_additions = total_deletions = large_prs = small_prs = 0
+        for pr in self.pr_data:
+            additions = pr.get("additions", 0)
+            deletions = pr.get("deletions", 0)
+            changes = additions + deletions
+            total_additions += additions
+            total_deletions += deletions
+            if changes > 500:  # 假设 >500 行为大PR
+                large_prs += 1
+            elif changes < 50:  # 假设 <50 行为小PR
+                small_prs += 1
+
+        n = len(self.pr_data)
         return {
-            "avg_additions": statistics.mean(additions),
-            "avg_deletions": statistics.mean(deletions),
-            "avg_changes": statistics.mean(changes),
-            "large_prs": len([c for c in changes if c > 500]),  # 假设 >500 行为大PR
-            "small_prs": len([c for c in changes if c < 50]),  # 假设 <50 行为小PR
+            "avg_additions": total_additions / n,
+            "avg_deletions": total_deletions / n,
+            "avg_changes": (total_additions + total_deletions) / n,
+            "large_prs": large_prs,
+            "small_prs": small_prs,
         }
 
     def analyze_review_engagement(self) -> Dict[str, Any]:
@@ -83,9 +97,9 @@ class PRAnalyzer:
             return {}
 
         return {
-            "avg_comments": statistics.mean(comments),
+            "avg_comments": statistics.fmean(comments),
             "max_comments": max(comments),
-            "avg_reviewers": statistics.mean(reviewers),
+            "avg_reviewers": statistics.fmean(reviewers),
             "unreviewed_prs": len([r for r in reviewers if r == 0]),
         }
 
@@ -94,6 +108,8 @@ class PRAnalyzer:
         if not date_str:
             return None
         try:
+            if _FROMISOFORMAT_ACCEPTS_Z:
+                return datetime.fromisoformat(date_str)
             return datetime.fromisoformat(date_str.replace("Z", "+00:00"))
         except ValueError:
             return None
@@ -1,10 +1,107 @@
 import os
 import logging
-from typing import Dict, Any, List
+from functools import partial
+from typing import BinaryIO, Dict, Any, Iterator, List, Optional, Tuple
+
+from src.utils.parallel import parallel_map
+from src.utils.repo_index import decode_text
+
+try:
+    import numpy as np
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    np = None
+    njit = None
 
 # 配置日志记录器
 logger = logging.getLogger(__name__)
 
+# 不小于该字节数的纯 ASCII 文件才交给 numba 内核，小文件上 str 方法已足够快
+NUMBA_MIN_BYTES = 16 * 1024
+
+# 流式统计时每次读取的字节数，峰值内存与该值（而非文件大小）成正比
+STREAM_CHUNK_SIZE = 1 << 20
+
+# 单个文件的统计开销很小，文件数少于该值时串行执行，避免进程池启动开销
+PARALLEL_MIN_FILES = 256
+
+# 目录路径中包含这些子串时整个目录被跳过
+SKIP_DIR_MARKERS = ("venv", "__pycache__")
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, nogil=True)
+    def _scan_lines_kernel(buf):
+        """
+        单次扫描 ASCII 字节统计 (总行数, 空行数, 注释行数)，
+        行的划分与 str.splitlines、空白判定与 str.strip 一致
+        """
+        total = 0
+        empty = 0
+        comment = 0
+        n = len(buf)
+        i = 0
+        while i < n:
+            # 行内空白：\t、\x1f、空格（其余 ASCII 空白 \n \r \v \f \x1c-\x1e 都是行分隔符）
+            first = i
+            while first < n and (buf[first] == 32 or buf[first] == 9 or buf[first] == 31):
+                first += 1
+            end = first
+            while end < n and not (9 < buf[end] < 14 or 27 < buf[end] < 31):
+                end += 1
+
+            total += 1
+            if first == end:
+                empty += 1
+            elif buf[first] == 35:
+                comment += 1
+
+            # \r\n 视为一个换行
+            if end + 1 < n and buf[end] == 13 and buf[end + 1] == 10:
+                end += 1
+            i = end + 1
+        return total, empty, comment
+
+
+def _file_stats(task: Tuple[str, Optional[int]]) -> Dict[str, Any]:
+    """进程池工作函数：统计单个文件（模块级函数以便 pickle），task 为 (路径, 文件大小或 None)"""
+    file_path, size = task
+    return CodeStats().analyze_file_stats(file_path, size)
+
+
+def _iter_files(root: str) -> Iterator[Tuple[str, Optional[int]]]:
+    """
+    基于 os.scandir 递归遍历目录，生成 (文件路径, 文件大小)
+
+    顺序与 os.walk 一致：先输出当前目录的文件，再按目录项顺序进入子目录；
+    名称包含 SKIP_DIR_MARKERS 的目录不会进入，隐藏文件（以 . 开头）被跳过。
+    文件大小取自 DirEntry.stat()，无法获取时为 None。
+    """
+    subdirs = []
+    try:
+        with os.scandir(root) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    # 与 os.walk 相同，不进入指向目录的符号链接
+                    if not entry.is_symlink() and not any(
+                        marker in entry.name for marker in SKIP_DIR_MARKERS
+                    ):
+                        subdirs.append(entry.path)
+                elif not entry.name.startswith("."):
+                    try:
+                        size = entry.stat().st_size
+                    except OSError:
+                        size = None
+                    yield entry.path, size
+    except OSError as e:
+        logger.debug(f"无法读取目录 {root}: {e}")
+        return
+
+    for subdir in subdirs:
+        yield from _iter_files(subdir)
+
 
 class CodeStats:
     """
@@ -26,40 +123,99 @@ class CodeStats:
         Returns:
             Dict: 包含总行数、空行数、注释行数（估算）的字典
         """
-        lines = content.splitlines()
-        total_lines = len(lines)
-        empty_lines = len([l for l in lines if not l.strip()])
-        # 简单的注释统计（以 # 开头）
-        comment_lines = len([l for l in lines if l.strip().startswith("#")])
+        return self._line_stats(*self._scan_text(content))
+
+    @staticmethod
+    def _scan_text(content: str) -> Tuple[int, int, int]:
+        """统计文本的 (总行数, 空行数, 注释行数)"""
+        # 每行只去一次行首空白并取首字符：空行首字符为 ""，注释行（以 # 开头）为 "#"，
+        # 两类计数都交给 C 层的 list.count
+        firsts = [line[:1] for line in map(str.lstrip, content.splitlines())]
+        return len(firsts), firsts.count(""), firsts.count("#")
 
-        code_lines = total_lines - empty_lines - comment_lines
+    def _scan_bytes(self, data: bytes) -> Tuple[int, int, int]:
+        """统计原始字节的 (总行数, 空行数, 注释行数)，按文本模式解码后的行划分"""
+        if NUMBA_AVAILABLE and len(data) >= NUMBA_MIN_BYTES and data.isascii():
+            total, empty, comment = _scan_lines_kernel(np.frombuffer(data, dtype=np.uint8))
+            return int(total), int(empty), int(comment)
+        return self._scan_text(decode_text(data, "ignore"))
 
+    @staticmethod
+    def _line_stats(total_lines: int, empty_lines: int, comment_lines: int) -> Dict[str, int]:
+        """由总行数、空行数、注释行数组装 count_lines 的返回结果"""
         return {
             "total": total_lines,
             "empty": empty_lines,
             "comment": comment_lines,
-            "code": code_lines,
+            "code": total_lines - empty_lines - comment_lines,
         }
 
-    def analyze_file_stats(self, file_path: str) -> Dict[str, Any]:
+    def count_bytes(self, data: bytes) -> Dict[str, int]:
+        """
+        统计文件原始字节的行数信息，结果与 count_lines(以文本模式读入的内容) 一致
+
+        较大的纯 ASCII 内容在 numba 可用时由编译内核单次扫描，不创建逐行字符串。
+
+        Args:
+            data: 文件字节内容
+
+        Returns:
+            Dict: 同 count_lines
+        """
+        return self._line_stats(*self._scan_bytes(data))
+
+    def count_file(self, f: BinaryIO, chunk_size: int = STREAM_CHUNK_SIZE) -> Dict[str, int]:
+        """
+        分块流式统计二进制文件对象的行数信息，结果与 count_bytes(f.read()) 一致
+
+        每块在最后一个 \\n 之后切开，剩余部分并入下一块，因此行、\\r\\n
+        和多字节 UTF-8 字符都不会被切断；峰值内存约为一块而非整个文件。
+
+        Args:
+            f: 以二进制模式打开的文件对象
+            chunk_size: 每次读取的字节数
+
+        Returns:
+            Dict: 同 count_lines
+        """
+        total = empty = comment = 0
+        tail = b""
+        for chunk in iter(partial(f.read, chunk_size), b""):
+            if tail:
+                chunk = tail + chunk
+            cut = chunk.rfind(b"\n") + 1
+            tail = chunk[cut:]
+            if cut:
+                t, e, c = self._scan_bytes(chunk[:cut] if tail else chunk)
+                total += t
+                empty += e
+                comment += c
+        if tail:
+            t, e, c = self._scan_bytes(tail)
+            total += t
+            empty += e
+            comment += c
+        return self._line_stats(total, empty, comment)
+
+    def analyze_file_stats(self, file_path: str, size: Optional[int] = None) -> Dict[str, Any]:
         """
         获取文件的基础统计信息。
 
         Args:
             file_path: 文件绝对路径
+            size: 已知的文件大小（如遍历目录时取得），None 时调用 os.stat 获取
 
         Returns:
             Dict: 文件统计信息
         """
         try:
-            stats = os.stat(file_path)
-            with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-                content = f.read()
-
-            line_stats = self.count_lines(content)
+            if size is None:
+                size = os.stat(file_path).st_size
+            with open(file_path, "rb") as f:
+                line_stats = self.count_file(f)
 
             return {
-                "size_bytes": stats.st_size,
+                "size_bytes": size,
                 "line_stats": line_stats,
                 "extension": os.path.splitext(file_path)[1],
             }
@@ -67,12 +223,18 @@ class CodeStats:
             logger.error(f"统计文件 {file_path} 失败: {e}")
             return {}
 
-    def analyze_directory(self, dir_path: str) -> Dict[str, Any]:
+    def analyze_directory(
+        self, dir_path: str, max_workers: Optional[int] = None
+    ) -> Dict[str, Any]:
         """
         统计整个目录的代码信息。
 
+        先通过 os.scandir 收集待统计的文件及其大小（跳过的目录不会进入），
+        文件较多时逐文件统计分发到进程池，汇总在主进程中完成。
+
         Args:
             dir_path: 目录路径
+            max_workers: 并行统计的最大进程数，None 使用 CPU 核数
 
         Returns:
             Dict: 汇总统计信息
@@ -87,25 +249,24 @@ class CodeStats:
             "max_file_size": 0,
         }
 
-        for root, _, files in os.walk(dir_path):
-            for file in files:
-                file_path = os.path.join(root, file)
-                # 跳过隐藏文件和特定目录
-                if file.startswith(".") or "venv" in root or "__pycache__" in root:
-                    continue
-
-                file_stats = self.analyze_file_stats(file_path)
-                if file_stats:
-                    summary["files"] += 1
-                    summary["total_lines"] += file_stats["line_stats"]["total"]
-                    summary["total_code"] += file_stats["line_stats"]["code"]
-                    summary["total_size"] += file_stats["size_bytes"]
-                    summary["max_file_size"] = max(
-                        summary["max_file_size"], file_stats["size_bytes"]
-                    )
-
-                    ext = file_stats["extension"]
-                    summary["languages"][ext] = summary["languages"].get(ext, 0) + 1
+        # 跳过隐藏文件和特定目录
+        if any(marker in dir_path for marker in SKIP_DIR_MARKERS):
+            tasks = []
+        else:
+            tasks = list(_iter_files(dir_path))
+
+        for file_stats in parallel_map(_file_stats, tasks, max_workers, PARALLEL_MIN_FILES):
+            if file_stats:
+                summary["files"] += 1
+                summary["total_lines"] += file_stats["line_stats"]["total"]
+                summary["total_code"] += file_stats["line_stats"]["code"]
+                summary["total_size"] += file_stats["size_bytes"]
+                summary["max_file_size"] = max(
+                    summary["max_file_size"], file_stats["size_bytes"]
+                )
+
+                ext = file_stats["extension"]
+                summary["languages"][ext] = summary["languages"].get(ext, 0) + 1
 
         if summary["files"] > 0:
             summary["avg_file_size"] = summary["total_size"] / summary["files"]
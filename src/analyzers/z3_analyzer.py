@@ -15,6 +15,10 @@ class Z3Analyzer:
     def __init__(self):
         """初始化 Z3 分析器"""
         self.solver = z3.Solver()
+        # 符号变量只创建一次，各次分析复用同一组 AST 节点
+        self._version_major = z3.Int("version_major")
+        self._a = z3.Int("a")
+        self._b = z3.Int("b")
 
     def check_version_constraints(self, requirements: Dict[str, str]) -> Dict[str, Any]:
         """
@@ -28,16 +32,16 @@ class Z3Analyzer:
         Returns:
             Dict: 求解结果
         """
-        # 重置求解器
-        self.solver.reset()
-
         # 仅作为示例演示 Z3 的用法
         # 假设我们有一个简单的约束：x > 10 AND x < 20
         # 实际应用中可以将其映射到版本号的整数表示
 
+        # 约束在独立的作用域中添加，分析结束后 pop 撤销，
+        # 不必每次 reset 重建求解器
+        self.solver.push()
         try:
             # 示例符号变量
-            x = z3.Int("version_major")
+            x = self._version_major
 
             # 添加约束
             # 模拟约束: version > 1 AND version < 5
@@ -55,6 +59,8 @@ class Z3Analyzer:
         except Exception as e:
             logger.error(f"Z3 分析错误: {e}")
             return {"error": str(e)}
+        finally:
+            self.solver.pop()
 
     def analyze_logic_path(self, expression_type: str) -> bool:
         """
@@ -66,17 +72,20 @@ class Z3Analyzer:
         Returns:
             bool: 路径是否可达
         """
-        self.solver.reset()
-        a = z3.Int("a")
-        b = z3.Int("b")
-
-        if expression_type == "simple_conflict":
-            # a > 0 AND a < 0 -> 矛盾
-            self.solver.add(a > 0)
-            self.solver.add(a < 0)
-        elif expression_type == "valid_path":
-            # a > 0 AND b > a
-            self.solver.add(a > 0)
-            self.solver.add(b > a)
-
-        return self.solver.check() == z3.sat
+        a = self._a
+        b = self._b
+
+        self.solver.push()
+        try:
+            if expression_type == "simple_conflict":
+                # a > 0 AND a < 0 -> 矛盾
+                self.solver.add(a > 0)
+                self.solver.add(a < 0)
+            elif expression_type == "valid_path":
+                # a > 0 AND b > a
+                self.solver.add(a > 0)
+                self.solver.add(b > a)
+
+            return self.solver.check() == z3.sat
+        finally:
+            self.solver.pop()
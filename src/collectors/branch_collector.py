@@ -42,11 +42,17 @@ class BranchCollector:
 
             repo = self.git.repo
 
+            # 当前分支只解析一次 HEAD；游离 HEAD 时没有当前分支
+            try:
+                active_branch = repo.active_branch
+            except TypeError:
+                active_branch = None
+
             for head in repo.heads:
                 last_commit = head.commit
                 branch_info = {
                     "name": head.name,
-                    "is_active": head == repo.active_branch,
+                    "is_active": head == active_branch,
                     "last_commit_hash": last_commit.hexsha,
                     "last_commit_date": last_commit.committed_datetime,
                     "last_commit_author": last_commit.author.name,
@@ -104,10 +110,17 @@ class BranchCollector:
         try:
             repo = self.git.repo
             if target_branch in repo.heads:
-                target = repo.heads[target_branch]
-                for head in repo.heads:
-                    if head != target and repo.is_ancestor(head.commit, target.commit):
-                        merged.append(head.name)
+                # 一次 git for-each-ref --merged 代替逐分支的 is_ancestor（每次都要单独遍历提交历史），
+                # 结果同样按分支名排序
+                output = repo.git.for_each_ref(
+                    f"--merged=refs/heads/{target_branch}",
+                    "--format=%(refname:lstrip=2)",
+                    "refs/heads/",
+                )
+                merged = [
+                    name for name in output.splitlines()
+                    if name and name != target_branch
+                ]
         except Exception as e:
             logger.error(f"检查合并分支失败: {str(e)}")
 
@@ -3,9 +3,10 @@
 负责统计和分析仓库贡献者数据，生成贡献者画像。
 """
 
-from typing import Dict, List, Any, Optional
-from collections import defaultdict
+from typing import Dict, List, Any, Optional, Set, Tuple
+from git import NULL_TREE
 from pydriller import Repository
+from pydriller.git import Git
 from datetime import datetime
 import logging
 
@@ -13,6 +14,108 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+def _count_modified_files(commit) -> int:
+    """
+    统计提交修改的文件数，结果与 len(commit.modified_files) 一致
+
+    modified_files 会为每个文件生成完整补丁并构造 ModifiedFile 对象；这里只需要
+    文件数，因此用不带补丁的 diff（同样检测重命名）计数。与 pydriller 相同，
+    合并提交计为 0，首个提交与空树比较。
+    """
+    c_object = commit._c_object
+    parents = c_object.parents
+    if len(parents) > 1:
+        return 0
+    diff_index = parents[0].diff(c_object) if parents else c_object.diff(NULL_TREE)
+    # 补丁模式下类型变更（如文件变为符号链接）拆成删除 + 新增两项
+    return sum(2 if diff.change_type == "T" else 1 for diff in diff_index)
+
+
+def _batch_commit_metrics(repo_path: str, rev: str) -> Dict[str, Tuple[int, int, int]]:
+    """
+    用两次 git log 批量取得 rev 可达的所有提交的 (新增行数, 删除行数, 修改文件数)
+
+    逐提交访问 commit.insertions/deletions 与 commit.modified_files 时，pydriller
+    每个提交都要各启动一次 git 进程。这里的口径与之一致：行数来自 --numstat
+    （合并提交与第一个父提交比较，二进制文件计 0），文件数来自 --raw -M
+    （合并提交计 0，类型变更计为 2 个文件）。
+
+    Args:
+        repo_path: 本地仓库路径
+        rev: 遍历的起点（分支名或 HEAD）
+
+    Returns:
+        提交哈希 -> (新增行数, 删除行数, 修改文件数)；git 调用失败时返回空字典
+    """
+    try:
+        git = Git(repo_path).repo.git
+        numstat = git.log(rev, "--format=%x00%H", "--numstat", "--diff-merges=first-parent")
+        raw = git.log(rev, "--format=%x00%H", "--raw", "-M", "--no-abbrev")
+    except Exception as e:
+        logger.debug(f"批量获取提交统计失败，改为逐提交获取: {e}")
+        return {}
+
+    lines: Dict[str, Tuple[int, int]] = {}
+    for block in numstat.split("\0")[1:]:
+        commit_hash, _, body = block.partition("\n")
+        insertions = deletions = 0
+        for line in body.splitlines():
+            if line:
+                added, deleted, _ = line.split("\t", 2)
+                insertions += int(added) if added != "-" else 0
+                deletions += int(deleted) if deleted != "-" else 0
+        lines[commit_hash] = (insertions, deletions)
+
+    metrics = {}
+    for block in raw.split("\0")[1:]:
+        commit_hash, _, body = block.partition("\n")
+        if commit_hash not in lines:
+            continue
+        # raw 行形如 ":100644 100644 <sha> <sha> M\tpath"，状态字母在第一个制表符之前
+        files = 0
+        for line in body.splitlines():
+            if line.startswith(":"):
+                files += 2 if line.split("\t", 1)[0].endswith(" T") else 1
+        metrics[commit_hash] = lines[commit_hash] + (files,)
+    return metrics
+
+
+class _ContributorStats:
+    """单个贡献者的累计统计（__slots__ 记录，逐提交更新时直接写属性而非字典键）"""
+
+    __slots__ = (
+        "name", "email", "commits", "lines_added", "lines_deleted",
+        "files_modified", "first_commit", "last_commit", "active_days",
+    )
+
+    def __init__(self, email: str, date: datetime):
+        self.name = ""
+        self.email = email
+        self.commits = 0
+        self.lines_added = 0
+        self.lines_deleted = 0
+        self.files_modified = 0
+        # 时间范围以首次出现的提交初始化，之后只需与已有边界比较
+        self.first_commit = date
+        self.last_commit = date
+        # 活跃日期以日序数（date.toordinal()）记录，不为每个提交创建 date 对象
+        self.active_days: Set[int] = set()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为可序列化的字典（活跃天数集合转为计数，日期转为 ISO 字符串）"""
+        return {
+            "name": self.name,
+            "email": self.email,
+            "commits": self.commits,
+            "lines_added": self.lines_added,
+            "lines_deleted": self.lines_deleted,
+            "files_modified": self.files_modified,
+            "first_commit": self.first_commit.isoformat(),
+            "last_commit": self.last_commit.isoformat(),
+            "active_days_count": len(self.active_days),
+        }
+
+
 class ContributorsCollector:
     """
     贡献者数据采集器类
@@ -26,19 +129,7 @@ class ContributorsCollector:
             repo_path: 仓库本地路径
         """
         self.repo_path = repo_path
-        self.contributors = defaultdict(
-            lambda: {
-                "name": "",
-                "email": "",
-                "commits": 0,
-                "lines_added": 0,
-                "lines_deleted": 0,
-                "files_modified": 0,
-                "first_commit": None,
-                "last_commit": None,
-                "active_days": set(),
-            }
-        )
+        self.contributors: Dict[str, _ContributorStats] = {}
 
     def collect(self, branch: Optional[str] = None) -> List[Dict[str, Any]]:
         """
@@ -57,49 +148,42 @@ class ContributorsCollector:
             if branch:
                 repo_kwargs["only_in_branch"] = branch
 
+            # 行数和文件数批量取得，遍历时不再为每个提交单独启动 git 进程
+            metrics = _batch_commit_metrics(self.repo_path, branch or "HEAD")
+
+            contributors = self.contributors
             for commit in Repository(**repo_kwargs).traverse_commits():
                 email = commit.author.email
-                name = commit.author.name
                 date = commit.author_date
 
                 # 使用邮箱作为唯一标识，如果需要合并同一人的多个邮箱，需在后续处理
+                stats = contributors.get(email)
+                if stats is None:
+                    stats = contributors[email] = _ContributorStats(email, date)
+
                 # 这里简单更新姓名以最新提交为准
-                self.contributors[email]["name"] = name
-                self.contributors[email]["email"] = email
-                self.contributors[email]["commits"] += 1
-                self.contributors[email]["lines_added"] += commit.insertions
-                self.contributors[email]["lines_deleted"] += commit.deletions
-                self.contributors[email]["files_modified"] += len(commit.modified_files)
-                self.contributors[email]["active_days"].add(date.date())
-
-                # 更新时间范围
-                if (
-                    not self.contributors[email]["first_commit"]
-                    or date < self.contributors[email]["first_commit"]
-                ):
-                    self.contributors[email]["first_commit"] = date
-
-                if (
-                    not self.contributors[email]["last_commit"]
-                    or date > self.contributors[email]["last_commit"]
-                ):
-                    self.contributors[email]["last_commit"] = date
+                stats.name = commit.author.name
+                stats.commits += 1
+                commit_metrics = metrics.get(commit.hash)
+                if commit_metrics is not None:
+                    insertions, deletions, files = commit_metrics
+                else:
+                    insertions, deletions = commit.insertions, commit.deletions
+                    files = _count_modified_files(commit)
+                stats.lines_added += insertions
+                stats.lines_deleted += deletions
+                stats.files_modified += files
+                stats.active_days.add(date.toordinal())
+
+                # 更新时间范围：提交大体按时间顺序遍历，先判断最常见的"晚于最后一次"；
+                # 但作者日期并不严格单调（rebase、cherry-pick 等），两个边界仍需比较
+                if date > stats.last_commit:
+                    stats.last_commit = date
+                elif date < stats.first_commit:
+                    stats.first_commit = date
 
             # 转换为列表并排序
-            result = []
-            for email, data in self.contributors.items():
-                # 计算活跃天数
-                data["active_days_count"] = len(data["active_days"])
-                # 移除集合对象以便序列化
-                del data["active_days"]
-
-                # 格式化日期
-                if data["first_commit"]:
-                    data["first_commit"] = data["first_commit"].isoformat()
-                if data["last_commit"]:
-                    data["last_commit"] = data["last_commit"].isoformat()
-
-                result.append(data)
+            result = [stats.to_dict() for stats in contributors.values()]
 
             # 按提交数排序
             result.sort(key=lambda x: x["commits"], reverse=True)
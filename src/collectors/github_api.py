@@ -4,14 +4,232 @@ GitHub API访问模块
 用于获取Issues、PRs和贡献者数据
 """
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
 import json
+import hashlib
 import logging
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator, List, Dict, Any, Optional, Tuple
 from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+from src.config import CACHE_ENABLED, CACHE_TTL
+from src.utils.persistence import load_json, loads_json, save_json
 
 logger = logging.getLogger(__name__)
 
+# 每页条目数（GitHub API 上限）
+PER_PAGE = 100
+
+# 分页预取的并发请求数，兼顾等待时间与速率限制
+PAGE_FETCH_WORKERS = 8
+
+# 速率限制（403）时等待重置后重试的最多次数
+RATE_LIMIT_RETRIES = 5
+
+# 条件请求缓存文件（ETag 与对应响应数据），跨运行复用
+ETAG_CACHE_FILE = "data/.etag_cache.json"
+
+
+def create_session(headers: Dict[str, str]) -> requests.Session:
+    """
+    创建带连接池和自动重试的 HTTP 会话
+
+    同一主机的 keep-alive 连接被复用（连接池容量覆盖分页预取的并发数），
+    网关类错误（502/503/504）和连接错误按指数退避自动重试。
+
+    Args:
+        headers: 每个请求都携带的请求头
+
+    Returns:
+        配置好的 requests.Session
+    """
+    session = requests.Session()
+    session.headers.update(headers)
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=max(16, PAGE_FETCH_WORKERS),
+        max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504]),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class EtagCache:
+    """
+    条件请求缓存：按 (URL, 查询参数) 保存响应的 ETag、数据和末页页码
+
+    获取或验证后未超过 ttl 秒的条目视为新鲜，直接使用而不发出请求；
+    过期条目在请求时携带 If-None-Match，服务端返回 304 时复用缓存数据
+    （304 不返回响应体，也不计入速率限制）。提供缓存文件时从文件加载，
+    并在 save() 时写回，使未变化的页面跨运行也无需重新下载。
+    """
+
+    def __init__(self, path: Optional[str] = ETAG_CACHE_FILE, ttl: float = 0):
+        """
+        初始化缓存
+
+        Args:
+            path: 缓存文件路径，None 表示只在内存中缓存
+            ttl: 条目的新鲜期（秒），0 表示每次都向服务端验证
+        """
+        self.path = path
+        self.ttl = ttl
+        self._entries: Dict[str, Dict[str, Any]] = (load_json(path) or {}) if path else {}
+        self._dirty = False
+
+    @staticmethod
+    def _key(url: str, params: Optional[Dict]) -> str:
+        """缓存键：URL 和排序后查询参数的哈希"""
+        raw = json.dumps([url, sorted((params or {}).items())], default=str)
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def get(self, url: str, params: Optional[Dict]) -> Optional[Dict[str, Any]]:
+        """
+        查询缓存
+
+        Args:
+            url: 请求 URL
+            params: 查询参数
+
+        Returns:
+            缓存条目 {"etag", "body", "fetched_at", "last_page"}，未缓存时返回 None
+        """
+        return self._entries.get(self._key(url, params))
+
+    def is_fresh(self, entry: Dict[str, Any]) -> bool:
+        """条目是否仍在新鲜期内（可不经验证直接使用）"""
+        return time.time() - entry.get("fetched_at", 0) < self.ttl
+
+    def put(
+        self,
+        url: str,
+        params: Optional[Dict],
+        etag: str,
+        body: Any,
+        last_page: Optional[int] = None,
+    ):
+        """
+        记录响应的 ETag 和数据（获取或验证时间记为当前时间）
+
+        Args:
+            url: 请求 URL
+            params: 查询参数
+            etag: 响应的 ETag 头
+            body: 解析后的响应数据
+            last_page: Link 头给出的末页页码
+        """
+        self._entries[self._key(url, params)] = {
+            "etag": etag,
+            "body": body,
+            "fetched_at": time.time(),
+            "last_page": last_page,
+        }
+        self._dirty = True
+
+    def save(self) -> bool:
+        """
+        将缓存写回文件（无变化或未指定文件时跳过）
+
+        Returns:
+            是否写入成功
+        """
+        if not self.path or not self._dirty:
+            return False
+        if save_json(dict(self._entries), self.path, indent=None):
+            self._dirty = False
+            return True
+        return False
+
+
+def rate_limit_wait(resp: requests.Response) -> int:
+    """
+    根据 X-RateLimit-Reset 响应头计算速率限制后的等待秒数
+
+    Args:
+        resp: 被速率限制（403）的响应
+
+    Returns:
+        等待秒数，限制在 60 到 300 秒之间
+    """
+    reset_time = int(resp.headers.get("X-RateLimit-Reset", 0))
+    return min(max(reset_time - int(time.time()), 60), 300)
+
+
+def last_page_number(resp: requests.Response) -> Optional[int]:
+    """
+    从 Link 响应头的 rel="last" 链接中解析末页页码
+
+    Args:
+        resp: 分页接口的响应
+
+    Returns:
+        末页页码，响应没有 rel="last" 链接（如已是末页）时返回 None
+    """
+    url = resp.links.get("last", {}).get("url")
+    if not url:
+        return None
+    page = parse_qs(urlsplit(url).query).get("page")
+    try:
+        return int(page[0]) if page else None
+    except ValueError:
+        return None
+
+
+def page_query_key(url: str, params: Optional[Dict]) -> Tuple[str, Tuple]:
+    """分页查询的标识：URL 加除页码外的查询参数，同一查询的各页共用"""
+    return url, tuple(sorted((k, v) for k, v in (params or {}).items() if k != "page"))
+
+
+def iter_pages(
+    fetch: Callable[[int], Optional[List]],
+    start_page: int = 1,
+    max_pages: int = 10,
+    per_page: int = PER_PAGE,
+    workers: int = PAGE_FETCH_WORKERS,
+    last_page: Optional[Callable[[], Optional[int]]] = None,
+) -> Iterator[Tuple[int, List]]:
+    """
+    按页码顺序生成分页数据，后续页面以窗口方式并发预取
+
+    第一页单独请求（只有一页的端点不会多发请求），之后每次并发请求
+    workers 个页面，再按页码顺序产出。遇到空页（或请求失败）即停止，
+    不足 per_page 条的页面产出后停止，与逐页顺序请求的结果一致。
+    提供 last_page 时，第一页返回后据此将预取范围收紧到真实末页，
+    不再发出超出末页的请求；否则最后一个窗口中超出末页的请求会被丢弃。
+
+    Args:
+        fetch: 请求指定页码并返回该页数据的函数，失败时返回 None
+        start_page: 起始页码
+        max_pages: 最大页码（含）
+        per_page: 每页条目数
+        workers: 并发请求数
+        last_page: 第一页请求后调用，返回 Link 头给出的末页页码（未知时返回 None）
+
+    Yields:
+        (页码, 该页数据)
+    """
+    page = start_page
+    window = 1
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while page <= max_pages:
+            pages = range(page, min(page + window, max_pages + 1))
+            for current, data in zip(pages, executor.map(fetch, pages)):
+                if not data:
+                    return
+                yield current, data
+                if len(data) < per_page:
+                    return
+            if window == 1 and last_page is not None:
+                known_last = last_page()
+                if known_last:
+                    max_pages = min(max_pages, known_last)
+            page = pages.stop
+            window = workers
+
 
 class GitHubAPI:
     """
@@ -21,13 +239,22 @@ class GitHubAPI:
     
     BASE_URL = "https://api.github.com"
     
-    def __init__(self, repo: str, token: Optional[str] = None):
+    def __init__(
+        self,
+        repo: str,
+        token: Optional[str] = None,
+        etag_cache_file: Optional[str] = ETAG_CACHE_FILE,
+        cache_ttl: Optional[float] = None,
+    ):
         """
         初始化GitHub API客户端
         
         Args:
             repo: 仓库名称，格式为 "owner/repo"
             token: GitHub Personal Access Token（可选，用于提高速率限制）
+            etag_cache_file: 条件请求缓存文件，None 表示只在内存中缓存
+            cache_ttl: 缓存响应免验证直接使用的秒数，None 时为 config.CACHE_TTL
+                （config.CACHE_ENABLED 关闭时为 0，每次都向服务端验证）
         """
         self.repo = repo
         self.token = token
@@ -37,6 +264,15 @@ class GitHubAPI:
         }
         if token:
             self.headers["Authorization"] = f"token {token}"
+
+        # 复用同一会话的连接池（keep-alive），分页请求不再逐页重新建立 TCP/TLS 连接
+        self.session = create_session(self.headers)
+        # 条件请求缓存（持久化到 ETAG_CACHE_FILE），新鲜期内不发请求，过期后 304 时复用上次的数据
+        if cache_ttl is None:
+            cache_ttl = CACHE_TTL if CACHE_ENABLED else 0
+        self._etag_cache = EtagCache(etag_cache_file, cache_ttl)
+        # 分页查询 -> Link 头给出的末页页码，用于收紧并发预取范围
+        self._last_pages: Dict[Tuple[str, Tuple], Optional[int]] = {}
     
     def _request(self, endpoint: str, params: Dict = None) -> Optional[Dict]:
         """
@@ -50,24 +286,72 @@ class GitHubAPI:
             JSON响应数据
         """
         url = f"{self.BASE_URL}{endpoint}"
+        query_key = page_query_key(url, params)
         
         try:
-            resp = requests.get(url, headers=self.headers, params=params, timeout=30)
-            
-            # 检查速率限制
-            if resp.status_code == 403:
-                reset_time = int(resp.headers.get("X-RateLimit-Reset", 0))
-                wait_time = max(reset_time - int(time.time()), 60)
+            cached = self._etag_cache.get(url, params)
+            if cached and self._etag_cache.is_fresh(cached):
+                self._last_pages[query_key] = cached.get("last_page")
+                return cached["body"]
+
+            conditional = {"If-None-Match": cached["etag"]} if cached else None
+            # 速率限制（403）时等待重置后重试，最多 RATE_LIMIT_RETRIES 次
+            for attempt in range(RATE_LIMIT_RETRIES + 1):
+                resp = self.session.get(url, params=params, headers=conditional, timeout=30)
+                last_page = last_page_number(resp)
+
+                # 内容未变化（304 不返回响应体，也不计入速率限制），刷新条目的新鲜期
+                if resp.status_code == 304 and cached:
+                    if "Link" not in resp.headers:
+                        last_page = cached.get("last_page")
+                    self._last_pages[query_key] = last_page
+                    self._etag_cache.put(url, params, cached["etag"], cached["body"], last_page)
+                    return cached["body"]
+
+                if resp.status_code != 403:
+                    self._last_pages[query_key] = last_page
+                    break
+                if attempt == RATE_LIMIT_RETRIES:
+                    logger.error(f"API速率限制，重试{RATE_LIMIT_RETRIES}次后放弃: {url}")
+                    return None
+                wait_time = rate_limit_wait(resp)
                 logger.warning(f"API速率限制，等待{wait_time}秒...")
-                time.sleep(min(wait_time, 300))
-                return self._request(endpoint, params)
+                time.sleep(wait_time)
             
             resp.raise_for_status()
-            return resp.json()
+            data = loads_json(resp.content)
+            etag = resp.headers.get("ETag")
+            if etag:
+                self._etag_cache.put(url, params, etag, data, last_page)
+            return data
             
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, ValueError) as e:
             logger.error(f"API请求失败: {e}")
             return None
+
+    def _paginate(
+        self, endpoint: str, params: Dict, start_page: int = 1, max_pages: int = 10
+    ) -> Iterator[Tuple[int, List]]:
+        """
+        按页码顺序生成分页数据，后续页面并发预取，预取范围以 Link 头给出的末页为界
+
+        Args:
+            endpoint: API端点
+            params: 除页码外的查询参数
+            start_page: 起始页码
+            max_pages: 最大页码（含）
+
+        Yields:
+            (页码, 该页数据)
+        """
+        key = page_query_key(f"{self.BASE_URL}{endpoint}", params)
+        fetch = lambda page: self._request(endpoint, params={**params, "page": page})
+        try:
+            yield from iter_pages(
+                fetch, start_page, max_pages, last_page=lambda: self._last_pages.get(key)
+            )
+        finally:
+            self._etag_cache.save()
     
     def get_issues(self, state: str = "all", max_pages: int = 10) -> List[Dict]:
         """
@@ -81,26 +365,14 @@ class GitHubAPI:
             Issues列表
         """
         all_issues = []
-        page = 1
+        query = {"state": state, "per_page": PER_PAGE}
         
-        while page <= max_pages:
+        for page, data in self._paginate(f"/repos/{self.repo}/issues", query, max_pages=max_pages):
             logger.info(f"获取Issues第{page}页...")
             
-            data = self._request(
-                f"/repos/{self.repo}/issues",
-                params={"state": state, "per_page": 100, "page": page}
-            )
-            
-            if not data:
-                break
-            
             # 过滤掉PRs（Issues API会包含PRs）
             issues = [i for i in data if "pull_request" not in i]
             all_issues.extend(issues)
-            
-            if len(data) < 100:
-                break
-            page += 1
         
         logger.info(f"共获取{len(all_issues)}个Issues")
         return all_issues
@@ -117,24 +389,11 @@ class GitHubAPI:
             PRs列表
         """
         all_prs = []
-        page = 1
+        query = {"state": state, "per_page": PER_PAGE}
         
-        while page <= max_pages:
+        for page, data in self._paginate(f"/repos/{self.repo}/pulls", query, max_pages=max_pages):
             logger.info(f"获取PRs第{page}页...")
-            
-            data = self._request(
-                f"/repos/{self.repo}/pulls",
-                params={"state": state, "per_page": 100, "page": page}
-            )
-            
-            if not data:
-                break
-            
             all_prs.extend(data)
-            
-            if len(data) < 100:
-                break
-            page += 1
         
         logger.info(f"共获取{len(all_prs)}个PRs")
         return all_prs
@@ -150,24 +409,11 @@ class GitHubAPI:
             贡献者列表
         """
         all_contributors = []
-        page = 1
+        query = {"per_page": PER_PAGE}
         
-        while page <= max_pages:
+        for page, data in self._paginate(f"/repos/{self.repo}/contributors", query, max_pages=max_pages):
             logger.info(f"获取贡献者第{page}页...")
-            
-            data = self._request(
-                f"/repos/{self.repo}/contributors",
-                params={"per_page": 100, "page": page}
-            )
-            
-            if not data:
-                break
-            
             all_contributors.extend(data)
-            
-            if len(data) < 100:
-                break
-            page += 1
         
         logger.info(f"共获取{len(all_contributors)}个贡献者")
         return all_contributors
@@ -179,7 +425,9 @@ class GitHubAPI:
         Returns:
             仓库信息字典
         """
-        return self._request(f"/repos/{self.repo}")
+        info = self._request(f"/repos/{self.repo}")
+        self._etag_cache.save()
+        return info
     
     def save_data(self, data: Any, filename: str, data_dir: str = "data"):
         """
@@ -191,9 +439,5 @@ class GitHubAPI:
             data_dir: 数据目录
         """
         path = Path(data_dir) / filename
-        path.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        
-        logger.info(f"数据已保存到: {path}")
+        if save_json(data, str(path)):
+            logger.info(f"数据已保存到: {path}")
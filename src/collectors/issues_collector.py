@@ -5,75 +5,59 @@ Issues数据采集模块
 支持断点续传
 """
 
-import requests
-import time
-import json
+import os
 import logging
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 
+from src.collectors.github_api import PER_PAGE, GitHubAPI
+from src.utils.persistence import append_jsonl, load_json, load_jsonl, save_json
+
 logger = logging.getLogger(__name__)
 
 PROGRESS_FILE = "data/.fetch_progress.json"
 
+# 断点续传的已采集数据（JSON Lines，每页追加一次）
+PARTIAL_FILE_TEMPLATE = "data/{name}_partial.ndjson"
+
 
 def load_progress() -> Dict:
     """加载采集进度"""
-    try:
-        if Path(PROGRESS_FILE).exists():
-            with open(PROGRESS_FILE, "r") as f:
-                return json.load(f)
-    except:
-        pass
-    return {}
+    return load_json(PROGRESS_FILE) or {}
 
 
 def save_progress(progress: Dict):
     """保存采集进度"""
-    Path(PROGRESS_FILE).parent.mkdir(parents=True, exist_ok=True)
-    with open(PROGRESS_FILE, "w") as f:
-        json.dump(progress, f)
+    save_json(progress, PROGRESS_FILE, indent=None)
+
+
+def _load_partial(path: Path, offset: Optional[int]) -> List[Dict]:
+    """
+    加载断点续传的已采集数据
+
+    只保留进度中记录的偏移量之前的内容：进度保存前中断时追加的页面
+    会被截掉，恢复后重新采集，不会重复。
+
+    Args:
+        path: JSON Lines 文件路径
+        offset: 进度中记录的字节偏移，None 表示使用整个文件
+
+    Returns:
+        已采集的记录列表
+    """
+    if offset is not None and path.stat().st_size > offset:
+        os.truncate(path, offset)
+    return load_jsonl(str(path)) or []
 
 
-class IssuesCollector:
+class IssuesCollector(GitHubAPI):
     """
     GitHub Issues采集器
     支持断点续传
+
+    会话、条件请求缓存、速率限制重试和并发分页均继承自 GitHubAPI。
     """
     
-    BASE_URL = "https://api.github.com"
-    
-    def __init__(self, repo: str, token: Optional[str] = None):
-        self.repo = repo
-        self.headers = {
-            "Accept": "application/vnd.github.v3+json",
-            "User-Agent": "Flask-Repo-Analyzer"
-        }
-        if token:
-            self.headers["Authorization"] = f"token {token}"
-    
-    def _request(self, endpoint: str, params: Dict = None) -> Optional[List]:
-        """发送API请求"""
-        url = f"{self.BASE_URL}{endpoint}"
-        
-        try:
-            resp = requests.get(url, headers=self.headers, params=params, timeout=30)
-            
-            if resp.status_code == 403:
-                reset_time = int(resp.headers.get("X-RateLimit-Reset", 0))
-                wait_time = max(reset_time - int(time.time()), 60)
-                wait_time = min(wait_time, 300)
-                logger.warning(f"API速率限制，等待{wait_time}秒...")
-                time.sleep(wait_time)
-                return self._request(endpoint, params)
-            
-            resp.raise_for_status()
-            return resp.json()
-            
-        except requests.exceptions.RequestException as e:
-            logger.error(f"API请求失败: {e}")
-            return None
-    
     def collect_issues(self, state: str = "all", max_pages: int = 50, resume: bool = True) -> List[Dict]:
         """
         采集Issues（支持断点续传）
@@ -82,49 +66,42 @@ class IssuesCollector:
         start_page = progress.get("issues_page", 1)
         all_issues = []
         
-        if resume and Path("data/issues_partial.json").exists():
-            try:
-                with open("data/issues_partial.json", "r", encoding="utf-8") as f:
-                    all_issues = json.load(f)
-                logger.info(f"从断点恢复，已有{len(all_issues)}个Issues，从第{start_page}页继续")
-            except:
-                pass
+        # 已采集的页面逐页追加到 JSON Lines 文件，进度中记录对应的字节偏移
+        partial = Path(PARTIAL_FILE_TEMPLATE.format(name="issues"))
+        if resume and start_page > 1 and partial.exists():
+            all_issues = _load_partial(partial, progress.get("issues_offset"))
+            logger.info(f"从断点恢复，已有{len(all_issues)}个Issues，从第{start_page}页继续")
+        elif partial.exists():
+            partial.unlink()
+        checkpoint = True
         
-        page = start_page
+        query = {
+            "state": state,
+            "per_page": PER_PAGE,
+            "sort": "created",
+            "direction": "desc",
+        }
         
-        while page <= max_pages:
+        # 后续页面并发预取，仍按页码顺序处理和记录进度
+        for page, data in self._paginate(f"/repos/{self.repo}/issues", query, start_page, max_pages):
             logger.info(f"采集Issues第{page}页...")
             
-            data = self._request(
-                f"/repos/{self.repo}/issues",
-                params={
-                    "state": state,
-                    "per_page": 100,
-                    "page": page,
-                    "sort": "created",
-                    "direction": "desc"
-                }
-            )
-            
-            if not data:
-                break
-            
             issues_only = [i for i in data if "pull_request" not in i]
             all_issues.extend(issues_only)
             
+            # 追加失败后不再推进进度，保证断点与文件内容一致
+            offset = append_jsonl(issues_only, str(partial)) if checkpoint else None
+            if offset is None:
+                checkpoint = False
+                continue
             progress["issues_page"] = page + 1
+            progress["issues_offset"] = offset
             save_progress(progress)
-            
-            if page % 10 == 0:
-                self.save_to_json(all_issues, "data/issues_partial.json")
-            
-            if len(data) < 100:
-                break
-            page += 1
         
-        if Path("data/issues_partial.json").exists():
-            Path("data/issues_partial.json").unlink()
+        if partial.exists():
+            partial.unlink()
         progress.pop("issues_page", None)
+        progress.pop("issues_offset", None)
         save_progress(progress)
         
         logger.info(f"共采集{len(all_issues)}个Issues")
@@ -138,46 +115,35 @@ class IssuesCollector:
         start_page = progress.get("prs_page", 1)
         all_prs = []
         
-        if resume and Path("data/prs_partial.json").exists():
-            try:
-                with open("data/prs_partial.json", "r", encoding="utf-8") as f:
-                    all_prs = json.load(f)
-                logger.info(f"从断点恢复，已有{len(all_prs)}个PRs，从第{start_page}页继续")
-            except:
-                pass
+        # 已采集的页面逐页追加到 JSON Lines 文件，进度中记录对应的字节偏移
+        partial = Path(PARTIAL_FILE_TEMPLATE.format(name="prs"))
+        if resume and start_page > 1 and partial.exists():
+            all_prs = _load_partial(partial, progress.get("prs_offset"))
+            logger.info(f"从断点恢复，已有{len(all_prs)}个PRs，从第{start_page}页继续")
+        elif partial.exists():
+            partial.unlink()
+        checkpoint = True
         
-        page = start_page
+        query = {"state": state, "per_page": PER_PAGE}
         
-        while page <= max_pages:
+        for page, data in self._paginate(f"/repos/{self.repo}/pulls", query, start_page, max_pages):
             logger.info(f"采集PRs第{page}页...")
             
-            data = self._request(
-                f"/repos/{self.repo}/pulls",
-                params={
-                    "state": state,
-                    "per_page": 100,
-                    "page": page
-                }
-            )
-            
-            if not data:
-                break
-            
             all_prs.extend(data)
             
+            # 追加失败后不再推进进度，保证断点与文件内容一致
+            offset = append_jsonl(data, str(partial)) if checkpoint else None
+            if offset is None:
+                checkpoint = False
+                continue
             progress["prs_page"] = page + 1
+            progress["prs_offset"] = offset
             save_progress(progress)
-            
-            if page % 10 == 0:
-                self.save_to_json(all_prs, "data/prs_partial.json")
-            
-            if len(data) < 100:
-                break
-            page += 1
         
-        if Path("data/prs_partial.json").exists():
-            Path("data/prs_partial.json").unlink()
+        if partial.exists():
+            partial.unlink()
         progress.pop("prs_page", None)
+        progress.pop("prs_offset", None)
         save_progress(progress)
         
         logger.info(f"共采集{len(all_prs)}个PRs")
@@ -186,37 +152,16 @@ class IssuesCollector:
     def collect_contributors(self, max_pages: int = 20) -> List[Dict]:
         """采集贡献者"""
         all_contributors = []
-        page = 1
+        query = {"per_page": PER_PAGE}
         
-        while page <= max_pages:
+        for page, data in self._paginate(f"/repos/{self.repo}/contributors", query, max_pages=max_pages):
             logger.info(f"采集贡献者第{page}页...")
-            
-            data = self._request(
-                f"/repos/{self.repo}/contributors",
-                params={
-                    "per_page": 100,
-                    "page": page
-                }
-            )
-            
-            if not data:
-                break
-            
             all_contributors.extend(data)
-            
-            if len(data) < 100:
-                break
-            page += 1
         
         logger.info(f"共采集{len(all_contributors)}个贡献者")
         return all_contributors
     
     def save_to_json(self, data: Any, filepath: str):
         """保存数据到JSON文件"""
-        path = Path(filepath)
-        path.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2, default=str)
-        
-        logger.info(f"已保存到: {filepath}")
+        if save_json(data, filepath):
+            logger.info(f"已保存到: {filepath}")
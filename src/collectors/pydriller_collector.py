@@ -3,7 +3,8 @@ PyDriller 采集器
 使用 PyDriller 库分析 Git 仓库历史
 """
 
-from typing import List, Dict, Any, Generator, Optional
+from typing import List, Dict, Any, Generator, Optional, Tuple
+from git import Repo as GitRepo
 from pydriller import Repository
 from datetime import datetime
 import os
@@ -11,31 +12,103 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# collect_commits 输出的提交字段（dmm_* 在 PyDriller 无法计算时缺失）
+COMMIT_FIELDS = (
+    "hash",
+    "msg",
+    "author_name",
+    "author_email",
+    "author_date",
+    "committer_name",
+    "committer_email",
+    "committer_date",
+    "lines",
+    "insertions",
+    "deletions",
+    "files",
+    "modified_files_list",
+    "dmm_unit_size",
+    "dmm_unit_complexity",
+    "dmm_unit_interfacing",
+)
+
+# 需要计算提交差异（modified_files）或复杂度分析的可选字段
+FILE_FIELDS = ("files", "modified_files_list")
+DMM_FIELDS = ("dmm_unit_size", "dmm_unit_complexity", "dmm_unit_interfacing")
+
 
 class PyDrillerCollector:
     """
     负责收集 Git 提交历史信息的采集器
     """
 
-    def __init__(self, repo_path: str, branch: Optional[str] = None):
+    def __init__(
+        self,
+        repo_path: str,
+        branch: Optional[str] = None,
+        include_files: bool = True,
+        include_modified_filenames: bool = True,
+        include_dmm: bool = True,
+    ):
         """
         初始化采集器
 
+        PyDriller 在首次访问 modified_files 时才计算提交差异，dmm_* 还要对
+        修改的文件做复杂度分析；关闭对应选项时不访问这些属性，输出中也
+        不包含相应字段。
+
         Args:
             repo_path: 仓库本地路径
             branch: 分支名称 (可选)
+            include_files: 是否输出修改文件数 files（关闭时同时不输出 modified_files_list）
+            include_modified_filenames: 是否输出修改文件名列表 modified_files_list
+            include_dmm: 是否输出 dmm_* 指标
         """
         self.repo_path = repo_path
         self.branch = branch
+        self.include_files = include_files
+        self.include_modified_filenames = include_files and include_modified_filenames
+        self.include_dmm = include_dmm
+        # (遍历起点的提交哈希, 是否含 dmm_*) -> 完整遍历结果，供重复的按作者查询复用
+        self._walk_cache: Dict[Tuple[str, bool], List[Dict[str, Any]]] = {}
 
-    def collect_commits(self) -> Generator[Dict[str, Any], None, None]:
+    def commit_fields(self, include_dmm: Optional[bool] = None) -> Tuple[str, ...]:
+        """
+        按当前选项返回 collect_commits 输出的字段
+
+        Args:
+            include_dmm: 是否包含 dmm_* 字段，None 使用构造时的设置
+
+        Returns:
+            字段名元组（顺序同 COMMIT_FIELDS）
+        """
+        if include_dmm is None:
+            include_dmm = self.include_dmm
+        excluded = set()
+        if not self.include_files:
+            excluded.add("files")
+        if not self.include_modified_filenames:
+            excluded.add("modified_files_list")
+        if not include_dmm:
+            excluded.update(DMM_FIELDS)
+        return tuple(field for field in COMMIT_FIELDS if field not in excluded)
+
+    def collect_commits(
+        self, include_dmm: Optional[bool] = None
+    ) -> Generator[Dict[str, Any], None, None]:
         """
         采集所有提交记录
 
+        Args:
+            include_dmm: 是否读取 dmm_* 指标（每个提交都要对修改的文件做复杂度分析，开销较大），
+                None 使用构造时的设置
+
         Yields:
             包含提交信息的字典
         """
         logger.info(f"开始分析仓库: {self.repo_path}")
+        if include_dmm is None:
+            include_dmm = self.include_dmm
 
         try:
             # 配置 Repository 对象，如果指定了分支则只分析该分支
@@ -57,37 +130,75 @@ class PyDrillerCollector:
                     "lines": commit.lines,
                     "insertions": commit.insertions,
                     "deletions": commit.deletions,
-                    "files": len(commit.modified_files),
-                    "modified_files_list": [f.filename for f in commit.modified_files],
                 }
+                if self.include_files:
+                    modified_files = commit.modified_files
+                    commit_data["files"] = len(modified_files)
+                    if self.include_modified_filenames:
+                        commit_data["modified_files_list"] = [f.filename for f in modified_files]
                 # 安全访问可能不存在的属性
-                try:
-                    commit_data["dmm_unit_size"] = commit.dmm_unit_size
-                    commit_data["dmm_unit_complexity"] = commit.dmm_unit_complexity
-                    commit_data["dmm_unit_interfacing"] = commit.dmm_unit_interfacing
-                except:
-                    pass
+                if include_dmm:
+                    try:
+                        commit_data["dmm_unit_size"] = commit.dmm_unit_size
+                        commit_data["dmm_unit_complexity"] = commit.dmm_unit_complexity
+                        commit_data["dmm_unit_interfacing"] = commit.dmm_unit_interfacing
+                    except:
+                        pass
                 yield commit_data
 
         except Exception as e:
             logger.error(f"采集提交历史时出错: {str(e)}")
             raise
 
-    def collect_commits_by_author(self, author_name: str) -> List[Dict[str, Any]]:
+    def collect_commit_columns(self) -> Dict[str, List[Any]]:
+        """
+        以列式结构采集所有提交记录
+
+        每个字段对应一个列表，可直接构建 DataFrame，无需保留逐行的字典。
+
+        Returns:
+            字段名到值列表的字典（字段见 commit_fields），缺失字段以 None 填充
+        """
+        columns: Dict[str, List[Any]] = {field: [] for field in self.commit_fields()}
+        for commit_data in self.collect_commits():
+            for field, values in columns.items():
+                values.append(commit_data.get(field))
+        return columns
+
+    def _head_sha(self) -> Optional[str]:
+        """解析遍历起点（指定分支或 HEAD）的提交哈希，无法解析时返回 None"""
+        try:
+            with GitRepo(self.repo_path) as repo:
+                return repo.commit(self.branch or "HEAD").hexsha
+        except Exception:
+            return None
+
+    def collect_commits_by_author(
+        self, author_name: str, include_dmm: bool = False
+    ) -> List[Dict[str, Any]]:
         """
         采集特定作者的所有提交
 
+        首次查询遍历一次完整历史并按遍历起点的提交哈希缓存，之后的查询
+        （包括其他作者）直接在缓存上过滤；分支有新提交时自动重新遍历。
+        返回的提交字典在多次查询间共享，调用方不应修改。
+
         Args:
             author_name: 作者名字（模糊匹配）
+            include_dmm: 是否包含 dmm_* 指标
 
         Returns:
             提交列表
         """
-        commits = []
-        for commit in self.collect_commits():
-            if author_name.lower() in commit["author_name"].lower():
-                commits.append(commit)
-        return commits
+        key = self._head_sha()
+        commits = self._walk_cache.get((key, include_dmm)) if key else None
+        if commits is None:
+            commits = list(self.collect_commits(include_dmm=include_dmm))
+            if key:
+                self._walk_cache[(key, include_dmm)] = commits
+
+        needle = author_name.lower()
+        return [commit for commit in commits if needle in commit["author_name"].lower()]
 
     def collect_file_history(self, file_path: str) -> List[Dict[str, Any]]:
         """
@@ -3,12 +3,30 @@
 分析仓库的 Tag 发布历史和版本时间线
 """
 
-from typing import List, Dict, Any
+from datetime import datetime, timedelta, timezone
+from operator import itemgetter
+from typing import List, Dict, Any, Optional
+from git import GitCommandError, TagReference
 from pydriller.git import Git
 import logging
 
 logger = logging.getLogger(__name__)
 
+# git for-each-ref 输出字段：标签自身的对象，以及附注标签解引用一层后指向的对象
+_TAG_FIELDS = (
+    "refname", "objecttype", "objectname", "committerdate:raw", "authorname", "contents",
+    "*objecttype", "*objectname", "*committerdate:raw", "*authorname", "*contents",
+)
+_TAG_FORMAT = "".join(f"%({field})%00" for field in _TAG_FIELDS)
+
+
+def _parse_raw_date(raw: str) -> datetime:
+    """解析 git 原始日期格式（"<unix 时间戳> <+hhmm>"），保留提交者时区"""
+    timestamp, offset = raw.split()
+    sign = -1 if offset[0] == "-" else 1
+    tz = timezone(sign * timedelta(hours=int(offset[1:3]), minutes=int(offset[3:5])))
+    return datetime.fromtimestamp(int(timestamp), tz)
+
 
 class TagCollector:
     """
@@ -25,6 +43,71 @@ class TagCollector:
         self.repo_path = repo_path
         self.git = Git(repo_path)
 
+    @staticmethod
+    def _tag_info(tag: TagReference) -> Dict[str, Any]:
+        """通过 GitPython 对象逐个读取单个标签的信息"""
+        # 获取标签对应的 commit 对象
+        # tag.commit 指向 tag object 或 commit object
+        commit = tag.commit
+
+        return {
+            "name": tag.name,
+            "commit_hash": commit.hexsha,
+            "date": commit.committed_datetime,
+            "author": commit.author.name,
+            "message": getattr(tag.object, "message", None)
+            or commit.message.strip(),
+            "path": tag.path,
+        }
+
+    def _batch_tag_info(self) -> Optional[List[Dict[str, Any]]]:
+        """
+        用一次 git for-each-ref 读取所有标签的信息，结果与 _tag_info 一致
+
+        轻量标签和指向提交的附注标签直接从输出构建；嵌套标签等其他情况
+        回退到 _tag_info。
+
+        Returns:
+            按标签路径排序的标签信息列表，git 命令失败时返回 None
+        """
+        repo = self.git.repo
+        try:
+            output = repo.git.for_each_ref(f"--format={_TAG_FORMAT}", "refs/tags/")
+        except GitCommandError as e:
+            logger.warning(f"批量读取标签失败，改为逐个读取: {e}")
+            return None
+
+        values = output.split("\0")
+        n = len(_TAG_FIELDS)
+        tags_data = []
+        for i in range(0, len(values) - n + 1, n):
+            (refname, obj_type, obj_name, date, author, contents,
+             deref_type, deref_name, deref_date, deref_author, deref_contents) = values[i:i + n]
+            # 每条记录后有一个换行，落在下一条记录的第一个字段开头
+            refname = refname.lstrip("\n")
+
+            if obj_type == "commit":
+                # 轻量标签：tag.object 就是提交本身，其 message 不做 strip
+                commit_hash, commit_date, commit_author = obj_name, date, author
+                message = contents
+            elif obj_type == "tag" and deref_type == "commit":
+                # 附注标签：与 GitPython 解析标签对象时一样按行拆分再拼接
+                commit_hash, commit_date, commit_author = deref_name, deref_date, deref_author
+                message = "\n".join(contents.splitlines()) or deref_contents.strip()
+            else:
+                tags_data.append(self._tag_info(TagReference(repo, refname)))
+                continue
+
+            tags_data.append({
+                "name": refname[len("refs/tags/"):],
+                "commit_hash": commit_hash,
+                "date": _parse_raw_date(commit_date),
+                "author": commit_author,
+                "message": message,
+                "path": refname,
+            })
+        return tags_data
+
     def collect_tags(self) -> List[Dict[str, Any]]:
         """
         采集所有标签信息，按时间排序
@@ -36,34 +119,20 @@ class TagCollector:
         tags_data = []
 
         try:
-            repo = self.git.repo
-
-            # 遍历所有标签
-            for tag in repo.tags:
-                # 获取标签对应的 commit 对象
-                # tag.commit 指向 tag object 或 commit object
-                commit = tag.commit
-
-                tag_info = {
-                    "name": tag.name,
-                    "commit_hash": commit.hexsha,
-                    "date": commit.committed_datetime,
-                    "author": commit.author.name,
-                    "message": getattr(tag.object, "message", None)
-                    or commit.message.strip(),
-                    "path": tag.path,
-                }
-                tags_data.append(tag_info)
+            # 一次 git 调用读取所有标签，失败时遍历标签对象逐个读取
+            batch = self._batch_tag_info()
+            if batch is not None:
+                tags_data = batch
+            else:
+                for tag in self.git.repo.tags:
+                    tags_data.append(self._tag_info(tag))
 
             # 按日期排序
-            tags_data.sort(key=lambda x: x["date"])
+            tags_data.sort(key=itemgetter("date"))
 
             # 计算版本间隔天数
-            for i in range(1, len(tags_data)):
-                prev = tags_data[i - 1]["date"]
-                curr = tags_data[i]["date"]
-                days_diff = (curr - prev).days
-                tags_data[i]["days_since_last_release"] = days_diff
+            for prev, curr in zip(tags_data, tags_data[1:]):
+                curr["days_since_last_release"] = (curr["date"] - prev["date"]).days
 
             logger.info(f"采集到 {len(tags_data)} 个标签")
 
@@ -4,8 +4,8 @@
 包含路径配置、暖色系配色方案、图表参数等
 """
 
+from functools import lru_cache
 from pathlib import Path
-from matplotlib.colors import LinearSegmentedColormap
 
 # =============================================================================
 # 路径配置
@@ -60,8 +60,25 @@ WARM_CMAP_COLORS = [
     "#D2691E",  # 巧克力色
 ]
 
-# 创建自定义colormap
-WARM_CMAP = LinearSegmentedColormap.from_list("warm", WARM_CMAP_COLORS)
+
+@lru_cache(maxsize=None)
+def get_warm_cmap():
+    """
+    创建暖色系 colormap（首次调用时才导入 matplotlib，只采集数据的流程无需加载绘图库）
+
+    Returns:
+        matplotlib LinearSegmentedColormap
+    """
+    from matplotlib.colors import LinearSegmentedColormap
+
+    return LinearSegmentedColormap.from_list("warm", WARM_CMAP_COLORS)
+
+
+def __getattr__(name):
+    # 兼容旧的模块属性 WARM_CMAP，访问时再创建
+    if name == "WARM_CMAP":
+        return get_warm_cmap()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # =============================================================================
 # 图表参数
@@ -84,6 +101,8 @@ CHART_STYLE = {
     "ytick.color": WARM_COLORS["dark"],
     "grid.color": WARM_COLORS["tertiary"],
     "grid.alpha": 0.5,
+    # 合并像素内近似共线的路径顶点，减少折线/面积图的绘制和编码开销
+    "path.simplify_threshold": 1.0,
 }
 
 # =============================================================================
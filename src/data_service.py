@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""
+数据服务模块
+进程内共享的提交数据入口：main.py 与 generate_charts.py 在同一进程中
+先后运行时，提交 DataFrame 只从磁盘加载和构建一次
+"""
+
+import logging
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Union
+
+import pandas as pd
+
+from src.config import DATA_DIR
+from src.utils.commit_data import load_cached_df
+
+logger = logging.getLogger(__name__)
+
+# 默认的提交数据缓存文件
+COMMITS_JSON = DATA_DIR / "commits.json"
+COMMITS_PARQUET = DATA_DIR / "commits.parquet"
+
+
+@lru_cache(maxsize=1)
+def _load_commits_df(json_path: Path, parquet_path: Path) -> Optional[pd.DataFrame]:
+    """按（已解析为绝对路径的）缓存文件加载提交 DataFrame，结果在进程内缓存"""
+    return load_cached_df(json_path, parquet_path)
+
+
+def get_commits_df(
+    json_path: Union[str, Path] = COMMITS_JSON,
+    parquet_path: Union[str, Path] = COMMITS_PARQUET,
+) -> Optional[pd.DataFrame]:
+    """
+    获取提交 DataFrame，同一进程内对相同文件的重复调用直接返回首次加载的结果
+
+    返回的是共享对象，调用方不应原地修改。
+
+    Args:
+        json_path: commits.json 路径
+        parquet_path: Parquet 缓存路径
+
+    Returns:
+        提交 DataFrame，缓存文件都不可用时返回 None
+    """
+    df = _load_commits_df(Path(json_path).resolve(), Path(parquet_path).resolve())
+    if df is None:
+        # 不缓存"数据不存在"的结果，文件生成后可以重新加载
+        _load_commits_df.cache_clear()
+    return df
+
+
+def clear_commits_cache() -> None:
+    """清除进程内缓存（提交数据文件被重新生成后调用）"""
+    _load_commits_df.cache_clear()
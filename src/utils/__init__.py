@@ -1,15 +1,46 @@
 # -*- coding: utf-8 -*-
 """
 工具模块包
-提供字体配置、辅助函数、日期处理、缓存管理和数据持久化功能
+提供字体配置、辅助函数、日期处理、缓存管理、数据持久化、提交数据加载和并行执行功能
+
+各工具按需导入（PEP 562），只使用数据加载时不会连带加载 matplotlib。
 """
 
-from .font_config import configure_chinese_font, get_chinese_font
-from .helpers import truncate_label, safe_divide, format_number, ensure_dir
-from .date_utils import parse_date, get_year_month, get_weekday_name, format_date
-from .cache_manager import CacheManager
-from .persistence import save_json, load_json, save_csv, load_csv, backup_file
-from .exporter import export_to_json, export_to_csv, export_to_markdown
+import importlib
+
+# 导出名称 -> 所在子模块
+_LAZY_IMPORTS = {
+    "configure_chinese_font": ".font_config",
+    "get_chinese_font": ".font_config",
+    "truncate_label": ".helpers",
+    "safe_divide": ".helpers",
+    "format_number": ".helpers",
+    "ensure_dir": ".helpers",
+    "parse_date": ".date_utils",
+    "parse_dates": ".date_utils",
+    "date_parts": ".date_utils",
+    "get_year_month": ".date_utils",
+    "get_weekday_name": ".date_utils",
+    "format_date": ".date_utils",
+    "CacheManager": ".cache_manager",
+    "save_json": ".persistence",
+    "load_json": ".persistence",
+    "save_csv": ".persistence",
+    "load_csv": ".persistence",
+    "backup_file": ".persistence",
+    "export_to_json": ".exporter",
+    "export_to_csv": ".exporter",
+    "export_to_markdown": ".exporter",
+    "build_commit_df": ".commit_data",
+    "save_commit_df": ".commit_data",
+    "load_cached_df": ".commit_data",
+    "parse_commit_dates": ".commit_data",
+    "commit_aggregates": ".commit_data",
+    "top_k_with_other": ".commit_data",
+    "parallel_map": ".parallel",
+    "RepoIndex": ".repo_index",
+    "AstCache": ".ast_cache",
+}
 
 __all__ = [
     "configure_chinese_font",
@@ -19,6 +50,8 @@ __all__ = [
     "format_number",
     "ensure_dir",
     "parse_date",
+    "parse_dates",
+    "date_parts",
     "get_year_month",
     "get_weekday_name",
     "format_date",
@@ -31,5 +64,27 @@ __all__ = [
     "export_to_json",
     "export_to_csv",
     "export_to_markdown",
+    "build_commit_df",
+    "save_commit_df",
+    "load_cached_df",
+    "parse_commit_dates",
+    "commit_aggregates",
+    "top_k_with_other",
+    "parallel_map",
+    "RepoIndex",
+    "AstCache",
 ]
 
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""
+语法树缓存
+同一文件只解析一次，解析结果供复杂度、依赖等多个分析器共享
+"""
+
+import os
+import ast
+import logging
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Union
+
+from src.utils.repo_index import RepoIndex, read_text_file
+
+logger = logging.getLogger(__name__)
+
+
+class AstCache:
+    """
+    按 (路径, 修改时间) 缓存 ast.parse 结果
+
+    返回的语法树在各分析器间共享，调用方不应修改。解析失败（语法错误、
+    解码错误等）时异常原样抛出，不缓存。
+    """
+
+    def __init__(self, index: Optional[RepoIndex] = None, maxsize: int = 1024):
+        """
+        初始化语法树缓存
+
+        Args:
+            index: 共享的仓库文件索引（可选），提供时从索引读取源码
+            maxsize: 最多缓存的语法树数量
+        """
+        self.index = index
+        self._parse = lru_cache(maxsize=maxsize)(self._parse_file)
+
+    def _parse_file(self, path: str, mtime_ns: int) -> ast.Module:
+        """读取并解析文件（mtime_ns 仅作为缓存键，文件修改后自动失效）"""
+        source = self.index.read_text(path) if self.index else read_text_file(path)
+        return ast.parse(source)
+
+    def tree(self, path: Union[str, Path]) -> ast.Module:
+        """
+        获取文件的语法树
+
+        Args:
+            path: 文件路径
+
+        Returns:
+            模块语法树
+        """
+        path = str(path)
+        return self._parse(path, os.stat(path).st_mtime_ns)
+
+    def cache_info(self):
+        """缓存命中统计，同 functools.lru_cache 的 cache_info()"""
+        return self._parse.cache_info()
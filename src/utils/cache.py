@@ -4,12 +4,27 @@
 提供内存缓存和文件缓存功能，支持过期时间控制
 """
 
+import os
 import hashlib
 import pickle
+import time
 from pathlib import Path
-from datetime import datetime, timedelta
-from typing import Any, Optional, Union, Callable, Dict
-from functools import wraps
+from datetime import datetime
+from typing import Any, Optional, Union, Callable, Dict, List
+from functools import lru_cache, wraps
+
+
+def _key_hash(key: str) -> str:
+    """缓存键对应的文件名（BLAKE2b-128，比 MD5 更快，长度相同）"""
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+
+
+# get() 未命中时的哨兵，用于区分"不存在"和缓存的 None
+_MISSING = object()
+
+# cached() 可按参数记住缓存键的类型：不可变，且相等的值 str() 也相同
+# （float 不在其中：0.0 与 -0.0 相等但字符串不同）
+_MEMO_KEY_TYPES = frozenset({str, int, bool, type(None)})
 
 
 class CacheManager:
@@ -29,7 +44,8 @@ class CacheManager:
             default_ttl: 默认过期时间（秒），默认1小时
         """
         self._memory_cache: Dict[str, Any] = {}
-        self._cache_times: Dict[str, datetime] = {}
+        # 写入时间（Unix 时间戳），过期判断只需一次浮点比较
+        self._cache_times: Dict[str, float] = {}
         self._default_ttl = default_ttl
 
         self._cache_dir: Optional[Path] = None
@@ -48,13 +64,28 @@ class CacheManager:
         if effective_ttl <= 0:
             return False
 
-        return datetime.now() > cache_time + timedelta(seconds=effective_ttl)
+        return time.time() > cache_time + effective_ttl
 
     def _get_file_path(self, key: str) -> Path:
         """获取缓存文件路径（调用前需确保_cache_dir不为None）"""
         assert self._cache_dir is not None
-        key_hash = hashlib.md5(key.encode()).hexdigest()
-        return self._cache_dir / f"{key_hash}.cache"
+        return self._cache_dir / f"{_key_hash(key)}.cache"
+
+    def _migrate_legacy_file(self, key: str, file_path: Path) -> None:
+        """将旧版本以 MD5 命名的缓存文件改名为当前文件名（仅在当前文件不存在时调用）"""
+        assert self._cache_dir is not None
+        legacy_path = self._cache_dir / f"{hashlib.md5(key.encode()).hexdigest()}.cache"
+        if legacy_path.exists():
+            try:
+                legacy_path.replace(file_path)
+            except OSError:
+                pass
+
+    def _cache_file_paths(self) -> List[str]:
+        """列出缓存目录中的 .cache 文件（os.scandir，不逐个构造 Path 和做通配匹配）"""
+        assert self._cache_dir is not None
+        with os.scandir(self._cache_dir) as entries:
+            return [entry.path for entry in entries if entry.name.endswith(".cache")]
 
     def get(self, key: str, default: Any = None, ttl: Optional[int] = None) -> Any:
         """
@@ -77,6 +108,8 @@ class CacheManager:
 
         if self._cache_dir is not None:
             file_path = self._get_file_path(key)
+            if not file_path.exists():
+                self._migrate_legacy_file(key, file_path)
             if file_path.exists():
                 try:
                     with open(file_path, "rb") as f:
@@ -86,6 +119,9 @@ class CacheManager:
                     value = data.get("value")
 
                     if cache_time is not None:
+                        # 旧版本缓存文件以 datetime 记录写入时间
+                        if isinstance(cache_time, datetime):
+                            cache_time = cache_time.timestamp()
                         self._cache_times[key] = cache_time
                         if not self._is_expired(key, ttl):
                             self._memory_cache[key] = value
@@ -110,7 +146,7 @@ class CacheManager:
             ttl: 过期时间（秒），None使用默认值
             persist: 是否持久化到文件
         """
-        now = datetime.now()
+        now = time.time()
         self._memory_cache[key] = value
         self._cache_times[key] = now
 
@@ -125,6 +161,7 @@ class CacheManager:
                             "ttl": ttl if ttl is not None else self._default_ttl,
                         },
                         f,
+                        protocol=pickle.HIGHEST_PROTOCOL,
                     )
             except Exception:
                 pass
@@ -148,6 +185,8 @@ class CacheManager:
 
         if self._cache_dir is not None:
             file_path = self._get_file_path(key)
+            if not file_path.exists():
+                self._migrate_legacy_file(key, file_path)
             if file_path.exists():
                 file_path.unlink()
                 deleted = True
@@ -160,9 +199,9 @@ class CacheManager:
         self._cache_times.clear()
 
         if self._cache_dir is not None:
-            for file_path in self._cache_dir.glob("*.cache"):
+            for file_path in self._cache_file_paths():
                 try:
-                    file_path.unlink()
+                    os.unlink(file_path)
                 except Exception:
                     pass
 
@@ -175,9 +214,11 @@ class CacheManager:
             ttl: 过期时间
 
         Returns:
-            是否存在
+            是否存在（缓存的值为 None 时也视为存在）
         """
-        return self.get(key, default=None, ttl=ttl) is not None
+        # 仅在文件中的键需要读取文件中的写入时间才能判断是否过期，
+        # 读取后同时载入内存，随后的 get 直接命中
+        return self.get(key, default=_MISSING, ttl=ttl) is not _MISSING
 
     def get_or_set(
         self, key: str, factory: Callable[[], Any], ttl: Optional[int] = None
@@ -193,8 +234,8 @@ class CacheManager:
         Returns:
             缓存值
         """
-        value = self.get(key, default=None, ttl=ttl)
-        if value is None:
+        value = self.get(key, default=_MISSING, ttl=ttl)
+        if value is _MISSING:
             value = factory()
             self.set(key, value, ttl=ttl)
         return value
@@ -208,7 +249,7 @@ class CacheManager:
         """
         file_count = 0
         if self._cache_dir is not None:
-            file_count = len(list(self._cache_dir.glob("*.cache")))
+            file_count = len(self._cache_file_paths())
 
         return {
             "memory_items": len(self._memory_cache),
@@ -234,12 +275,24 @@ def cached(
     """
 
     def decorator(func: Callable) -> Callable:
-        @wraps(func)
-        def wrapper(*args: Any, **kwargs: Any) -> Any:
+        def build_key(*args: Any, **kwargs: Any) -> str:
             key_parts = [key_prefix, func.__name__]
             key_parts.extend(str(arg) for arg in args)
             key_parts.extend(f"{k}={v}" for k, v in sorted(kwargs.items()))
-            cache_key = ":".join(key_parts)
+            return ":".join(key_parts)
+
+        # 键字符串需跨进程稳定（文件缓存按它命名），因此不改用 hash()；
+        # 参数均为不可变的基本类型时记住已拼接过的键，重复调用只需一次字典查找
+        memo_key = lru_cache(maxsize=1024, typed=True)(build_key)
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if all(type(v) in _MEMO_KEY_TYPES for v in args) and all(
+                type(v) in _MEMO_KEY_TYPES for v in kwargs.values()
+            ):
+                cache_key = memo_key(*args, **kwargs)
+            else:
+                cache_key = build_key(*args, **kwargs)
 
             result = cache_manager.get(cache_key, ttl=ttl)
             if result is not None:
@@ -3,18 +3,26 @@
 缓存管理模块
 提供基于文件系统的缓存功能，用于加速重复分析
 """
-import json
 import os
 import time
 from pathlib import Path
 from typing import Any, Optional
 import hashlib
 
+from src.utils.persistence import dumps_json, loads_json, save_json
+
+
+# 元数据变更日志超过该行数时合并回 _meta.json
+META_COMPACT_LINES = 1000
+
 
 class CacheManager:
     """
     文件缓存管理器
     支持TTL过期、键值存储
+
+    元数据由快照 _meta.json 和追加写入的变更日志 _meta.log 组成：每次
+    set/delete 只向日志追加一行，日志较长时再合并为新的快照。
     """
     
     def __init__(self, cache_dir: str = "cache"):
@@ -27,28 +35,77 @@ class CacheManager:
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         self.meta_file = self.cache_dir / "_meta.json"
+        self.meta_log = self.cache_dir / "_meta.log"
         self._load_meta()
     
     def _load_meta(self):
-        """加载缓存元数据"""
+        """加载缓存元数据（快照 + 重放变更日志）"""
         if self.meta_file.exists():
             try:
-                with open(self.meta_file, "r", encoding="utf-8") as f:
-                    self.meta = json.load(f)
+                self.meta = loads_json(self.meta_file.read_bytes())
             except:
                 self.meta = {}
         else:
             self.meta = {}
+
+        self._log_lines = 0
+        if self.meta_log.exists():
+            data = self.meta_log.read_bytes()
+            if data and not data.endswith(b"\n"):
+                # 截掉写入中断留下的不完整末行，避免后续追加的记录与之连成一行
+                data = data[:data.rfind(b"\n") + 1]
+                with open(self.meta_log, "r+b") as f:
+                    f.truncate(len(data))
+            for line in data.splitlines():
+                self._log_lines += 1
+                try:
+                    entry = loads_json(line)
+                    if entry.get("op") == "set":
+                        self.meta[entry["key"]] = entry["meta"]
+                    else:
+                        self.meta.pop(entry["key"], None)
+                except (ValueError, KeyError, TypeError, AttributeError):
+                    # 格式不正确的行直接跳过
+                    continue
     
-    def _save_meta(self):
-        """保存缓存元数据"""
-        with open(self.meta_file, "w", encoding="utf-8") as f:
-            json.dump(self.meta, f, indent=2)
+    def _save_meta(self, op: str, key: str):
+        """
+        向变更日志追加一条记录，日志超过 META_COMPACT_LINES 行时合并
+
+        Args:
+            op: "set" 或 "delete"
+            key: 被修改的缓存键
+        """
+        entry = {"op": op, "key": key}
+        if op == "set":
+            entry["meta"] = self.meta[key]
+        with open(self.meta_log, "ab") as f:
+            f.write(dumps_json(entry, indent=None) + b"\n")
+        self._log_lines += 1
+        if self._log_lines > META_COMPACT_LINES:
+            self.flush()
+
+    def flush(self):
+        """将当前元数据写成新的快照并清空变更日志"""
+        save_json(self.meta, str(self.meta_file))
+        self.meta_log.unlink(missing_ok=True)
+        self._log_lines = 0
     
     def _get_cache_path(self, key: str) -> Path:
-        """获取缓存文件路径"""
-        key_hash = hashlib.md5(key.encode()).hexdigest()
+        """获取缓存文件路径（文件名为键的 BLAKE2b-128 哈希）"""
+        key_hash = hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
         return self.cache_dir / f"{key_hash}.json"
+
+    def _migrate_legacy_file(self, key: str, cache_path: Path):
+        """旧版本以 MD5 命名的缓存文件（元数据中记录了路径）改名为当前文件名"""
+        legacy_path = Path(self.meta[key].get("path") or cache_path)
+        if legacy_path != cache_path and legacy_path.exists():
+            try:
+                legacy_path.replace(cache_path)
+            except OSError:
+                return
+            self.meta[key]["path"] = str(cache_path)
+            self._save_meta("set", key)
     
     def get(self, key: str) -> Optional[Any]:
         """
@@ -69,12 +126,13 @@ class CacheManager:
             return None
         
         cache_path = self._get_cache_path(key)
+        if not cache_path.exists():
+            self._migrate_legacy_file(key, cache_path)
         if not cache_path.exists():
             return None
         
         try:
-            with open(cache_path, "r", encoding="utf-8") as f:
-                return json.load(f)
+            return loads_json(cache_path.read_bytes())
         except:
             return None
     
@@ -89,30 +147,42 @@ class CacheManager:
         """
         cache_path = self._get_cache_path(key)
         
-        with open(cache_path, "w", encoding="utf-8") as f:
-            json.dump(value, f, ensure_ascii=False, indent=2, default=str)
+        cache_path.write_bytes(dumps_json(value))
         
         self.meta[key] = {
             "created_at": time.time(),
             "expires_at": time.time() + ttl if ttl > 0 else None,
             "path": str(cache_path)
         }
-        self._save_meta()
+        self._save_meta("set", key)
     
     def delete(self, key: str):
         """删除缓存"""
         if key in self.meta:
             cache_path = self._get_cache_path(key)
+            if not cache_path.exists():
+                self._migrate_legacy_file(key, cache_path)
             if cache_path.exists():
                 cache_path.unlink()
             del self.meta[key]
-            self._save_meta()
+            self._save_meta("delete", key)
     
     def clear(self):
-        """清空所有缓存"""
-        for key in list(self.meta.keys()):
-            self.delete(key)
+        """清空所有缓存（删除全部缓存文件后只写一次元数据）"""
+        for key, meta in self.meta.items():
+            self._get_cache_path(key).unlink(missing_ok=True)
+            # 尚未迁移的旧版本文件
+            if meta.get("path"):
+                Path(meta["path"]).unlink(missing_ok=True)
+        self.meta = {}
+        self.flush()
     
     def exists(self, key: str) -> bool:
-        """检查缓存是否存在"""
-        return self.get(key) is not None
+        """检查缓存是否存在（只检查元数据和文件是否存在，不读取缓存内容）"""
+        meta = self.meta.get(key)
+        if meta is None or (meta.get("expires_at") and time.time() > meta["expires_at"]):
+            return False
+        cache_path = self._get_cache_path(key)
+        if not cache_path.exists():
+            self._migrate_legacy_file(key, cache_path)
+        return cache_path.exists()
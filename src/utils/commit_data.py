@@ -0,0 +1,300 @@
+# -*- coding: utf-8 -*-
+"""
+提交数据加载模块
+将提交记录构建为带时间派生列的 DataFrame，并以 Parquet 形式缓存
+"""
+
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from src.constants import WEEKDAY_LABELS
+from src.utils.persistence import load_json
+
+logger = logging.getLogger(__name__)
+
+# 原始日期列（JSON 缓存中以字符串形式保存）
+DATE_COLUMNS = ("author_date", "committer_date")
+
+# PyDrillerCollector 输出的日期经 str() 序列化后的格式，如 2010-04-06 13:12:57+02:00
+COMMIT_DATE_FORMAT = "%Y-%m-%d %H:%M:%S%z"
+
+# dt.day_name() 输出的星期顺序，与 WEEKDAY_LABELS 一一对应
+WEEKDAY_ORDER = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+WEEKDAY_DTYPE = pd.CategoricalDtype(WEEKDAY_ORDER, ordered=True)
+
+# 下游分析和图表实际用到的列，其余原始列（哈希、邮箱、原始日期字符串等）在构建后丢弃
+COMMIT_DF_COLUMNS = (
+    "msg", "author_name", "insertions", "deletions", "files",
+    "date", "year", "month", "hour", "weekday",
+)
+
+# 派生/计数列的紧凑整数类型
+COMMIT_DF_DTYPES = {
+    "year": "int16",
+    "hour": "int8",
+    "insertions": "int32",
+    "deletions": "int32",
+    "files": "int32",
+}
+
+# 提交消息长度分组边界（右闭区间）
+MSG_LEN_BINS = [0, 20, 50, 100, 200, 500, 1000]
+
+
+def parse_commit_dates(dates: pd.Series) -> pd.Series:
+    """
+    将提交日期字符串解析为 UTC 时间
+
+    优先按 COMMIT_DATE_FORMAT 固定格式解析，格式不符时依次回退到
+    ISO8601 和逐元素推断。
+
+    Args:
+        dates: 日期字符串序列
+
+    Returns:
+        UTC 时区的 datetime 序列
+    """
+    for fmt in (COMMIT_DATE_FORMAT, "ISO8601"):
+        try:
+            return pd.to_datetime(dates, utc=True, format=fmt, cache=True)
+        except ValueError:
+            continue
+    return pd.to_datetime(dates, utc=True, format="mixed")
+
+
+def build_commit_df(
+    commits: Union[List[Dict[str, Any]], Dict[str, List[Any]]]
+) -> pd.DataFrame:
+    """
+    将提交记录构建为 DataFrame，并派生 date/year/month/hour/weekday 列
+
+    构建完成后只保留 COMMIT_DF_COLUMNS 中的列，原始日期字符串等不再携带。
+
+    Args:
+        commits: 提交记录，可以是逐行的字典列表（commits.json 内容），
+            也可以是列式的字段 -> 值列表字典（PyDrillerCollector.collect_commit_columns 输出）
+
+    Returns:
+        提交 DataFrame
+    """
+    df = pd.DataFrame(commits)
+    if df.empty:
+        return df
+
+    # 与 JSON 缓存保持一致：原始日期列统一为字符串
+    for col in DATE_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype(str)
+
+    # 提交消息使用 Arrow 字符串存储，长度等字符串运算可在 C 层完成
+    try:
+        df["msg"] = df["msg"].astype("string[pyarrow]")
+    except ImportError:
+        df["msg"] = df["msg"].astype("string")
+
+    # 修复时区感知日期转换问题
+    df["date"] = parse_commit_dates(df["committer_date"])
+    df["year"] = df["date"].dt.year
+    df["month"] = df["date"].dt.to_period("M").astype(str)
+    df["hour"] = df["date"].dt.hour
+    df["weekday"] = df["date"].dt.day_name().astype(WEEKDAY_DTYPE)
+
+    # 作者列重复度高，使用分类类型以整数编码参与计数
+    df["author_name"] = df["author_name"].astype("category")
+    return _normalize(df)
+
+
+def _normalize(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    只保留 COMMIT_DF_COLUMNS 中的列，并将数值列收窄为紧凑整数类型
+
+    Args:
+        df: 已派生时间列的提交 DataFrame
+
+    Returns:
+        精简后的 DataFrame
+    """
+    df = df[[col for col in COMMIT_DF_COLUMNS if col in df.columns]].copy()
+    for col, dtype in COMMIT_DF_DTYPES.items():
+        if col in df.columns and not df[col].isna().any():
+            df[col] = df[col].astype(dtype)
+    return df
+
+
+def _fixed_bins(values: np.ndarray, edges: List[float], labels: List[str]) -> pd.Series:
+    """
+    按固定的单调边界对数值分组计数，语义与 pd.cut 的右闭区间 (a, b] 一致
+
+    Args:
+        values: 数值数组
+        edges: 单调递增的分组边界
+        labels: 各区间标签，长度为 len(edges) - 1
+
+    Returns:
+        以 labels 为索引的计数序列，落在边界之外的值不计入
+    """
+    # side="left" 时 edges[i-1] < v <= edges[i] 的值落在第 i 个桶，
+    # 首尾两个桶分别是 <= edges[0] 和 > edges[-1] 的越界值
+    idx = np.searchsorted(edges, values, side="left")
+    counts = np.bincount(idx, minlength=len(edges) + 1)[1:len(edges)]
+    return pd.Series(counts, index=labels)
+
+
+def _bincount_series(codes: np.ndarray, labels: List[Any]) -> pd.Series:
+    """
+    对取值为 0..len(labels)-1 的整数编码计数，负数编码（缺失值）不计入
+
+    Args:
+        codes: 整数编码数组
+        labels: 各编码对应的标签
+
+    Returns:
+        以 labels 为索引的计数序列
+    """
+    codes = codes[codes >= 0]
+    return pd.Series(np.bincount(codes, minlength=len(labels)), index=labels)
+
+
+def top_k_with_other(counts: pd.Series, k: int, other_label: str = "其他") -> pd.Series:
+    """
+    取计数最多的 k 项（降序），其余各项合并为一个"其他"项
+
+    Args:
+        counts: 计数序列（无需预先排序）
+        k: 保留的项数
+        other_label: 合并项的标签
+
+    Returns:
+        前 k 项加合并项的计数序列，没有剩余项时不包含合并项
+    """
+    values = counts.to_numpy()
+    if len(values) <= k:
+        return counts.sort_values(ascending=False)
+
+    # argpartition 只做部分排序，再对选出的 k 项排序
+    top_idx = np.argpartition(-values, k)[:k]
+    top_idx = top_idx[np.argsort(-values[top_idx], kind="stable")]
+    top = pd.Series(values[top_idx], index=counts.index[top_idx].astype(object))
+
+    other = values.sum() - top.sum()
+    if other > 0:
+        top[other_label] = other
+    return top
+
+
+def commit_aggregates(df: pd.DataFrame) -> Dict[str, pd.Series]:
+    """
+    一次性计算图表所需的提交聚合序列，避免各图表重复扫描同一列
+
+    Args:
+        df: build_commit_df 构建的提交 DataFrame
+
+    Returns:
+        聚合结果字典：
+        - yearly: 按年份的提交数（首末年份之间连续，无提交的年份计 0）
+        - monthly: 按月份的提交数
+        - hourly: 按小时的提交数（0-23 点齐全）
+        - weekday: 按星期的提交数（索引为中文标签，周一到周日）
+        - authors: 按作者的提交数（降序）
+        - msg_len_bins: 提交消息长度分组计数
+    """
+    # 年份/小时/星期都是小范围整数，直接 bincount 代替哈希计数
+    years = df["year"].to_numpy(dtype="int64")
+    first_year = int(years.min()) if len(years) else 0
+    last_year = int(years.max()) if len(years) else -1
+    yearly = _bincount_series(years - first_year, list(range(first_year, last_year + 1)))
+    hourly = _bincount_series(df["hour"].to_numpy(dtype="int64"), list(range(24)))
+    weekday_codes = df["weekday"].astype(WEEKDAY_DTYPE).cat.codes.to_numpy()
+    weekday_counts = _bincount_series(weekday_codes, WEEKDAY_LABELS)
+
+    # 作者按分类编码计数一次，各作者图表共用
+    authors = df["author_name"].astype("category")
+    author_counts = _bincount_series(
+        authors.cat.codes.to_numpy(), list(authors.cat.categories)
+    )
+    author_counts = author_counts[author_counts > 0].sort_values(ascending=False, kind="stable")
+
+    msg_len = df["msg"].str.len().to_numpy(dtype="int64", na_value=0)
+    msg_len_bins = _fixed_bins(
+        msg_len, MSG_LEN_BINS, pd.IntervalIndex.from_breaks(MSG_LEN_BINS).astype(str)
+    )
+
+    return {
+        "yearly": yearly,
+        "monthly": df["month"].value_counts().sort_index(),
+        "hourly": hourly,
+        "weekday": weekday_counts,
+        "authors": author_counts,
+        "msg_len_bins": msg_len_bins,
+    }
+
+
+def save_commit_df(df: pd.DataFrame, parquet_path: Union[str, Path]) -> bool:
+    """
+    将提交 DataFrame 保存为 Parquet 缓存
+
+    Args:
+        df: 提交 DataFrame
+        parquet_path: Parquet 文件路径
+
+    Returns:
+        是否成功
+    """
+    try:
+        path = Path(parquet_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        df.to_parquet(path, engine="pyarrow", compression="zstd", index=False)
+        logger.info(f"提交数据已缓存为Parquet: {path}")
+        return True
+    except ImportError:
+        logger.warning("pyarrow未安装，跳过Parquet缓存")
+    except Exception as e:
+        logger.warning(f"Parquet缓存保存失败: {e}")
+    return False
+
+
+def load_cached_df(
+    json_path: Union[str, Path], parquet_path: Union[str, Path]
+) -> Optional[pd.DataFrame]:
+    """
+    加载提交 DataFrame，优先读取 Parquet 缓存
+
+    Parquet 缓存不存在或比 JSON 旧时，回退到解析 JSON 并重建缓存。
+
+    Args:
+        json_path: commits.json 路径
+        parquet_path: Parquet 缓存路径
+
+    Returns:
+        提交 DataFrame，两种缓存都不可用时返回 None
+    """
+    json_path = Path(json_path)
+    parquet_path = Path(parquet_path)
+
+    if parquet_path.exists() and (
+        not json_path.exists()
+        or parquet_path.stat().st_mtime >= json_path.stat().st_mtime
+    ):
+        try:
+            df = _normalize(pd.read_parquet(parquet_path, engine="pyarrow"))
+            logger.info(f"从Parquet缓存加载了 {len(df)} 条提交记录")
+            return df
+        except Exception as e:
+            logger.warning(f"Parquet缓存加载失败: {e}")
+
+    if not json_path.exists():
+        return None
+
+    commits = load_json(json_path)
+    if commits is None:
+        return None
+
+    logger.info(f"从JSON缓存加载了 {len(commits)} 条提交记录")
+    df = build_commit_df(commits)
+    if not df.empty:
+        save_commit_df(df, parquet_path)
+    return df
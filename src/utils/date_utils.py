@@ -3,9 +3,73 @@
 日期时间工具模块
 提供日期解析、格式化和范围计算功能
 """
+import re
 from datetime import datetime, timedelta
-from typing import Optional, List, Tuple
-import pandas as pd
+from functools import lru_cache
+from typing import TYPE_CHECKING, Iterable, Optional, List, Tuple
+
+# pandas 只在回退解析和批量函数中用到，按需导入以免拖慢本模块的导入
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+# 依次尝试的格式（时区部分在解析前去掉）
+_DATE_FORMATS = [
+    "%Y-%m-%d %H:%M:%S%z",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S%z",
+    "%Y-%m-%dT%H:%M:%SZ",
+    "%Y-%m-%d",
+]
+
+# 与上面各格式（去掉时区后）等价的正则，只匹配 strptime 同样能解析的字符串
+_DATE_RE = re.compile(
+    r"(\d{4})-(\d{1,2})-(\d{1,2})(?:(?:\s+|[Tt])(\d{1,2}):(\d{1,2}):(\d{1,2}))?",
+    re.ASCII,
+)
+
+
+def _parse_date_uncached(date_str) -> Optional[datetime]:
+    """parse_date 的实际解析逻辑"""
+    text = str(date_str).split("+")[0].split("Z")[0]
+
+    # 快速路径：格式列表覆盖的 "YYYY-MM-DD" 和 "YYYY-MM-DD[T ]HH:MM:SS"
+    # 交给 C 实现的 fromisoformat，结果与 strptime 相同
+    if (
+        len(text) in (10, 19)
+        and text[4] == text[7] == "-"
+        and (len(text) == 10 or text[10] in "T ")
+    ):
+        try:
+            return datetime.fromisoformat(text)
+        except ValueError:
+            pass
+
+    # 未补零等其他能被格式列表匹配的写法：一次正则匹配后直接构造
+    match = _DATE_RE.fullmatch(text)
+    if match:
+        try:
+            return datetime(*(int(g) for g in match.groups() if g is not None))
+        except ValueError:
+            pass
+
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt.replace("%z", ""))
+        except ValueError:
+            continue
+    
+    # 尝试pandas解析
+    import pandas as pd
+
+    try:
+        return pd.to_datetime(date_str).to_pydatetime()
+    except:
+        return None
+
+
+# 同一日期字符串（如按提交重复出现的时间戳）只解析一次；datetime 不可变，可安全共享
+_parse_date_str = lru_cache(maxsize=4096)(_parse_date_uncached)
 
 
 def parse_date(date_str: str) -> Optional[datetime]:
@@ -18,25 +82,53 @@ def parse_date(date_str: str) -> Optional[datetime]:
     Returns:
         datetime对象
     """
-    formats = [
-        "%Y-%m-%d %H:%M:%S%z",
-        "%Y-%m-%d %H:%M:%S",
-        "%Y-%m-%dT%H:%M:%S%z",
-        "%Y-%m-%dT%H:%M:%SZ",
-        "%Y-%m-%d",
-    ]
-    
-    for fmt in formats:
-        try:
-            return datetime.strptime(str(date_str).split("+")[0].split("Z")[0], fmt.replace("%z", ""))
-        except ValueError:
-            continue
-    
-    # 尝试pandas解析
+    if isinstance(date_str, str):
+        return _parse_date_str(date_str)
+    return _parse_date_uncached(date_str)
+
+
+def parse_dates(values: Iterable) -> "pd.Series":
+    """
+    批量解析日期字符串，一次向量化调用代替逐个 parse_date
+
+    先按 ISO8601 解析，存在其他格式时回退为逐元素推断；无法解析的值为 NaT。
+
+    Args:
+        values: 日期字符串序列（列表、Series 等）
+
+    Returns:
+        UTC 时区的 datetime 序列
+    """
+    import pandas as pd
+
+    values = pd.Series(values)
     try:
-        return pd.to_datetime(date_str).to_pydatetime()
-    except:
-        return None
+        return pd.to_datetime(values, utc=True, format="ISO8601")
+    except (ValueError, TypeError):
+        return pd.to_datetime(values, utc=True, format="mixed", errors="coerce")
+
+
+def date_parts(values: Iterable) -> "pd.DataFrame":
+    """
+    批量提取年、月、季度、星期、小时（按 UTC，与 commit_data 派生列一致）
+
+    Args:
+        values: 日期字符串序列
+
+    Returns:
+        含 year/month/quarter/weekday/hour 列的 DataFrame（周一为 0），
+        无法解析的日期对应 NaN
+    """
+    import pandas as pd
+
+    dt = parse_dates(values).dt
+    return pd.DataFrame({
+        "year": dt.year,
+        "month": dt.month,
+        "quarter": dt.quarter,
+        "weekday": dt.weekday,
+        "hour": dt.hour,
+    })
 
 
 def get_date_range(start: datetime, end: datetime) -> List[datetime]:
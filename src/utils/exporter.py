@@ -3,13 +3,14 @@
 数据导出模块
 支持导出为JSON、CSV、Markdown格式
 """
-import json
 import csv
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 import pandas as pd
 import logging
 
+from src.utils.persistence import dumps_json, loads_json
+
 logger = logging.getLogger(__name__)
 
 
@@ -29,8 +30,7 @@ def export_to_json(data: Any, filepath: str, indent: int = 2) -> bool:
         path = Path(filepath)
         path.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=indent, default=str)
+        path.write_bytes(dumps_json(data, indent))
         
         logger.info(f"JSON导出成功: {filepath}")
         return True
@@ -122,8 +122,7 @@ def load_json(filepath: str) -> Optional[Any]:
         加载的数据
     """
     try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return loads_json(Path(filepath).read_bytes())
     except Exception as e:
         logger.error(f"JSON加载失败: {e}")
         return None
@@ -6,12 +6,80 @@
 import os
 import logging
 import fnmatch
-from typing import List, Generator, Set, Optional
+from typing import Collection, List, Generator, Iterator, Set, Optional
 
 # 配置日志
 logger = logging.getLogger(__name__)
 
 
+def relative_path(path: str, root: str) -> str:
+    """
+    返回 path 相对于 root 的路径
+
+    path 以 root 为前缀时（iter_py_files/FileScanner 的输出）直接切片，
+    不构造 Path 对象；否则回退到 os.path.relpath。
+
+    Args:
+        path: 文件路径
+        root: 根目录路径
+
+    Returns:
+        相对路径
+    """
+    prefix = root if root.endswith(os.sep) else root + os.sep
+    if path.startswith(prefix):
+        return path[len(prefix):]
+    return os.path.relpath(path, root)
+
+
+def path_suffix(path: str) -> str:
+    """
+    返回文件扩展名，规则与 Path(path).suffix 一致（如 ".bashrc" 和 "a." 的扩展名为空）
+
+    Args:
+        path: 文件路径
+
+    Returns:
+        扩展名（含点），没有扩展名时为空串
+    """
+    name = os.path.basename(path)
+    i = name.rfind(".")
+    return name[i:] if 0 < i < len(name) - 1 else ""
+
+
+def iter_py_files(root: str, ignore_dirs: Collection[str] = ()) -> Iterator[str]:
+    """
+    递归遍历目录，生成所有 .py 文件路径
+
+    基于 os.scandir 手动递归，直接使用 DirEntry 缓存的类型信息，不为每个条目
+    构造 Path 对象；ignore_dirs 中的目录在下降时即被剪枝。遍历顺序与
+    Path.rglob("*.py") 一致：先输出当前目录的文件，再按目录项顺序进入子目录；
+    不进入指向目录的符号链接。
+
+    Args:
+        root: 根目录路径
+        ignore_dirs: 需要跳过的目录名集合
+
+    Yields:
+        .py 文件路径（字符串，以 root 为前缀）
+    """
+    subdirs = []
+    try:
+        with os.scandir(root) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in ignore_dirs:
+                        subdirs.append(entry.path)
+                elif entry.name.endswith(".py"):
+                    yield entry.path
+    except OSError as e:
+        logger.debug(f"无法读取目录 {root}: {e}")
+        return
+
+    for subdir in subdirs:
+        yield from iter_py_files(subdir, ignore_dirs)
+
+
 class FileScanner:
     """
     文件扫描器类
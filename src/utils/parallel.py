@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""
+并行执行工具
+将 CPU 密集的逐文件分析分发到进程池，条件不满足时回退为串行
+"""
+
+import os
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 任务数少于该值时串行执行，避免进程池启动开销
+PARALLEL_MIN_ITEMS = 32
+
+
+def parallel_map(
+    func: Callable[[Any], Any],
+    items: Iterable[Any],
+    max_workers: Optional[int] = None,
+    min_items: int = PARALLEL_MIN_ITEMS,
+) -> List[Any]:
+    """
+    对每个元素调用 func，任务较多且有多个 CPU 时使用进程池并行
+
+    Args:
+        func: 工作函数，需为模块级函数以便 pickle
+        items: 待处理元素（如文件路径），需可 pickle
+        max_workers: 最大进程数，None 使用 CPU 核数
+        min_items: 启用进程池的最少任务数
+
+    Returns:
+        与 items 顺序一致的结果列表
+    """
+    items = list(items)
+    workers = max_workers or os.cpu_count() or 1
+
+    if workers > 1 and len(items) >= min_items:
+        chunksize = max(1, len(items) // (4 * workers))
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                return list(executor.map(func, items, chunksize=chunksize))
+        except (OSError, BrokenProcessPool) as e:
+            logger.warning(f"进程池不可用，改为串行执行: {e}")
+
+    return [func(item) for item in items]
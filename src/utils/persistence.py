@@ -4,30 +4,69 @@
 提供JSON和CSV的保存和加载功能
 """
 
+import os
 import json
 import csv
+import mmap
 import shutil
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Union
 from datetime import datetime
 import logging
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 
+def dumps_json(data: Any, indent: Optional[int] = 2) -> bytes:
+    """
+    将数据编码为 UTF-8 JSON 文本，orjson 可用且缩进为 2 或 None 时使用 orjson
+
+    Args:
+        data: 要编码的数据
+        indent: 缩进空格数，None 为紧凑格式
+
+    Returns:
+        JSON 文本（bytes）
+    """
+    # orjson 仅支持 2 空格缩进；datetime 交给 default=str，与标准库输出格式一致
+    if ORJSON_AVAILABLE and indent in (2, None):
+        option = (
+            orjson.OPT_PASSTHROUGH_DATETIME
+            | orjson.OPT_SERIALIZE_NUMPY
+            | orjson.OPT_NON_STR_KEYS
+        )
+        if indent == 2:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=str, option=option)
+    return json.dumps(data, ensure_ascii=False, indent=indent, default=str).encode("utf-8")
+
+
 def save_json(data: Any, filepath: str, indent: int = 2) -> bool:
-    """保存数据到JSON文件"""
+    """
+    保存数据到JSON文件
+
+    先写入同目录下的临时文件再原子替换目标文件，写入中途中断时原文件保持完整。
+    """
+    path = Path(filepath)
+    tmp_path = path.with_name(path.name + ".tmp")
     try:
-        path = Path(filepath)
         path.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=indent, default=str)
+        tmp_path.write_bytes(dumps_json(data, indent))
+        os.replace(tmp_path, path)
         
         logger.debug(f"已保存JSON: {filepath}")
         return True
     except Exception as e:
         logger.error(f"保存JSON失败: {e}")
+        tmp_path.unlink(missing_ok=True)
         return False
 
 
@@ -38,6 +77,13 @@ def load_json(filepath: str) -> Optional[Any]:
         if not path.exists():
             return None
         
+        if ORJSON_AVAILABLE:
+            if path.stat().st_size == 0:
+                return orjson.loads(b"")
+            # 内存映射后直接交给 orjson 解析，不额外复制一份文件内容
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as view:
+                    return orjson.loads(view)
         with open(path, "r", encoding="utf-8") as f:
             return json.load(f)
     except Exception as e:
@@ -45,6 +91,77 @@ def load_json(filepath: str) -> Optional[Any]:
         return None
 
 
+def loads_json(data: Union[bytes, str]) -> Any:
+    """
+    解析内存中的 JSON 文本（如 HTTP 响应体），orjson 可用时使用 orjson
+
+    Args:
+        data: JSON 文本（bytes 或 str）
+
+    Returns:
+        解析结果
+
+    Raises:
+        ValueError: JSON 格式错误（json.JSONDecodeError 或其子类 orjson.JSONDecodeError）
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _jsonl_line(record: Any) -> bytes:
+    """将一条记录编码为 JSON Lines 的一行（含换行符）"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(record, default=str) + b"\n"
+    return json.dumps(record, ensure_ascii=False, default=str).encode("utf-8") + b"\n"
+
+
+def append_jsonl(records: Iterable[Any], filepath: str) -> Optional[int]:
+    """
+    将记录追加到 JSON Lines 文件（每行一条），已有内容不会重写
+
+    Args:
+        records: 要追加的记录
+        filepath: 文件路径
+
+    Returns:
+        追加后的文件大小（字节），失败时返回 None
+    """
+    try:
+        path = Path(filepath)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "ab") as f:
+            f.write(b"".join(_jsonl_line(record) for record in records))
+            return f.tell()
+    except Exception as e:
+        logger.error(f"追加JSON Lines失败: {e}")
+        return None
+
+
+def load_jsonl(filepath: str, size: Optional[int] = None) -> Optional[List[Any]]:
+    """
+    从 JSON Lines 文件加载记录
+
+    Args:
+        filepath: 文件路径
+        size: 只读取前 size 字节（如断点记录的偏移量），None 读取整个文件
+
+    Returns:
+        记录列表，文件不存在或解析失败时返回 None
+    """
+    try:
+        path = Path(filepath)
+        if not path.exists():
+            return None
+
+        with open(path, "rb") as f:
+            data = f.read() if size is None else f.read(size)
+        return [loads_json(line) for line in data.splitlines() if line.strip()]
+    except Exception as e:
+        logger.error(f"加载JSON Lines失败: {e}")
+        return None
+
+
 def save_csv(data: List[Dict], filepath: str, fieldnames: Optional[List[str]] = None) -> bool:
     """保存数据到CSV文件"""
     try:
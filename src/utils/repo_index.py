@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+仓库文件索引
+目录只遍历一次、文件内容只读取一次，供多个分析器共享
+"""
+
+import os
+import mmap
+import logging
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# 超过该大小的文件通过内存映射读取，直接从页缓存解码，省去一次用户态缓冲区复制
+MMAP_MIN_SIZE = 64 * 1024
+
+
+def decode_text(data, errors: str = "strict") -> str:
+    """
+    以 UTF-8 解码，换行处理与文本模式 open() 一致（\\r\\n 和 \\r 转为 \\n）
+
+    Args:
+        data: bytes 或其他支持缓冲区协议的对象（如 mmap 的 memoryview）
+        errors: 解码错误处理方式，同 bytes.decode
+
+    Returns:
+        解码后的文本
+    """
+    text = str(data, "utf-8", errors)
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def read_text_file(path: Union[str, Path], errors: str = "strict") -> str:
+    """
+    读取 UTF-8 文本文件，结果与 open(path, encoding="utf-8", errors=errors).read() 一致
+
+    小文件直接以文本模式读取；超过 MMAP_MIN_SIZE 的文件内存映射后直接解码。
+
+    Args:
+        path: 文件路径
+        errors: 解码错误处理方式，同 bytes.decode
+
+    Returns:
+        文件文本内容
+    """
+    if os.path.getsize(path) <= MMAP_MIN_SIZE:
+        with open(path, "r", encoding="utf-8", errors=errors) as f:
+            return f.read()
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        with memoryview(mm) as view:
+            return decode_text(view, errors)
+
+
+@lru_cache(maxsize=2048)
+def _read_bytes(path: str, mtime_ns: int, size: int) -> bytes:
+    """按 (路径, 修改时间, 大小) 缓存文件内容，文件变化后自动失效"""
+    with open(path, "rb") as f:
+        return f.read()
+
+
+class RepoIndex:
+    """
+    仓库文件索引
+
+    首次调用 files() 时遍历整个目录树并缓存文件列表；read()/read_text()
+    按修改时间缓存文件内容，同一文件被多个分析器使用时只读取一次。
+    """
+
+    def __init__(self, root: Union[str, Path]):
+        """
+        初始化文件索引
+
+        Args:
+            root: 仓库根目录路径
+        """
+        self.root = os.path.abspath(root)
+        self._dirs: Optional[List[Tuple[Tuple[str, ...], str, List[str]]]] = None
+
+    def _walk(self) -> List[Tuple[Tuple[str, ...], str, List[str]]]:
+        """遍历目录树，按 os.walk 自顶向下的顺序返回 (相对目录各级名称, 目录路径, 文件名列表)"""
+        if self._dirs is None:
+            self._dirs = []
+            for dirpath, _, filenames in os.walk(self.root):
+                rel = os.path.relpath(dirpath, self.root)
+                parts = () if rel == os.curdir else tuple(rel.split(os.sep))
+                self._dirs.append((parts, dirpath, filenames))
+            logger.debug(
+                f"索引了 {sum(len(f) for _, _, f in self._dirs)} 个文件: {self.root}"
+            )
+        return self._dirs
+
+    def files(
+        self,
+        suffix: Optional[str] = None,
+        ignore_dirs: Optional[Iterable[str]] = None,
+    ) -> List[str]:
+        """
+        获取文件列表
+
+        Args:
+            suffix: 只返回该扩展名的文件（如 ".py"），None 返回所有文件
+            ignore_dirs: 路径中包含这些目录名的文件被排除
+
+        Returns:
+            文件绝对路径（字符串）列表
+        """
+        ignore = set(ignore_dirs or ())
+        result = []
+        for parts, dirpath, filenames in self._walk():
+            if ignore and ignore.intersection(parts):
+                continue
+            result.extend(
+                os.path.join(dirpath, name)
+                for name in filenames
+                if suffix is None or name.endswith(suffix)
+            )
+        return result
+
+    def read(self, path: Union[str, Path]) -> bytes:
+        """
+        读取文件内容（带缓存）
+
+        Args:
+            path: 文件路径
+
+        Returns:
+            文件字节内容
+        """
+        path = str(path)
+        stat = os.stat(path)
+        return _read_bytes(path, stat.st_mtime_ns, stat.st_size)
+
+    def read_text(self, path: Union[str, Path], errors: str = "strict") -> str:
+        """
+        以 UTF-8 读取文本，换行处理与文本模式 open() 一致（\\r\\n 和 \\r 转为 \\n）
+
+        Args:
+            path: 文件路径
+            errors: 解码错误处理方式，同 bytes.decode
+
+        Returns:
+            文件文本内容
+        """
+        return decode_text(self.read(path), errors)
@@ -2,14 +2,31 @@
 """
 Visualizers package
 可视化模块包
+
+各绘图函数按需导入（PEP 562），导入本包时不会立即加载 matplotlib、seaborn。
 """
 
-from .style import apply_style, save_plot, get_color, get_palette, get_cmap
-from .charts import plot_bar, plot_pie, plot_horizontal_bar, plot_line, plot_area
+import importlib
+
+# 导出名称 -> 所在子模块
+_LAZY_IMPORTS = {
+    "apply_style": ".style",
+    "save_plot": ".style",
+    "save_figure": ".style",
+    "get_color": ".style",
+    "get_palette": ".style",
+    "get_cmap": ".style",
+    "plot_bar": ".charts",
+    "plot_pie": ".charts",
+    "plot_horizontal_bar": ".charts",
+    "plot_line": ".charts",
+    "plot_area": ".charts",
+}
 
 __all__ = [
     "apply_style",
     "save_plot",
+    "save_figure",
     "get_color",
     "get_palette",
     "get_cmap",
@@ -19,3 +36,17 @@ __all__ = [
     "plot_line",
     "plot_area",
 ]
+
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -4,12 +4,56 @@ Basic charts module
 Provides functions for creating bar charts and pie charts.
 """
 
+import matplotlib
 import matplotlib.pyplot as plt
 import pandas as pd
 import seaborn as sns
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.patches import Circle
 from typing import List, Optional, Union, Dict, Any
 
-from src.visualizers.style import apply_style, save_plot, get_color, get_palette
+from src.visualizers.style import apply_style, save_plot, save_figure, get_color, get_palette
+
+# 柱状图/饼图共用的 Agg Figure，避免每张图重复创建 Figure 和初始化后端
+_shared_figure: Optional[Figure] = None
+
+
+def _get_canvas() -> Figure:
+    """
+    获取复用的 Agg Figure，首次调用时创建，之后每次清空上一张图的内容
+
+    Returns:
+        已清空并按当前 rcParams 设置尺寸的 Figure
+    """
+    global _shared_figure
+    if _shared_figure is None:
+        _shared_figure = Figure()
+        FigureCanvasAgg(_shared_figure)
+    _shared_figure.clf()
+    _shared_figure.set_size_inches(matplotlib.rcParams["figure.figsize"])
+    return _shared_figure
+
+
+def warmup() -> None:
+    """
+    预热 matplotlib：应用样式后在共享 Figure 上完整绘制一次（不保存），
+    提前完成后端初始化和字体查找缓存，使后续每张图的耗时只取决于实际绘制
+    """
+    apply_style()
+    fig = _get_canvas()
+    ax = fig.add_subplot()
+    ax.bar(["预热"], [1])
+    ax.set_title("预热 warmup", fontweight="bold")
+    fig.canvas.draw()
+    fig.clf()
+
+
+def _rotate_xticklabels(ax: Any) -> None:
+    """X 轴刻度标签旋转 45 度并右对齐"""
+    for label in ax.get_xticklabels():
+        label.set_rotation(45)
+        label.set_horizontalalignment("right")
 
 
 def plot_bar(
@@ -38,20 +82,21 @@ def plot_bar(
     if top_n and len(data) > top_n:
         data = data.head(top_n)
 
-    plt.figure()
+    fig = _get_canvas()
+    ax = fig.add_subplot()
 
     colors = get_palette()
     if horizontal:
-        plt.barh(data.index, data.values, color=colors[:len(data)])
-        plt.xlabel(ylabel)
-        plt.ylabel(xlabel)
+        ax.barh(data.index, data.values, color=colors[:len(data)])
+        ax.set_xlabel(ylabel)
+        ax.set_ylabel(xlabel)
     else:
-        plt.bar(data.index, data.values, color=colors[:len(data)])
-        plt.xlabel(xlabel)
-        plt.ylabel(ylabel)
-        plt.xticks(rotation=45, ha="right")
+        ax.bar(data.index, data.values, color=colors[:len(data)])
+        ax.set_xlabel(xlabel)
+        ax.set_ylabel(ylabel)
+        _rotate_xticklabels(ax)
 
-    save_plot(output_path, title)
+    save_figure(fig, output_path, title)
 
 
 
@@ -83,7 +128,8 @@ def plot_pie(
     """
     apply_style()
 
-    plt.figure()
+    fig = _get_canvas()
+    ax = fig.add_subplot()
 
     colors = get_palette()
     # Ensure we have enough colors
@@ -91,7 +137,7 @@ def plot_pie(
         colors = colors * (len(data) // len(colors) + 1)
     colors = colors[: len(data)]
 
-    patches, texts, autotexts = plt.pie(
+    patches, texts, autotexts = ax.pie(
         data.values,
         labels=data.index,
         autopct="%1.1f%%",
@@ -102,16 +148,15 @@ def plot_pie(
     )
 
     # Draw a circle at the center to make it a donut chart (optional, but looks nice)
-    centre_circle = plt.Circle((0, 0), 0.70, fc="white")
-    fig = plt.gcf()
-    fig.gca().add_artist(centre_circle)
+    centre_circle = Circle((0, 0), 0.70, fc="white")
+    ax.add_artist(centre_circle)
 
-    plt.axis("equal")  # Equal aspect ratio ensures that pie is drawn as a circle.
+    ax.axis("equal")  # Equal aspect ratio ensures that pie is drawn as a circle.
 
     if show_legend:
-        plt.legend(patches, data.index, loc="best")
+        ax.legend(patches, data.index, loc="best")
 
-    save_plot(output_path, title)
+    save_figure(fig, output_path, title)
 
 
 def plot_line(
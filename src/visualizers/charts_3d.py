@@ -101,7 +101,7 @@ def plot_author_3d(
     top_authors = df["author_name"].value_counts().head(top_n).index.tolist()
     df_top = df[df["author_name"].isin(top_authors)]
     
-    grouped = df_top.groupby(["author_name", "year"]).size().reset_index(name="count")
+    grouped = df_top.groupby(["author_name", "year"], observed=True).size().reset_index(name="count")
     
     author_map = {name: i for i, name in enumerate(top_authors)}
     grouped["author_idx"] = grouped["author_name"].map(author_map)
@@ -153,7 +153,7 @@ def plot_author_activity_heatmap(
     top_authors = df["author_name"].value_counts().head(top_n).index.tolist()
     df_top = df[df["author_name"].isin(top_authors)]
     
-    pivot = df_top.groupby(["author_name", "year"]).size().unstack(fill_value=0)
+    pivot = df_top.groupby(["author_name", "year"], observed=True).size().unstack(fill_value=0)
     
     pivot = pivot.reindex(top_authors)
     
@@ -165,7 +165,7 @@ def plot_first_contribution_timeline(
     
     df["year"] = df["date"].dt.year
     
-    first_year = df.groupby("author_name")["year"].min()
+    first_year = df.groupby("author_name", observed=True)["year"].min()
     new_contributors = first_year.value_counts().sort_index()
     
     plt.figure(figsize=(12, 6))
@@ -148,7 +148,7 @@ def plot_contribution_heatmap(
     df["month"] = pd.to_datetime(df["date"]).dt.to_period("M").astype(str)
     
     # 按作者和月份统计
-    pivot = df.groupby(["author_name", "month"]).size().unstack(fill_value=0)
+    pivot = df.groupby(["author_name", "month"], observed=True).size().unstack(fill_value=0)
     
     # 只显示top 15贡献者
     top_authors = df["author_name"].value_counts().head(15).index
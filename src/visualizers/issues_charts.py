@@ -49,15 +49,15 @@ def plot_issues_timeline(issues: List[Dict], output_path: str, title: str = "Iss
         logger.warning("没有Issues数据")
         return
     
-    df = pd.DataFrame(issues)
-    if "created_at" not in df.columns:
+    # 只取出创建时间一列，不把整条原始记录（嵌套的 user/labels 等）构建成 DataFrame
+    if not any("created_at" in issue for issue in issues):
         logger.warning("缺少created_at字段")
         return
     
-    df["created"] = pd.to_datetime(df["created_at"])
-    df["month"] = df["created"].dt.to_period("M").astype(str)
+    created = pd.to_datetime(pd.Series([issue.get("created_at") for issue in issues]))
+    months = created.dt.to_period("M").astype(str)
     
-    monthly = df["month"].value_counts().sort_index()
+    monthly = months.value_counts().sort_index()
     recent = monthly.tail(36)
     
     plt.figure(figsize=(14, 6))
@@ -49,15 +49,15 @@ def plot_prs_timeline(prs: List[Dict], output_path: str, title: str = "PRs创建
         logger.warning("没有PRs数据")
         return
     
-    df = pd.DataFrame(prs)
-    if "created_at" not in df.columns:
+    # 只取出创建时间一列，不把整条原始记录（嵌套的 user/labels 等）构建成 DataFrame
+    if not any("created_at" in pr for pr in prs):
         logger.warning("缺少created_at字段")
         return
     
-    df["created"] = pd.to_datetime(df["created_at"])
-    df["month"] = df["created"].dt.to_period("M").astype(str)
+    created = pd.to_datetime(pd.Series([pr.get("created_at") for pr in prs]))
+    months = created.dt.to_period("M").astype(str)
     
-    monthly = df["month"].value_counts().sort_index()
+    monthly = months.value_counts().sort_index()
     recent = monthly.tail(36)
     
     plt.figure(figsize=(14, 6))
@@ -120,17 +120,16 @@ def plot_pr_merge_time(prs: List[Dict], output_path: str, title: str = "PR合并
         logger.warning("没有PRs数据")
         return
     
-    merge_times = []
-    for pr in prs:
-        if pr.get("merged_at") and pr.get("created_at"):
-            try:
-                created = pd.to_datetime(pr["created_at"])
-                merged = pd.to_datetime(pr["merged_at"])
-                days = (merged - created).days
-                if 0 <= days <= 365:
-                    merge_times.append(days)
-            except:
-                pass
+    # 一次性向量化解析所有时间，无法解析的记录为 NaT，比较时被过滤
+    pairs = [
+        (pr["created_at"], pr["merged_at"])
+        for pr in prs
+        if pr.get("merged_at") and pr.get("created_at")
+    ]
+    created = pd.to_datetime([c for c, _ in pairs], utc=True, format="ISO8601", errors="coerce")
+    merged = pd.to_datetime([m for _, m in pairs], utc=True, format="ISO8601", errors="coerce")
+    days = (merged - created).days
+    merge_times = [int(d) for d in days[(days >= 0) & (days <= 365)]]
     
     if not merge_times:
         logger.warning("没有合并时间数据")
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+并行渲染模块
+将相互独立的绘图调用分发到多个进程中执行
+"""
+
+import os
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 绘图任务：(绘图函数, 位置参数)，函数需为模块级函数以便 pickle
+ChartTask = Tuple[Callable[..., Any], Sequence[Any]]
+
+# 任务数少于该值时串行渲染，避免进程启动和 matplotlib 导入开销
+PARALLEL_MIN_CHARTS = 4
+
+
+def _init_worker() -> None:
+    """工作进程初始化：在反序列化任务（导入绘图模块）之前切换到无界面后端并预热"""
+    import matplotlib
+    matplotlib.use("Agg")
+
+    from src.visualizers.charts import warmup
+    warmup()
+
+
+def _dispatch(task: ChartTask) -> Any:
+    """进程池工作函数：执行单个绘图任务"""
+    fn, args = task
+    return fn(*args)
+
+
+def render_charts(tasks: List[ChartTask], max_workers: Optional[int] = None) -> None:
+    """
+    渲染一组相互独立的图表，任务较多且有多个 CPU 时使用进程池并行
+
+    工作进程以 spawn 方式启动，不继承父进程的 matplotlib 后端和图形状态。
+
+    Args:
+        tasks: 绘图任务列表
+        max_workers: 最大进程数，None 使用 CPU 核数
+    """
+    workers = min(max_workers or os.cpu_count() or 1, len(tasks))
+
+    if workers > 1 and len(tasks) >= PARALLEL_MIN_CHARTS:
+        try:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            ) as executor:
+                list(executor.map(_dispatch, tasks))
+            return
+        except (OSError, BrokenProcessPool) as e:
+            logger.warning(f"进程池不可用，改为串行渲染: {e}")
+
+    from src.visualizers.charts import warmup
+    warmup()
+
+    for task in tasks:
+        _dispatch(task)
@@ -14,10 +14,10 @@ from pathlib import Path
 from src.config import (
     WARM_COLORS,
     WARM_PALETTE,
-    WARM_CMAP,
     CHART_STYLE,
     FIGURE_SIZE,
     FIGURE_DPI,
+    get_warm_cmap,
 )
 
 
@@ -67,7 +67,7 @@ def get_palette() -> List[str]:
 
 def get_cmap() -> Any:
     """获取colormap"""
-    return WARM_CMAP
+    return get_warm_cmap()
 
 
 def save_plot(filename: str, title: Optional[str] = None) -> None:
@@ -94,3 +94,37 @@ def save_plot(filename: str, title: Optional[str] = None) -> None:
         facecolor=WARM_COLORS["background"],
     )
     plt.close()
+
+
+def save_figure(fig: Any, filename: str, title: Optional[str] = None) -> None:
+    """
+    保存 Figure 对象（面向对象接口，不依赖 pyplot 的当前图表状态）
+
+    与 save_plot 不同，保存后不会关闭 Figure，调用方可以清空后继续复用。
+
+    Args:
+        fig: matplotlib Figure 对象
+        filename: 保存路径
+        title: 图表标题（设置在第一个坐标轴上）
+    """
+    import os
+
+    if title and fig.axes:
+        title_kwargs = {"pad": 20, "fontsize": 14, "fontweight": "bold", "color": WARM_COLORS["dark"]}
+        font_path = Path("C:/Windows/Fonts/msyh.ttc")
+        if font_path.exists():
+            title_kwargs["fontproperties"] = fm.FontProperties(fname=str(font_path))
+        fig.axes[0].set_title(title, **title_kwargs)
+
+    fig.tight_layout()
+
+    dirname = os.path.dirname(filename)
+    if dirname:
+        os.makedirs(dirname, exist_ok=True)
+
+    fig.savefig(
+        filename,
+        dpi=FIGURE_DPI,
+        bbox_inches="tight",
+        facecolor=WARM_COLORS["background"],
+    )
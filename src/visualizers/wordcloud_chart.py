@@ -20,7 +20,7 @@ from src.visualizers.style import apply_style, save_plot, get_color
 
 logger = logging.getLogger(__name__)
 
-STOPWORDS = {
+STOPWORDS = frozenset({
     "the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for",
     "of", "with", "by", "from", "as", "is", "was", "are", "were", "been",
     "be", "have", "has", "had", "do", "does", "did", "will", "would",
@@ -29,29 +29,35 @@ STOPWORDS = {
     "they", "them", "fix", "add", "update", "merge", "pull", "request",
     "branch", "commit", "into", "not", "use", "using", "also", "when",
     "more", "some", "all", "new", "see", "now", "only", "just", "make",
-}
+})
+
+
+# 预编译的清理正则
+_PUNCT_RE = re.compile(r'[^\w\s]')
+_SPACE_RE = re.compile(r'\s+')
 
 
 def clean_text(text: str) -> str:
     """清理文本"""
-    text = re.sub(r'[^\w\s]', ' ', text.lower())
-    text = re.sub(r'\s+', ' ', text).strip()
+    text = _PUNCT_RE.sub(' ', text.lower())
+    text = _SPACE_RE.sub(' ', text).strip()
     return text
 
 
+def _keywords(messages: List[str], min_length: int = 3) -> List[str]:
+    """
+    按出现顺序返回所有消息中的关键词（长度不小于 min_length 且不在停用词中）
+
+    消息拼接后只做一次小写和标点替换；split() 本身按任意空白切分，
+    结果与逐条 clean_text 后再切分相同。
+    """
+    words = _PUNCT_RE.sub(" ", "\n".join(messages).lower()).split()
+    return [w for w in words if len(w) >= min_length and w not in STOPWORDS]
+
+
 def extract_keywords(messages: List[str], min_length: int = 3) -> Dict[str, int]:
     """从消息列表提取关键词"""
-    word_counts = Counter()
-    
-    for msg in messages:
-        cleaned = clean_text(msg)
-        words = cleaned.split()
-        
-        for word in words:
-            if len(word) >= min_length and word not in STOPWORDS:
-                word_counts[word] += 1
-    
-    return dict(word_counts)
+    return dict(Counter(_keywords(messages, min_length)))
 
 
 def generate_wordcloud(
@@ -74,11 +80,7 @@ def generate_wordcloud(
         logger.warning("没有消息数据")
         return
     
-    all_text = " ".join([clean_text(msg) for msg in messages])
-    
-    words = all_text.split()
-    filtered_words = [w for w in words if w not in STOPWORDS and len(w) >= 3]
-    final_text = " ".join(filtered_words)
+    final_text = " ".join(_keywords(messages))
     
     if not final_text.strip():
         logger.warning("没有足够的词生成词云")
@@ -3,11 +3,26 @@
 Tests for analyzers module.
 """
 
+import gc
+import io
 import pytest
 import os
+import weakref
 from unittest.mock import MagicMock, patch
 from src.analyzers.stats import CodeStats
 from src.analyzers.complexity_analyzer import ComplexityAnalyzer
+from src.analyzers.dependency_analyzer import DependencyAnalyzer
+from src.analyzers.dynamic_tracer import DynamicTracer
+from src.utils.ast_cache import AstCache
+from src.utils.repo_index import MMAP_MIN_SIZE, RepoIndex
+from src.analyzers.message_analyzer import (
+    TYPE_NAMES,
+    analyze_all,
+    analyze_messages,
+    classify_batch,
+    classify_commit,
+    get_message_patterns,
+)
 
 # --- CodeStats Tests ---
 
@@ -34,6 +49,15 @@ def test_count_lines():
     assert result["code"] == 3
 
 
+def test_count_bytes_matches_count_lines():
+    """Raw-byte counting should agree with counting the decoded text."""
+    stats = CodeStats()
+    data = b"import os\r\n\r\n  # note\n\tx = 1\x0c\n\xff\n"
+
+    text = data.decode("utf-8", "ignore").replace("\r\n", "\n")
+    assert stats.count_bytes(data) == stats.count_lines(text)
+
+
 def test_analyze_file_stats(tmp_path):
     """Test analyzing a single file."""
     f = tmp_path / "test.py"
@@ -106,3 +130,163 @@ def test_analyze_repository_complexity(tmp_path):
         assert stats["total_functions"] == 1
         assert len(stats["high_complexity_functions"]) == 1
         assert stats["high_complexity_functions"][0]["name"] == "complex_func"
+
+
+# --- DependencyAnalyzer Tests ---
+
+
+def test_dependency_analyzer_nested_imports_and_cache(tmp_path):
+    """Imports inside blocks and functions are found; unchanged files are parsed once."""
+    f = tmp_path / "mod.py"
+    f.write_text(
+        "import os\n"
+        "try:\n    import json\nexcept ImportError:\n    json = None\n"
+        "def load():\n    from flask import Flask\n    return Flask\n",
+        encoding="utf-8",
+    )
+
+    analyzer = DependencyAnalyzer(str(tmp_path), store_file_details=True)
+    result = analyzer.analyze_project(max_workers=1)
+    deps = result["file_dependencies"]["mod.py"]
+
+    assert deps["imports"] == ["os", "json"]
+    assert deps["from_imports"] == ["flask"]
+    assert deps["internal"] == ["flask"]
+
+    with patch.object(DependencyAnalyzer, "analyze_file") as mock_analyze:
+        graph = analyzer.get_dependency_graph()
+        assert not mock_analyze.called
+    assert graph == {"mod.py": ["flask"]}
+
+
+def test_shared_repo_index_matches_direct_reads(tmp_path):
+    """Analyzers sharing a RepoIndex give the same results as reading files themselves."""
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "a.py").write_bytes(
+        b"import os\r\ndef f(x):\r\n    if x:\r\n        return 1\r\n    return 2\r\n"
+    )
+    (tmp_path / "__pycache__").mkdir()
+    (tmp_path / "__pycache__" / "b.py").write_text("import sys\n", encoding="utf-8")
+
+    index = RepoIndex(tmp_path)
+    assert ComplexityAnalyzer(str(tmp_path), index=index).analyze_repository() == (
+        ComplexityAnalyzer(str(tmp_path)).analyze_repository()
+    )
+    assert DependencyAnalyzer(str(tmp_path), index=index).analyze_project(max_workers=1) == (
+        DependencyAnalyzer(str(tmp_path)).analyze_project(max_workers=1)
+    )
+    assert [os.path.basename(p) for p in index.files(".py", ignore_dirs={"__pycache__"})] == ["a.py"]
+
+
+def test_shared_ast_cache_parses_each_file_once(tmp_path):
+    """Complexity and dependency analysis share one parse per file via AstCache."""
+    (tmp_path / "a.py").write_text(
+        "import os\nfrom flask import Flask\ndef f(x):\n    return 1 if x else 2\n",
+        encoding="utf-8",
+    )
+    (tmp_path / "broken.py").write_text("def (:\n", encoding="utf-8")
+
+    cache = AstCache()
+    complexity = ComplexityAnalyzer(str(tmp_path), ast_cache=cache).analyze_repository()
+    deps = DependencyAnalyzer(str(tmp_path), ast_cache=cache).analyze_project()
+
+    assert complexity == ComplexityAnalyzer(str(tmp_path)).analyze_repository()
+    assert deps == DependencyAnalyzer(str(tmp_path)).analyze_project(max_workers=1)
+    info = cache.cache_info()
+    # broken.py is never cached; a.py is parsed once and hit by the second analyzer
+    assert (info.currsize, info.hits) == (1, 1)
+
+
+def test_large_file_mmap_read_matches_small(tmp_path):
+    """Files above MMAP_MIN_SIZE are read via mmap with the same newline handling."""
+    body = "def f(x):\r\n    if x:\r\n        return 1\r\n    return 2\r\n\r\n"
+    big = tmp_path / "big.py"
+    big.write_bytes((body * (MMAP_MIN_SIZE // len(body) + 1)).encode("utf-8"))
+    small = tmp_path / "small.py"
+    small.write_bytes(body.encode("utf-8"))
+
+    analyzer = ComplexityAnalyzer(str(tmp_path))
+    big_result = analyzer.analyze_file(str(big))
+    small_result = analyzer.analyze_file(str(small))
+
+    assert "error" not in big_result
+    assert big_result["max_complexity"] == small_result["max_complexity"] == 2
+    assert big_result["functions"][-1]["lineno"] == small_result["functions"][0]["lineno"] + (
+        len(big_result["functions"]) - 1
+    ) * 5
+
+
+def test_graph_stats_match_networkx():
+    """CSR-based graph statistics agree with networkx on a DiGraph."""
+    nx = pytest.importorskip("networkx")
+    graph = {
+        "app.py": ["flask", "flask.json", "flask"],
+        "views.py": ["flask", "app"],
+        "app": ["app"],
+        "empty.py": [],
+    }
+
+    stats = DependencyAnalyzer(".").get_graph_stats(graph, top_n=3)
+
+    G = nx.DiGraph()
+    G.add_nodes_from(graph)
+    G.add_edges_from((s, t) for s, targets in graph.items() for t in targets)
+    centrality = nx.degree_centrality(G)
+    assert stats["nodes"] == G.number_of_nodes()
+    assert stats["edges"] == G.number_of_edges()
+    assert stats["density"] == pytest.approx(nx.density(G))
+    assert stats["avg_degree"] == pytest.approx(2 * G.number_of_edges() / G.number_of_nodes())
+    assert [c for _, c in stats["top_degree_centrality"]] == pytest.approx(
+        sorted(centrality.values(), reverse=True)[:3]
+    )
+    assert stats["top_degree_centrality"][0][0] == "app"  # self-loop counts twice, like networkx
+
+
+# --- MessageAnalyzer Tests ---
+
+
+def test_classify_batch_matches_classify_commit():
+    """Batch classification should agree with per-message classification."""
+    messages = [
+        "feat: add new parser",
+        "Fix(app): crash on startup",
+        "build: bump deps",
+        "Update documentation for the CLI",
+        "Merge pull request #123 from foo/bar",
+        "über: nothing",
+        "",
+    ]
+
+    codes = classify_batch(messages)
+
+    assert [TYPE_NAMES[c] for c in codes] == [classify_commit(m) for m in messages]
+    assert analyze_messages(messages)["type_distribution"]["feat"] == 1
+
+
+def test_analyze_all_matches_separate_calls():
+    """analyze_all should combine analyze_messages and get_message_patterns."""
+    messages = ["feat: add parser", "Fixed #12 crash", "Merge branch 'x'", "tidy"]
+
+    result = analyze_all(iter(messages))
+
+    assert result["messages"] == analyze_messages(messages)
+    assert result["patterns"] == get_message_patterns(messages)
+
+
+# --- DynamicTracer Tests ---
+
+
+def test_dynamic_tracer_wrapper_cache_released_with_function():
+    """Wrappers are reused per function and collected together with it."""
+    tracer = DynamicTracer(io.StringIO())
+
+    def traced(x):
+        return x + 1
+
+    assert tracer.trace_function(traced, 1) == 2
+    assert tracer._get_wrapper(traced) is tracer._get_wrapper(traced)
+
+    ref = weakref.ref(traced)
+    del traced
+    gc.collect()
+    assert ref() is None
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for cache managers.
+"""
+
+import hashlib
+import json
+import pickle
+import time
+
+from src.utils.cache import CacheManager
+from src.utils.cache_manager import CacheManager as FileCacheManager
+
+
+def test_cached_none_counts_as_hit(tmp_path):
+    """A cached None is reported by has() and not recomputed by get_or_set()."""
+    cache = CacheManager(tmp_path)
+    calls = []
+
+    def factory():
+        calls.append(1)
+        return None
+
+    assert cache.get_or_set("key", factory) is None
+    assert cache.get_or_set("key", factory) is None
+    assert len(calls) == 1
+
+    cache.set("stored", None)
+    assert cache.has("stored")
+    assert CacheManager(tmp_path).has("stored")
+    assert not cache.has("missing")
+
+
+def test_legacy_md5_cache_file_is_migrated(tmp_path):
+    """Entries written under the old MD5 file name are read and renamed to BLAKE2b."""
+    key = "commits:flask"
+    md5_name = hashlib.md5(key.encode()).hexdigest()
+    blake_name = hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+
+    with open(tmp_path / f"{md5_name}.cache", "wb") as f:
+        pickle.dump({"time": time.time(), "value": [1, 2], "ttl": 3600}, f)
+
+    assert CacheManager(tmp_path).get(key) == [1, 2]
+    assert not (tmp_path / f"{md5_name}.cache").exists()
+    assert (tmp_path / f"{blake_name}.cache").exists()
+
+
+def test_legacy_md5_file_cache_entry_is_migrated(tmp_path):
+    """The JSON file cache follows the legacy path recorded in its metadata."""
+    key = "commits:flask"
+    legacy_path = tmp_path / f"{hashlib.md5(key.encode()).hexdigest()}.json"
+    legacy_path.write_text(json.dumps({"a": 1}), encoding="utf-8")
+    meta = {key: {"created_at": time.time(), "expires_at": None, "path": str(legacy_path)}}
+    (tmp_path / "_meta.json").write_text(json.dumps(meta), encoding="utf-8")
+
+    cache = FileCacheManager(str(tmp_path))
+    new_path = tmp_path / f"{hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest()}.json"
+    assert cache.get(key) == {"a": 1}
+    assert not legacy_path.exists()
+    assert new_path.exists()
+    assert FileCacheManager(str(tmp_path)).meta[key]["path"] == str(new_path)
@@ -81,3 +81,33 @@ def test_collect_commits_by_author(mock_commit):
         instance.traverse_commits.return_value = [mock_commit]
         commits_no_match = collector.collect_commits_by_author("Unknown")
         assert len(commits_no_match) == 0
+
+
+def test_collect_commits_by_author_walks_once(mock_commit):
+    """Test that repeated author queries reuse one history walk without DMM metrics."""
+    with patch("src.collectors.pydriller_collector.Repository") as MockRepo, \
+            patch.object(PyDrillerCollector, "_head_sha", return_value="head"):
+        instance = MockRepo.return_value
+        instance.traverse_commits.return_value = [mock_commit]
+
+        collector = PyDrillerCollector("/path/to/repo")
+        commits = collector.collect_commits_by_author("test")
+        assert len(commits) == 1
+        assert "dmm_unit_size" not in commits[0]
+
+        assert collector.collect_commits_by_author("Unknown") == []
+        assert MockRepo.call_count == 1
+
+
+def test_collect_commit_columns(mock_commit):
+    """Test collecting commits as per-field column lists."""
+    with patch("src.collectors.pydriller_collector.Repository") as MockRepo:
+        instance = MockRepo.return_value
+        instance.traverse_commits.return_value = [mock_commit, mock_commit]
+
+        collector = PyDrillerCollector("/path/to/repo")
+        columns = collector.collect_commit_columns()
+
+        assert columns["hash"] == ["abc1234", "abc1234"]
+        assert columns["author_name"] == ["Test Author", "Test Author"]
+        assert all(len(values) == 2 for values in columns.values())
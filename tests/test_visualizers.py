@@ -19,30 +19,34 @@ def test_plot_bar(sample_data, tmp_path):
     """Test generating a bar chart."""
     output = tmp_path / "bar.png"
 
-    with (
-        patch("src.visualizers.charts.plt") as mock_plt,
-        patch("src.visualizers.charts.save_plot") as mock_save,
-    ):
+    with patch("src.visualizers.charts.save_figure") as mock_save:
         charts.plot_bar(sample_data, "Test Title", "X", "Y", str(output))
 
-        # Verify plotting calls
-        assert mock_plt.figure.called
+        # Verify the shared figure is drawn and saved
         assert mock_save.called
-        mock_save.assert_called_with(str(output), "Test Title")
+        fig = mock_save.call_args.args[0]
+        mock_save.assert_called_with(fig, str(output), "Test Title")
+        assert len(fig.axes[0].patches) == len(sample_data)
 
 
 def test_plot_pie(sample_data, tmp_path):
     """Test generating a pie chart."""
     output = tmp_path / "pie.png"
 
-    with (
-        patch("src.visualizers.charts.plt") as mock_plt,
-        patch("src.visualizers.charts.save_plot") as mock_save,
-    ):
-        charts.plot_pie(sample_data, "Test Pie", str(output))
+    charts.plot_pie(sample_data, "Test Pie", str(output))
 
-        assert mock_plt.pie.called
-        assert mock_save.called
+    assert output.exists()
+
+
+def test_shared_canvas_reused(sample_data, tmp_path):
+    """Test that consecutive charts reuse one cleared figure."""
+    charts.plot_bar(sample_data, "Bar", "X", "Y", str(tmp_path / "bar.png"))
+    fig = charts._get_canvas()
+    charts.plot_pie(sample_data, "Pie", str(tmp_path / "pie.png"))
+
+    assert charts._get_canvas() is fig
+    assert (tmp_path / "bar.png").exists()
+    assert (tmp_path / "pie.png").exists()
 
 
 def test_style_config():